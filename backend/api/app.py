@@ -1,14 +1,41 @@
 import logging
 import os
-from fastapi import FastAPI
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware # Import for CORS
-from api.routes import config as config_routes, health, query
+from api.routes import config as config_routes, health, index_versions, metrics, query, session, stats, traces
+from main.config import Config
+from main.utils import tracing
 
 
-app = FastAPI()
-
 logger = logging.getLogger(__name__)
 
+
+def _warmup(max_delay: float = 60.0):
+    """Warm the pipeline, retrying with backoff until it succeeds, so /ready recovers from a startup hiccup."""
+    delay = 1.0
+    while True:
+        try:
+            query.rag.warmup()
+            return
+        except Exception:
+            logger.exception("Pipeline warmup failed; retrying in %.0f sec", delay)
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bind the port immediately; /ready turns healthy once the pipeline is hot
+    if Config.WARMUP_ON_STARTUP:
+        threading.Thread(target=_warmup, name="rag-warmup", daemon=True).start()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
 history = []
 
 origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
@@ -19,9 +46,25 @@ app.add_middleware(
     allow_credentials=True,         # Allow cookies/authorization headers
     allow_methods=["*"],            # Allow all methods (POST, GET, etc.)
     allow_headers=["*"],            # Allow all headers
+    expose_headers=[tracing.TRACE_HEADER],
 )
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """One trace per request; its ID is returned so slow requests can be looked up at /traces/{id}."""
+    with tracing.span(f"{request.method} {request.url.path}", **{"http.method": request.method, "http.route": request.url.path}) as span:
+        response = await call_next(request)
+        span.set_attribute("http.status_code", response.status_code)
+        response.headers[tracing.TRACE_HEADER] = tracing.current_trace_id()
+        return response
+
+
 app.include_router(config_routes.router)
 app.include_router(health.router)
+app.include_router(index_versions.router)
+app.include_router(metrics.router)
 app.include_router(query.router)
+app.include_router(session.router)
+app.include_router(stats.router)
+app.include_router(traces.router)
@@ -8,7 +8,10 @@ class ConfigUpdate(BaseModel):
     llm_provider: str | None = None
     ollama_model: str | None = None
     bedrock_model_id: str | None = None
+    # Defaults for re-chunked index versions (POST /index/versions)
     chunk_size: int | None = None
+    chunk_overlap: int | None = None
+    chunker: str | None = None
     rerank_provider: str | None = None
     top_k_faiss: int | None = None
 
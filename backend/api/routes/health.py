@@ -1,4 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from api.routes.query import rag
+from main.embedder import embedder
+from main.utils.plugin_registry import import_report
 
 router = APIRouter()
 
@@ -6,6 +10,19 @@ router = APIRouter()
 def health_check():
     return {"status": "ok"}
 
+@router.get("/ready")
+def readiness_check():
+    """Ready only once the model and index are loaded and warmed up (liveness stays on /health)."""
+    body = {"ready": rag.ready, "model_loaded": embedder.is_loaded()}
+    if not rag.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **body})
+    return {"status": "ready", **body}
+
+@router.get("/import-report")
+def import_time_report():
+    """Which provider modules have been imported so far, and what each import cost."""
+    return import_report()
+
 @router.get("/version")
 def version():
     return {"version": "1.0.0"}
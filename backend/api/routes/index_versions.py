@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from api.routes.query import rag
+from main.config import Config
+from main.retrieval.vector_store import index_versions
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# One re-chunk build at a time; each is CPU-bound embedding work
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rechunk")
+_jobs: dict[str, dict] = {}
+_jobs_lock = threading.Lock()
+
+
+class RechunkRequest(BaseModel):
+    chunk_size: int | None = None
+    chunk_overlap: int | None = None
+    chunker: str | None = None
+    name: str | None = None
+
+
+def _run(name: str, settings: dict):
+    _jobs[name] = dict(_jobs[name], state="running")
+    try:
+        summary = index_versions.rechunk_index(name=name, **settings)
+        _jobs[name] = dict(_jobs[name], state="done", summary=summary)
+    except Exception as e:
+        logger.exception("Re-chunk build %s failed", name)
+        _jobs[name] = dict(_jobs[name], state="failed", error=str(e))
+    _jobs[name]["finished_at"] = datetime.utcnow().isoformat()
+
+
+@router.post("/index/versions")
+def create_index_version(payload: RechunkRequest):
+    """
+    Re-chunk and re-embed the indexed documents from cached extractions into a new index version, in the
+    background. Unset settings come from the current config, including chunk_size set via POST /config.
+    """
+    cfg = Config.get_all()
+    settings = {
+        "chunk_size": payload.chunk_size or cfg["chunk_size"],
+        "chunk_overlap": cfg["chunk_overlap"] if payload.chunk_overlap is None else payload.chunk_overlap,
+        "chunker": payload.chunker or cfg["chunker"],
+    }
+    name = payload.name or index_versions.version_name(**settings)
+    try:
+        index_versions.version_path(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    with _jobs_lock:
+        if _jobs.get(name, {}).get("state") in ("queued", "running"):
+            return {"status": "in_progress", "name": name}
+        _jobs[name] = {"name": name, "state": "queued", **settings, "started_at": datetime.utcnow().isoformat()}
+        _executor.submit(_run, name, settings)
+    return {"status": "started", "name": name}
+
+
+@router.get("/index/versions")
+def get_index_versions():
+    """Saved versions (build summaries) and the state of re-chunk builds started since startup."""
+    return {"versions": index_versions.list_versions(), "jobs": list(_jobs.values())}
+
+
+@router.post("/index/versions/{name}/activate")
+def activate_index_version(name: str):
+    """Serve queries from a saved version until the next index refresh swaps in a rebuilt global index."""
+    try:
+        store = index_versions.load_version(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not hasattr(rag.retriever, "swap_index"):
+        raise HTTPException(status_code=400, detail=f"Retriever type '{rag.retriever_type}' does not serve FAISS index versions")
+    live_version = rag.retriever.swap_index(store)
+    logger.info("Activated index version %s as live version %d", name, live_version)
+    return {"status": "activated", "name": name, "live_version": live_version, "ntotal": store.index.ntotal}
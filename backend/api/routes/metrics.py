@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from main.utils import metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    payload, content_type = metrics.render()
+    return Response(content=payload, media_type=content_type)
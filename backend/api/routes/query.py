@@ -1,25 +1,57 @@
 import datetime
+import hmac
+import json
 import logging
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from main.retrieval.vector_store.index_builder import build_global_index
-from main.pipeline_core import RAGPipeline, generate_response, get_reranker, get_llm
+import os
+import time
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from main.pipeline_core import RAGPipeline, generate_response, generate_batch_responses, get_reranker, get_llm
+from main.collection_manager import CollectionManager
 from main.config import Config
+from main.retrieval.vector_store.index_collections import parse_collections
+from main.session.session_store import llm_summarizer
+from main.utils import profiling, tracing
+from api.routes.session import sessions
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-rag = RAGPipeline()
+rag = RAGPipeline(lazy=True)  # loaded by the startup warmup or the first query
+collection_manager = CollectionManager(parse_collections(Config.COLLECTIONS), default_pipeline=rag)
 
 
 # Request schema
 class QueryRequest(BaseModel):
     query: str
     history: list[list[str]] = []
+    session_id: str | None = None
+    collection: str | None = None  # default: S3_PREFIX / the global index
+
+
+class BatchQueryRequest(BaseModel):
+    queries: list[str]
+    max_concurrency: int | None = Field(None, ge=1)  # capped at BATCH_MAX_CONCURRENCY
+    collection: str | None = None
+
+def _pipeline(collection: str | None) -> RAGPipeline:
+    try:
+        return collection_manager.get(collection)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+
+def _profiling_requested(header_value: str | None) -> bool:
+    if not Config.PROFILING_ENABLED or not header_value:
+        return False
+    return not Config.PROFILING_TOKEN or hmac.compare_digest(header_value, Config.PROFILING_TOKEN)
 
 # Routes
 
+# Plain def: FastAPI runs it in its threadpool, so concurrent queries (and collection loads) do not
+# block the event loop, and identical in-flight queries can be coalesced
 @router.post("/query")
-async def query_endpoint(payload: QueryRequest):
+def query_endpoint(payload: QueryRequest, x_profile: str | None = Header(default=None)):
     try:
         if not payload.query.strip():
             raise HTTPException(status_code=400, detail="Query cannot be empty")
@@ -29,23 +61,99 @@ async def query_endpoint(payload: QueryRequest):
         logger.info(f"Received query: {payload.query}, LLM={config_llm}")
         llm = get_llm(config_llm)
         reranker = get_reranker(cfg["rerank_provider"])
-        response = generate_response(rag, payload.query, llm, payload.history, reranker)
-        return {"results": [response], "timestamp": datetime.datetime.utcnow().isoformat()}
+        pipeline = _pipeline(payload.collection)
+
+        # With a session, history lives server-side and the client sends only the new query
+        session = None
+        history = payload.history
+        if payload.session_id:
+            try:
+                session = sessions.get(payload.session_id, create=True)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            history = session.history()
+
+        profile = None
+        if _profiling_requested(x_profile):
+            with profiling.profile_request() as profile:
+                response = generate_response(pipeline, payload.query, llm, history, reranker)
+        else:
+            response = generate_response(pipeline, payload.query, llm, history, reranker)
+
+        result = {"results": [response], "timestamp": datetime.datetime.utcnow().isoformat()}
+        if profile is not None:
+            profile_id = tracing.current_trace_id()
+            path = os.path.join(Config.PROFILE_DIR, f"query-{profile_id}.prof")
+            profile.dump(path)
+            result["profile"] = {"id": profile_id, "path": path, "summary": profile.summary(limit=30)}
+        if session is not None:
+            summarize = llm_summarizer(llm) if cfg["session_summarizer"] == "llm" else None
+            sessions.append(session, payload.query, response, summarize=summarize)
+            result["session_id"] = session.session_id
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error during query processing")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/query/batch")
+def batch_query_endpoint(payload: BatchQueryRequest):
+    """Answer many queries, streaming one NDJSON line per result as each completes."""
+    if not payload.queries:
+        raise HTTPException(status_code=400, detail="Queries cannot be empty")
+    if len(payload.queries) > Config.BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {Config.BATCH_MAX_QUERIES} queries per batch")
+
+    cfg = Config.get_all()
+    logger.info(f"Received batch of {len(payload.queries)} queries, LLM={cfg['llm_provider']}")
+    llm = get_llm(cfg["llm_provider"])
+    reranker = get_reranker(cfg["rerank_provider"])
+    pipeline = _pipeline(payload.collection)
+
+    def stream():
+        start = time.perf_counter()
+        results = generate_batch_responses(pipeline, payload.queries, llm, reranker, max_concurrency=payload.max_concurrency)
+        for position, response in results:
+            yield json.dumps({"index": position, "query": payload.queries[position], "result": response}) + "\n"
+
+        elapsed = time.perf_counter() - start
+        yield json.dumps({
+            "done": True,
+            "count": len(payload.queries),
+            "elapsed_sec": round(elapsed, 3),
+            "queries_per_sec": round(len(payload.queries) / elapsed, 2) if elapsed else None,
+            "timestamp": datetime.datetime.utcnow().isoformat(),
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/refresh-index")
-def refresh_index():
+def refresh_index(force: bool = False, collection: str | None = None):
+    """Start a background rebuild; queries keep using the current index until the new one is swapped in."""
+    pipeline = _pipeline(collection)
     try:
         logger.info("Received request to refresh FAISS index.")
-        index = build_global_index(force=False)
-        if index is None:
-            logger.warning("Index refresh completed: no changes detected.")
-            return {"status": "no_update", "message": "Index is already up-to-date."}
-        logger.info("Index refresh completed successfully.")
-        return {"status": "updated", "message": "Index rebuilt successfully."}
+        if not pipeline.start_index_refresh(force=force):
+            return {"status": "in_progress", "message": "An index refresh is already running."}
+        return {"status": "started", "message": "Index refresh started in the background."}
     except Exception as e:
         logger.exception("Error during index refresh")
         raise HTTPException(status_code=500, detail=f"Index refresh failed: {str(e)}")
+
+
+@router.get("/refresh-index/status")
+def refresh_index_status(collection: str | None = None):
+    try:
+        pipeline = collection_manager.peek(collection)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return pipeline.index_refresh_status() if pipeline is not None else {"state": "not_initialized"}
+
+
+@router.get("/collections")
+def list_collections():
+    """Configured collections, which are resident, their estimated index memory and the budget."""
+    return collection_manager.status()
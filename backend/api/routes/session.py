@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException
+from main.session.session_store import SessionStore
+
+router = APIRouter()
+sessions = SessionStore()
+
+
+@router.post("/sessions")
+def create_session():
+    session = sessions.create()
+    return {"session_id": session.session_id}
+
+
+@router.get("/sessions/{session_id}")
+def get_session(session_id: str):
+    try:
+        session = sessions.get(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session.to_dict()
+
+
+@router.delete("/sessions/{session_id}")
+def delete_session(session_id: str):
+    try:
+        deleted = sessions.delete(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "deleted" if deleted else "not_found"}
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from api.routes.query import collection_manager, rag
+from api.routes.session import sessions
+from main.retrieval.vector_store.index_builder import FAISS_INDEX_PATH
+from main.utils.runtime_stats import collect_stats
+
+router = APIRouter()
+
+@router.get("/stats")
+def runtime_stats():
+    """Index, manifest, embedding model and cache resource usage; never triggers model or index loading."""
+    store = rag.index if rag.initialized else None
+    return dict(collect_stats(store, FAISS_INDEX_PATH, sessions=sessions), collections=collection_manager.status())
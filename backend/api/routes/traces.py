@@ -0,0 +1,14 @@
+from fastapi import APIRouter, HTTPException
+from main.utils import tracing
+
+router = APIRouter()
+
+@router.get("/traces/{trace_id}")
+def get_trace(trace_id: str):
+    """Spans of one request (trace ID from the X-Trace-Id response header), with the in-memory exporter."""
+    spans = tracing.finished_spans(trace_id.lower())
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Traces are only kept in memory with TRACING_EXPORTER=memory")
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"No spans found for trace {trace_id}")
+    return {"trace_id": trace_id, "spans": sorted(spans, key=lambda s: s["start_time"])}
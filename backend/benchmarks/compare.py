@@ -0,0 +1,59 @@
+"""Compare two benchmark result files: python -m benchmarks.compare before.json after.json"""
+import argparse
+import json
+
+METRICS = [
+    ("ingest.total_sec", "Ingest total (s)"),
+    ("ingest.docs_per_sec", "Ingest docs/s"),
+    ("ingest.stages.extract.total_sec", "  extract (s)"),
+    ("ingest.stages.preprocess.total_sec", "  preprocess (s)"),
+    ("ingest.stages.chunk.total_sec", "  chunk (s)"),
+    ("ingest.stages.embed.total_sec", "  embed (s)"),
+    ("ingest.stages.index_add.total_sec", "  index add (s)"),
+    ("ingest.stages.index_save.total_sec", "  index save (s)"),
+    ("ingest.index_bytes", "Index bytes"),
+    ("query.queries_per_sec", "Queries/s"),
+    ("query.latency.p50_ms", "Query p50 (ms)"),
+    ("query.latency.p95_ms", "Query p95 (ms)"),
+    ("query.latency.p99_ms", "Query p99 (ms)"),
+]
+
+
+def _get(results: dict, dotted: str):
+    value = results
+    for key in dotted.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(before: dict, after: dict) -> list[tuple[str, float | None, float | None, float | None]]:
+    """(label, before, after, change in %) per metric."""
+    rows = []
+    for path, label in METRICS:
+        a, b = _get(before, path), _get(after, path)
+        change = (b - a) / a * 100.0 if a and b is not None else None
+        rows.append((label, a, b, change))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, "r", encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, "r", encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"{'metric':<22} {'before':>12} {'after':>12} {'change':>9}")
+    for label, a, b, change in compare(before, after):
+        fmt = lambda v: "-" if v is None else f"{v:.3f}" if isinstance(v, float) else str(v)
+        print(f"{label:<22} {fmt(a):>12} {fmt(b):>12} {'-' if change is None else f'{change:+.1f}%':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Reproducible synthetic PDF corpus (HVAC product sheets) generated with PyMuPDF."""
+import json
+import os
+import random
+import fitz
+
+FAMILIES = ["Design Envelope", "Series 4300", "Vertical In-Line", "End Suction", "Split Coupled", "Circulator"]
+COMPONENTS = ["pump", "motor", "impeller", "seal", "flange", "coupling", "bearing", "drive", "valve", "strainer"]
+PROPERTIES = [
+    ("Flow", "gpm"), ("Head", "ft"), ("Power", "hp"), ("Speed", "rpm"), ("Max pressure", "psi"),
+    ("Max temperature", "°F"), ("Efficiency", "%"), ("Weight", "lb"), ("Inlet size", "in"), ("Voltage", "V"),
+]
+VERBS = ["reduces", "improves", "supports", "requires", "protects", "extends", "controls", "monitors"]
+OBJECTS = [
+    "energy consumption", "system efficiency", "maintenance intervals", "installation time",
+    "noise levels", "part-load performance", "bearing life", "seal wear", "flow stability",
+]
+
+PAGE_RECT = fitz.Rect(50, 50, 562, 742)
+
+
+def model_name(rng: random.Random) -> str:
+    return f"{rng.choice(FAMILIES)} {rng.randint(1, 9)}{rng.randint(0, 9)}{rng.randint(0, 9)}{rng.choice('ABCDE')}"
+
+
+def _paragraph(rng: random.Random, model: str) -> str:
+    sentences = []
+    for _ in range(rng.randint(3, 6)):
+        sentences.append(
+            f"The {model} {rng.choice(COMPONENTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} "
+            f"in {rng.choice(['commercial', 'residential', 'industrial', 'district'])} systems."
+        )
+    return " ".join(sentences)
+
+
+def _spec_table(rng: random.Random) -> str:
+    rows = rng.sample(PROPERTIES, k=rng.randint(4, 7))
+    return "\n".join(f"{name}  {rng.randint(1, 500)} {unit}" for name, unit in rows)
+
+
+def _bullets(rng: random.Random) -> str:
+    return "\n".join(f"• {rng.choice(COMPONENTS).capitalize()} {rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(rng.randint(3, 5)))
+
+
+def page_text(rng: random.Random, model: str, page_number: int) -> str:
+    parts = [f"{model} - Section {page_number + 1}", _paragraph(rng, model), "Specifications", _spec_table(rng)]
+    if rng.random() < 0.5:
+        parts += ["Features", _bullets(rng)]
+    parts.append(_paragraph(rng, model))
+    return "\n\n".join(parts)
+
+
+def generate_corpus(out_dir: str, num_docs: int = 20, pages_per_doc: int = 5, seed: int = 0) -> list[str]:
+    """
+    Write num_docs PDFs of pages_per_doc pages each into out_dir and return their paths.
+    The same parameters always produce the same text; an existing corpus with matching
+    parameters is reused.
+    """
+    params = {"num_docs": num_docs, "pages_per_doc": pages_per_doc, "seed": seed}
+    manifest_path = os.path.join(out_dir, "corpus.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("params") == params and all(os.path.exists(p) for p in manifest["files"]):
+            return manifest["files"]
+
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    files, models = [], []
+    for i in range(num_docs):
+        model = model_name(rng)
+        doc = fitz.open()
+        for page_number in range(pages_per_doc):
+            page = doc.new_page()
+            page.insert_textbox(PAGE_RECT, page_text(rng, model, page_number), fontsize=9)
+        path = os.path.join(out_dir, f"product_{i:04d}.pdf")
+        doc.save(path, garbage=3, deflate=True)
+        doc.close()
+        files.append(path)
+        models.append(model)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "files": files, "models": models}, f, indent=2)
+    return files
+
+
+def generate_queries(out_dir: str, num_queries: int = 100, seed: int = 0) -> list[str]:
+    """Product questions about the models in a generated corpus."""
+    with open(os.path.join(out_dir, "corpus.json"), "r", encoding="utf-8") as f:
+        models = json.load(f)["models"]
+    rng = random.Random(seed + 1)
+    templates = [
+        "What is the {prop} of the {model}?",
+        "How does the {model} {component} affect {obj}?",
+        "Which {component} is used in the {model}?",
+        "What is the maximum {prop} rating for {model}?",
+    ]
+    queries = []
+    for _ in range(num_queries):
+        queries.append(rng.choice(templates).format(
+            model=rng.choice(models),
+            prop=rng.choice(PROPERTIES)[0].lower(),
+            component=rng.choice(COMPONENTS),
+            obj=rng.choice(OBJECTS),
+        ))
+    return queries
@@ -0,0 +1,208 @@
+"""
+Recall-vs-latency evaluation of index and retrieval configurations.
+
+Ground truth is exact flat search with the reference embedding model over the
+full-dimension vectors. Each configuration is built and queried like production
+(FaissStore.search, then merge_adjacent_chunks) and scored against it:
+
+    python -m benchmarks.evaluate --docs 50 --queries 200 --min-recall 0.95
+    python -m benchmarks.evaluate --index faiss_index/global.index --queries-file queries.txt --configs sweep.json
+
+A configuration is a dict of any of: name, index_factory, search_params, projection,
+projection_dim, top_k, merge_window, embedding_model, embedding_backend.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import faiss
+import numpy as np
+from main.config import Config
+from main.embedder import embedder
+from main.logger_config import setup_logging
+from main.retrieval.rerankers.merge_utils import merge_adjacent_chunks
+from main.retrieval.vector_store import faiss_indexer
+from main.retrieval.vector_store.projection import fit_projection
+from main.utils.normalize_tokens import normalize_text
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.ingest import chunk_files
+from benchmarks.stats import latency_summary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIGS = [
+    {"name": "flat"},
+    {"name": "flat top_k=10", "top_k": 10},
+    {"name": "flat merge_window=0", "merge_window": 0},
+    {"name": "flat merge_window=2", "merge_window": 2},
+    {"name": "pca-128", "projection": "pca", "projection_dim": 128},
+    {"name": "pca-64", "projection": "pca", "projection_dim": 64},
+    {"name": "hnsw32 ef=64", "index_factory": "HNSW32", "search_params": "efSearch=64"},
+    {"name": "hnsw32 ef=16", "index_factory": "HNSW32", "search_params": "efSearch=16"},
+    {"name": "ivf nprobe=8", "index_factory": "IVF{nlist},Flat", "search_params": "nprobe=8"},
+    {"name": "ivf-pq nprobe=8", "index_factory": "IVF{nlist},PQ16", "search_params": "nprobe=8"},
+]
+
+
+def _encode(model, texts: list[str]) -> np.ndarray:
+    vectors = model.encode([normalize_text(t) for t in texts], convert_to_numpy=True, normalize_embeddings=True)
+    return np.ascontiguousarray(vectors, dtype="float32")
+
+
+def ground_truth(chunk_vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-k chunk ids per query."""
+    index = faiss.IndexFlatIP(chunk_vectors.shape[1])
+    index.add(chunk_vectors)
+    _, ids = index.search(query_vectors, k)
+    return ids
+
+
+def _index_factory(spec: str, num_chunks: int) -> str:
+    # Rule of thumb: ~sqrt(n) lists, with at least 39 training points per list
+    nlist = max(1, min(int(np.sqrt(num_chunks)), num_chunks // 39))
+    return spec.format(nlist=nlist)
+
+
+def evaluate_config(config: dict, chunks: list[str], chunk_vectors: np.ndarray, queries: list[str],
+                    query_vectors: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    """Build one configuration, run every query through it, and score against the ground truth."""
+    top_k = config.get("top_k", Config.TOP_K_FAISS)
+    merge_window = config.get("merge_window", Config.MERGE_WINDOW_SIZE)
+
+    # A different embedding model/backend means re-encoding the corpus and queries
+    if "embedding_model" in config or "embedding_backend" in config:
+        model = embedder.load_model(config.get("embedding_model"), config.get("embedding_backend"))
+        chunk_vectors, query_vectors = _encode(model, chunks), _encode(model, queries)
+
+    start = time.perf_counter()
+    projection = None
+    if config.get("projection", "none") != "none":
+        projection = fit_projection(chunk_vectors, config.get("projection_dim", Config.PROJECTION_DIM), config["projection"])
+    store = faiss_indexer.build_faiss_index(
+        chunk_vectors, chunks, projection,
+        index_factory=_index_factory(config.get("index_factory", "Flat"), len(chunks)),
+        search_params=config.get("search_params", ""),
+    )
+    build_sec = time.perf_counter() - start
+
+    memory_bytes = faiss.serialize_index(store.index).nbytes
+    if projection is not None:
+        memory_bytes += projection.components.nbytes + projection.mean.nbytes
+
+    first_id = {}
+    for i, chunk in enumerate(chunks):
+        first_id.setdefault(chunk, i)
+
+    latencies, recalls, reciprocal_ranks, context_recalls, context_chars = [], [], [], [], []
+    for q in range(len(queries)):
+        t = time.perf_counter()
+        hits = store.search(query_vectors[q:q + 1].copy(), top_k)
+        latencies.append(time.perf_counter() - t)
+
+        expected = [chunks[i] for i in truth[q]]
+        retrieved = [text for text, _ in hits]
+        recalls.append(len(set(expected) & set(retrieved[:k])) / len(set(expected)))
+
+        rank = next((r for r, text in enumerate(retrieved, start=1) if text == expected[0]), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+        sections = merge_adjacent_chunks(hits, [text for text, _ in hits], window_size=merge_window)
+        context_recalls.append(sum(any(text in section for section in sections) for text in set(expected)) / len(set(expected)))
+        context_chars.append(sum(len(section) for section in sections))
+
+    return {
+        "name": config.get("name", json.dumps(config, sort_keys=True)),
+        "config": config,
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        f"context_recall@{k}": round(float(np.mean(context_recalls)), 4),
+        "avg_context_chars": round(float(np.mean(context_chars)), 1),
+        "search_latency": latency_summary(latencies),
+        "build_sec": round(build_sec, 4),
+        "memory_bytes": memory_bytes,
+    }
+
+
+def run_evaluation(chunks: list[str], queries: list[str], configs: list[dict], k: int = 10) -> list[dict]:
+    model = embedder.get_model()
+    chunk_vectors, query_vectors = _encode(model, chunks), _encode(model, queries)
+    truth = ground_truth(chunk_vectors, query_vectors, k)
+    logger.info("Evaluating %d configurations on %d chunks and %d queries", len(configs), len(chunks), len(queries))
+
+    results = []
+    for config in configs:
+        try:
+            results.append(evaluate_config(config, chunks, chunk_vectors, queries, query_vectors, truth, k))
+        except Exception as e:
+            # e.g. PQ/IVF training needs more vectors than a small corpus has
+            logger.warning("Configuration %s failed: %s", config.get("name", config), e)
+            results.append({"name": config.get("name", json.dumps(config, sort_keys=True)), "config": config, "error": str(e)})
+    return results
+
+
+def pick_fastest(results: list[dict], min_recall: float, k: int = 10) -> dict | None:
+    """Lowest p50 search latency among configurations meeting the recall bar."""
+    eligible = [r for r in results if "error" not in r and r[f"recall@{k}"] >= min_recall]
+    return min(eligible, key=lambda r: r["search_latency"]["p50_ms"]) if eligible else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep index/retriever configurations and report recall vs. latency")
+    parser.add_argument("--index", help="Evaluate on the chunks of an existing index instead of a synthetic corpus")
+    parser.add_argument("--queries-file", help="One query per line (required with --index)")
+    parser.add_argument("--configs", help="JSON file with a list of configurations (default: built-in sweep)")
+    parser.add_argument("--docs", type=int, default=30)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--workdir", default=".bench")
+    parser.add_argument("--out", help="Results JSON path")
+    args = parser.parse_args()
+
+    setup_logging(logging.DEBUG if Config.DEBUG else logging.INFO)
+
+    if args.index:
+        if not args.queries_file:
+            parser.error("--queries-file is required with --index")
+        chunks = faiss_indexer.load_faiss_index(args.index).metadata
+    else:
+        corpus_dir = os.path.join(args.workdir, f"corpus_{args.docs}x{args.pages}_s{args.seed}")
+        chunks = chunk_files(generate_corpus(corpus_dir, args.docs, args.pages, args.seed))
+
+    if args.queries_file:
+        with open(args.queries_file, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = generate_queries(corpus_dir, args.queries, args.seed)
+
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs, "r", encoding="utf-8") as f:
+            configs = json.load(f)
+
+    results = run_evaluation(chunks, queries, configs, k=args.k)
+    best = pick_fastest(results, args.min_recall, k=args.k)
+
+    print(f"{'config':<24} {'recall@' + str(args.k):>9} {'mrr':>6} {'ctx_rec':>8} {'p50 ms':>8} {'p99 ms':>8} {'build s':>8} {'MB':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['name']:<24} failed: {r['error'][:60]}")
+            continue
+        print(
+            f"{r['name']:<24} {r[f'recall@{args.k}']:>9.3f} {r['mrr']:>6.3f} {r[f'context_recall@{args.k}']:>8.3f} "
+            f"{r['search_latency']['p50_ms']:>8.3f} {r['search_latency']['p99_ms']:>8.3f} {r['build_sec']:>8.3f} {r['memory_bytes'] / 1e6:>8.2f}"
+        )
+    print(f"\nFastest with recall@{args.k} >= {args.min_recall}: {best['name'] if best else 'none'}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"k": args.k, "chunks": len(chunks), "queries": len(queries), "results": results,
+                       "best": best["name"] if best else None}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
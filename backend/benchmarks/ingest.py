@@ -0,0 +1,115 @@
+"""Per-stage ingest timings: extract, preprocess, chunk, embed, index add, index save."""
+import logging
+import os
+import time
+from main.chunker import layout_chunker, text_chunker
+from main.config import Config
+from main.embedder import embedder
+from main.extractor.pdf_extractor_factory import create_pdf_extractor
+from main.retrieval.vector_store import faiss_indexer
+from main.utils.text_preprocessor import preprocess_text
+from benchmarks.stats import latency_summary
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("extract", "preprocess", "chunk", "embed")
+
+
+def extract_and_chunk(path: str, extractor, chunker: str, rule_timings: dict | None = None) -> tuple[list[str], dict, int]:
+    """
+    Chunk one file the way process_file() does, without the extracted/preprocessed text caches.
+    Returns (chunks, seconds per stage, extracted chars); per-rule preprocessing seconds are added to rule_timings.
+    """
+    timings = {}
+    t = time.perf_counter()
+    if chunker == "layout":
+        pages = extractor.extract_layout(path)
+        timings["extract"] = time.perf_counter() - t
+        timings["preprocess"] = 0.0  # normalization happens while chunking
+
+        t = time.perf_counter()
+        chunks = [chunk.text for chunk in layout_chunker.chunk_layout(pages)]
+        timings["chunk"] = time.perf_counter() - t
+        chars = sum(len(span["text"]) for page in pages for block in page["blocks"] for line in block["lines"] for span in line["spans"])
+        return chunks, timings, chars
+
+    text = extractor.extract_text(path)
+    timings["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    cleaned = preprocess_text(text, rule_timings)
+    timings["preprocess"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    chunks = text_chunker.chunk_text(cleaned)
+    timings["chunk"] = time.perf_counter() - t
+    return chunks, timings, len(text)
+
+
+def chunk_files(files: list[str], extractor=None, chunker: str | None = None) -> list[str]:
+    """Extract, preprocess and chunk files the way ingest does, without embedding."""
+    extractor = extractor or create_pdf_extractor({"provider": "pymupdf"})
+    chunks = []
+    for path in files:
+        chunks.extend(extract_and_chunk(path, extractor, chunker or Config.CHUNKER)[0])
+    return chunks
+
+
+def run_ingest(files: list[str], index_path: str, extractor=None, chunker: str | None = None):
+    """
+    Run the ingest stages of process_file() one document at a time (so stages are not
+    interleaved across workers), then build and save one index.
+    Returns (store, results).
+    """
+    extractor = extractor or create_pdf_extractor({"provider": "pymupdf"})
+    chunker = chunker or Config.CHUNKER
+    embedder.get_model()  # model load is reported separately, not as part of the first embed
+
+    per_stage = {stage: [] for stage in STAGES}
+    rule_timings = {}
+    all_chunks, all_embeddings = [], []
+    chars = 0
+
+    start = time.perf_counter()
+    for path in files:
+        chunks, timings, doc_chars = extract_and_chunk(path, extractor, chunker, rule_timings)
+        for stage, seconds in timings.items():
+            per_stage[stage].append(seconds)
+
+        t = time.perf_counter()
+        embeddings = embedder.embed_text_chunks(chunks)
+        per_stage["embed"].append(time.perf_counter() - t)
+
+        chars += doc_chars
+        all_chunks.extend(chunks)
+        all_embeddings.extend(embeddings)
+
+    t = time.perf_counter()
+    store = faiss_indexer.build_faiss_index(all_embeddings, all_chunks)
+    index_add = time.perf_counter() - t
+
+    t = time.perf_counter()
+    faiss_indexer.save_faiss_index(store, index_path)
+    index_save = time.perf_counter() - t
+    total = time.perf_counter() - start
+
+    stages = {stage: {"total_sec": round(sum(times), 4), "per_doc": latency_summary(times)} for stage, times in per_stage.items()}
+    stages["preprocess"]["rules"] = {rule: round(seconds, 4) for rule, seconds in rule_timings.items()}
+    stages["index_add"] = {"total_sec": round(index_add, 4)}
+    stages["index_save"] = {"total_sec": round(index_save, 4)}
+
+    base_path = os.path.splitext(index_path)[0]
+    results = {
+        "docs": len(files),
+        "chunker": chunker,
+        "chars": chars,
+        "chunks": len(all_chunks),
+        "total_sec": round(total, 4),
+        "docs_per_sec": round(len(files) / total, 3) if total else None,
+        "chunks_per_sec": round(len(all_chunks) / total, 3) if total else None,
+        "model_load_sec": embedder.get_load_seconds(),
+        "index_bytes": os.path.getsize(base_path + ".index"),
+        "stages": stages,
+    }
+    logger.info("Ingested %d docs (%d chunks) in %.2f sec", len(files), len(all_chunks), total)
+    return store, results
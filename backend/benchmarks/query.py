@@ -0,0 +1,45 @@
+"""End-to-end query latency through RAGPipeline with stub LLM, reranker and intent fallback."""
+import logging
+import time
+from main.intent_detector.embedding_intent_detector import EmbeddingIntentDetector
+from main.pipeline_core import RAGPipeline, generate_response
+from main.retrieval.retrievers.faiss_retriever import FAISSRetriever
+from benchmarks.stats import latency_summary
+from benchmarks.stubs import StubIntentDetector, StubLLM, StubReranker
+
+logger = logging.getLogger(__name__)
+
+
+def make_pipeline(store) -> RAGPipeline:
+    """A pipeline serving the given FaissStore instead of the global index."""
+    rag = RAGPipeline(lazy=True)
+    rag._intent_detector = EmbeddingIntentDetector(fallback_factory=StubIntentDetector)
+    rag._retriever = FAISSRetriever(index=store)
+    return rag
+
+
+def run_queries(store, queries: list[str], warmup: int = 5) -> dict:
+    """Time generate_response() for each query, one at a time, after a few warmup queries."""
+    rag = make_pipeline(store)
+    rag.warmup()
+    llm, reranker = StubLLM(), StubReranker()
+
+    for query_text in queries[:warmup]:
+        generate_response(rag, query_text, llm, [], reranker)
+
+    latencies = []
+    start = time.perf_counter()
+    for query_text in queries:
+        t = time.perf_counter()
+        generate_response(rag, query_text, llm, [], reranker)
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+
+    logger.info("Ran %d queries in %.2f sec", len(queries), total)
+    return {
+        "queries": len(queries),
+        "total_sec": round(total, 4),
+        "queries_per_sec": round(len(queries) / total, 3) if total else None,
+        "latency": latency_summary(latencies),
+        "avg_prompt_chars": round(llm.prompt_chars / llm.calls, 1) if llm.calls else 0,
+    }
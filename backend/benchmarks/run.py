@@ -0,0 +1,90 @@
+"""
+Ingest + query benchmark on a synthetic corpus.
+
+    python -m benchmarks.run --docs 50 --pages 5 --queries 200
+    python -m benchmarks.run --docs 200 --pages 10 --ingest-only --chunker layout
+    python -m benchmarks.compare .bench/results/before.json .bench/results/after.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+from datetime import datetime
+from main.config import Config
+from main.logger_config import setup_logging
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.ingest import run_ingest
+from benchmarks.query import run_queries
+
+logger = logging.getLogger(__name__)
+
+# Settings that change what is being measured; recorded with every result
+_CONFIG_KEYS = (
+    "embedding_model", "embedding_backend", "embedding_projection", "projection_dim", "top_k_faiss",
+    "top_n_rerank", "faiss_score_threshold", "merge_window_size", "context_compression",
+    "prompt_token_budget", "speculative_retrieval", "intent_detector_provider",
+)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(num_docs: int, pages_per_doc: int, num_queries: int, seed: int, workdir: str, run_queries_too: bool = True, chunker: str | None = None) -> dict:
+    os.makedirs(os.path.join(workdir, "index"), exist_ok=True)
+    files = generate_corpus(os.path.join(workdir, f"corpus_{num_docs}x{pages_per_doc}_s{seed}"), num_docs, pages_per_doc, seed)
+    store, ingest = run_ingest(files, os.path.join(workdir, "index", "bench.index"), chunker=chunker)
+
+    cfg = Config.get_all()
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {k: cfg.get(k) for k in _CONFIG_KEYS},
+        },
+        "corpus": {"docs": num_docs, "pages_per_doc": pages_per_doc, "seed": seed},
+        "ingest": ingest,
+    }
+    if run_queries_too:
+        corpus_dir = os.path.dirname(files[0])
+        results["query"] = run_queries(store, generate_queries(corpus_dir, num_queries, seed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest and query performance on a synthetic PDF corpus")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5, help="Pages per document")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=".bench", help="Corpus, index and results directory")
+    parser.add_argument("--out", help="Results JSON path (default: <workdir>/results/<timestamp>.json)")
+    parser.add_argument("--ingest-only", action="store_true")
+    parser.add_argument("--chunker", choices=Config.OPTIONS["chunker"], default=Config.CHUNKER)
+    args = parser.parse_args()
+
+    setup_logging(logging.DEBUG if Config.DEBUG else logging.INFO)
+
+    results = run_benchmark(args.docs, args.pages, args.queries, args.seed, args.workdir, not args.ingest_only, args.chunker)
+
+    out = args.out or os.path.join(args.workdir, "results", datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps({"ingest_sec": results["ingest"]["total_sec"], **results.get("query", {}).get("latency", {})}, indent=2))
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
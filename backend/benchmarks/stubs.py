@@ -0,0 +1,35 @@
+"""Deterministic stand-ins for networked components, so benchmarks time only local work."""
+from main.intent_detector.intent_detector_base import IntentDetectorBase
+from main.llm.base import LLMBase
+from main.retrieval.rerankers.reranker_base import RerankerBase
+
+
+class StubLLM(LLMBase):
+    model = "stub"
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def generate_answer(self, prompt: str) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        return "Stub answer."
+
+    def is_running(self) -> bool:
+        return True
+
+
+class StubReranker(RerankerBase):
+    """Keeps the FAISS order, with descending pseudo-scores like a real reranker."""
+    provider = "stub"
+
+    def rerank(self, query: str, documents: list[str], top_n: int = 5) -> list[tuple[str, float]]:
+        return [(doc, 1.0 - rank / len(documents)) for rank, doc in enumerate(documents[:top_n])]
+
+
+class StubIntentDetector(IntentDetectorBase):
+    """LLM fallback for the embedding intent detector; treats everything as a question."""
+
+    def detect(self, text: str) -> str:
+        return "question"
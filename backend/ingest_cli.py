@@ -0,0 +1,88 @@
+"""Distributed index builds: enqueue a job, run workers (on any number of hosts sharing the queue), merge."""
+
+import argparse
+import json
+import logging
+import multiprocessing
+from main.config import Config
+from main.logger_config import setup_logging
+from main.pipeline import distributed_ingest
+from main.retrieval.vector_store.index_collections import DEFAULT_COLLECTION, parse_collections
+
+
+setup_logging(logging.DEBUG if Config.DEBUG else logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _work(queue_path: str, job: str, max_items: int | None) -> dict:
+    return distributed_ingest.run_worker(distributed_ingest.open_queue(queue_path), job, max_items=max_items)
+
+
+def run_workers(queue_path: str, job: str, processes: int, max_items: int | None = None) -> list[dict]:
+    """Run workers in this process (processes=1) or in that many local worker processes."""
+    if processes <= 1:
+        return [_work(queue_path, job, max_items)]
+    # spawn: workers load their own model instead of inheriting a forked torch runtime
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        return pool.starmap(_work, [(queue_path, job, max_items)] * processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queue", default=Config.INGEST_QUEUE_PATH, help="SQLite work queue path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Create a job with one work item per PDF of a collection")
+    enqueue.add_argument("--job", help="Job name (default: <collection>-<timestamp>)")
+    enqueue.add_argument("--collection", default=DEFAULT_COLLECTION)
+    enqueue.add_argument("--chunk-size", type=int)
+    enqueue.add_argument("--chunk-overlap", type=int)
+    enqueue.add_argument("--chunker", choices=Config.OPTIONS["chunker"])
+
+    work = commands.add_parser("work", help="Process items of a job until none are left")
+    work.add_argument("--job", required=True)
+    work.add_argument("--processes", type=int, default=1, help="Local worker processes")
+    work.add_argument("--max-items", type=int, help="Stop each worker after this many items")
+
+    status = commands.add_parser("status", help="Item counts per state (with --items, every item)")
+    status.add_argument("--job", required=True)
+    status.add_argument("--items", action="store_true")
+
+    merge = commands.add_parser("merge", help="Merge the shards of a finished job into the collection's index")
+    merge.add_argument("--job", required=True)
+    merge.add_argument("--allow-failed", action="store_true", help="Merge even if some items failed (they are left out)")
+
+    build = commands.add_parser("build", help="enqueue + work + merge in one go with local worker processes")
+    build.add_argument("--collection", default=DEFAULT_COLLECTION)
+    build.add_argument("--processes", type=int, default=2)
+
+    args = parser.parse_args()
+    queue = distributed_ingest.open_queue(args.queue)
+
+    if args.command in ("enqueue", "build"):
+        collections = parse_collections(Config.COLLECTIONS)
+        if args.collection not in collections:
+            parser.error(f"Unknown collection {args.collection!r}; configured: {', '.join(collections)}")
+        collection = collections[args.collection]
+
+    if args.command == "enqueue":
+        result = distributed_ingest.enqueue_build(
+            queue, args.job, collection, chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap, chunker=args.chunker
+        )
+    elif args.command == "work":
+        result = run_workers(args.queue, args.job, args.processes, args.max_items)
+    elif args.command == "status":
+        result = {"job": args.job, "counts": queue.counts(args.job)}
+        if args.items:
+            result["items"] = queue.items(args.job)
+    elif args.command == "merge":
+        result = distributed_ingest.merge_job(queue, args.job, allow_failed=args.allow_failed)
+    else:
+        job = distributed_ingest.enqueue_build(queue, collection=collection)["job"]
+        workers = run_workers(args.queue, job, args.processes)
+        result = {"workers": workers, **distributed_ingest.merge_job(queue, job)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
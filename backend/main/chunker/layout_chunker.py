@@ -0,0 +1,216 @@
+"""Layout-aware chunking from PyMuPDF text blocks: headings, lists and table rows come from fonts and positions."""
+import hashlib
+import logging
+import re
+from collections import Counter
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from main.utils.text_preprocessor import FRACTION_MAP, merge_split_tokens
+
+logger = logging.getLogger(__name__)
+
+BOLD_FLAG = 16  # fitz.TEXT_FONT_BOLD
+HEADING_SIZE_RATIO = 1.15  # spans this much larger than body text are headings
+MIN_SIZE_RATIO = 0.6  # smaller spans (chart axis ticks, footnote markers) are dropped
+MAX_HEADING_WORDS = 12
+SAME_ROW_TOLERANCE = 2.0  # points; lines of one block this close vertically are cells of one table row
+
+_BULLET = re.compile(r"^\s*(?:[•·▪◦○]|[\-–](?=\s)|\d+[.)](?=\s))\s*")
+_HAS_LETTER = re.compile(r"[^\W\d_]")
+# Same replacements as fix_pdf_symbols(), in one pass that only touches matching characters
+_SYMBOL_MAP = {**FRACTION_MAP, **dict.fromkeys("‐‑‒–—", "-")}
+_SYMBOLS = re.compile("[" + "".join(_SYMBOL_MAP) + "]")
+
+# Bump VERSION when the chunking logic changes; FINGERPRINT (with the tuning constants) keys derived output such as vector shards
+VERSION = "2"
+FINGERPRINT = hashlib.sha256(repr((
+    VERSION, HEADING_SIZE_RATIO, MIN_SIZE_RATIO, MAX_HEADING_WORDS, SAME_ROW_TOLERANCE, sorted(_SYMBOL_MAP.items())
+)).encode("utf-8")).hexdigest()[:12]
+
+
+class LayoutChunk:
+    """Chunk text plus where it came from: 1-based page numbers and the heading path it sits under."""
+
+    def __init__(self, text: str, pages: list[int], heading: str = ""):
+        self.text = text
+        self.pages = pages
+        self.heading = heading
+
+    def __repr__(self):
+        return f"LayoutChunk(pages={self.pages}, heading={self.heading!r}, text={self.text[:40]!r})"
+
+
+def body_font_size(pages: list[dict]) -> float:
+    """Most common span size, weighted by characters."""
+    sizes = Counter()
+    for page in pages:
+        for block in page["blocks"]:
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    sizes[span["size"]] += len(span["text"])
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def _line_text(line: dict, min_size: float) -> tuple[str, float, bool]:
+    """(text, max span size, all spans bold) for one layout line, ignoring tiny spans."""
+    parts, size, bold = [], 0.0, True
+    for span in line["spans"]:
+        if span["size"] < min_size or not span["text"].strip():
+            continue
+        parts.append(span["text"])
+        size = max(size, span["size"])
+        bold = bold and bool(span["flags"] & BOLD_FLAG)
+    return " ".join("".join(parts).split()), size, bold and bool(parts)
+
+
+def _rows(block: dict, min_size: float) -> list[tuple[str, float, bool, float, int]]:
+    """Lines of a block as (text, size, bold, x0, cells); lines sharing a baseline become one row."""
+    rows = []
+    last_y = None
+    for line in block["lines"]:
+        text, size, bold = _line_text(line, min_size)
+        if not text:
+            continue
+        y, x0 = line["bbox"][3], line["bbox"][0]
+        if rows and last_y is not None and abs(y - last_y) <= SAME_ROW_TOLERANCE:
+            prev_text, prev_size, prev_bold, prev_x0, cells = rows[-1]
+            rows[-1] = (f"{prev_text} | {text}", max(prev_size, size), prev_bold and bold, prev_x0, cells + 1)
+        else:
+            rows.append((text, size, bold, x0, 1))
+        last_y = y
+    return rows
+
+
+def _join_line(paragraph: str, line: str) -> str:
+    if paragraph.endswith("-") and line[:1].islower():
+        return paragraph[:-1] + line  # de-hyphenate words split across lines
+    return f"{paragraph} {line}"
+
+
+def _units(pages: list[dict]):
+    """
+    Walk blocks once, yielding ("heading", text, page, size) or (kind, text, page, None) for
+    kind in "text" (a paragraph), "bullet" (a list item with its continuation lines) and "row".
+    """
+    body = body_font_size(pages)
+    min_size = body * MIN_SIZE_RATIO
+    heading_size = body * HEADING_SIZE_RATIO
+
+    for page in pages:
+        number = page["number"]
+        for block in page["blocks"]:
+            kind, text, bullet_x0 = None, "", 0.0
+            for row_text, size, bold, x0, cells in _rows(block, min_size):
+                if cells > 1:
+                    row_kind = "row"
+                elif _BULLET.match(row_text):
+                    row_kind = "bullet"
+                    row_text = "• " + _BULLET.sub("", row_text, count=1) if not row_text[0].isdigit() else row_text
+                elif (size >= heading_size or (bold and len(block["lines"]) == 1 and not row_text.endswith("."))) and (
+                    len(row_text.split()) <= MAX_HEADING_WORDS and _HAS_LETTER.search(row_text)
+                ):
+                    if text:
+                        yield kind, text, number, None
+                        kind, text = None, ""
+                    yield "heading", row_text, number, size
+                    continue
+                else:
+                    row_kind = "text"
+
+                # Paragraph lines and bullet continuations (indented past the marker) extend the current unit
+                if text and row_kind == "text" and (kind == "text" or (kind == "bullet" and x0 > bullet_x0)):
+                    text = _join_line(text, row_text)
+                    continue
+                if text:
+                    yield kind, text, number, None
+                kind, text = row_kind, row_text
+                if row_kind == "bullet":
+                    bullet_x0 = x0
+            if text:
+                yield kind, text, number, None
+
+
+class _ChunkBuilder:
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunks: list[LayoutChunk] = []
+        self.heading = ""
+        self.units: list[tuple[str, int]] = []
+        self.length = 0
+
+    def _emit(self):
+        if not self.units:
+            return
+        lines = ([self.heading] if self.heading else []) + [text for text, _ in self.units]
+        text = _SYMBOLS.sub(lambda m: _SYMBOL_MAP[m.group()], "\n".join(lines))
+        if '"' in text:
+            text = merge_split_tokens(text)
+        self.chunks.append(LayoutChunk(text, sorted({page for _, page in self.units}), self.heading))
+
+    def start_section(self, heading: str):
+        self._emit()
+        max_heading = self.chunk_size // 2
+        if len(heading) > max_heading:
+            # Keep the innermost (most specific) end of a long heading path, leaving room for text
+            heading = "…" + heading[len(heading) - max_heading + 1:] if max_heading > 1 else ""
+        self.heading = heading
+        self.units = []
+        self.length = len(heading)
+
+    def add(self, kind: str, text: str, page: int):
+        budget = max(self.chunk_size - len(self.heading) - 1, 1)  # >= 1, so single characters always fit
+        if len(text) > budget:
+            splitter = RecursiveCharacterTextSplitter(
+                chunk_size=budget, chunk_overlap=min(self.chunk_overlap, budget // 2),
+                separators=["\n", ". ", " ", ""],
+            )
+            for piece in splitter.split_text(text):
+                self.add(kind, piece, page)
+            return
+
+        room = self.chunk_size - self.length - 1
+        if len(text) > room and kind == "text" and room >= self.chunk_size // 4:
+            # Fill the chunk with the paragraph's leading sentences; list items and table rows stay whole
+            cut = text.rfind(". ", 0, room)
+            if cut > 0:
+                self.units.append((text[:cut + 1], page))
+                self.length += cut + 2
+                text = text[cut + 2:]
+
+        if self.length + len(text) + 1 > self.chunk_size and self.units:
+            self._emit()
+            # Carry the last unit over when it fits in the overlap, so context spans the boundary
+            last = self.units[-1]
+            self.units = [last] if len(last[0]) <= self.chunk_overlap else []
+            self.length = len(self.heading) + sum(len(t) + 1 for t, _ in self.units)
+            if self.length + len(text) + 1 > self.chunk_size:
+                self.units, self.length = [], len(self.heading)
+        self.units.append((text, page))
+        self.length += len(text) + 1
+
+    def finish(self) -> list[LayoutChunk]:
+        self._emit()
+        return self.chunks
+
+
+def chunk_layout(pages: list[dict], chunk_size: int = 600, chunk_overlap: int = 100) -> list[LayoutChunk]:
+    """
+    Chunk PyMuPDF "dict" layout pages (see PyMuPDFExtractor.extract_layout) in a single pass.
+    Each chunk starts with its heading path (larger headings are parents of smaller ones),
+    keeps list items and table rows whole, and records the pages it was taken from.
+    """
+    builder = _ChunkBuilder(chunk_size, chunk_overlap)
+    headings: list[tuple[float, str]] = []
+
+    for kind, text, page, size in _units(pages):
+        if kind == "heading":
+            while headings and headings[-1][0] <= size:
+                headings.pop()
+            headings.append((size, text))
+            builder.start_section(" > ".join(h for _, h in headings))
+        else:
+            builder.add(kind, text, page)
+
+    chunks = builder.finish()
+    logger.debug("Layout chunker produced %d chunks from %d pages", len(chunks), len(pages))
+    return chunks
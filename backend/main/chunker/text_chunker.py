@@ -3,29 +3,29 @@ import re
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import logging
 from main.config import Config
+from main.utils.text_preprocessor import SPACES_RULE, TextPipeline, sub_rule
 
 logger = logging.getLogger(__name__)
 
 
 
-def prepare_for_chunking(text: str) -> str:
-    """Normalize raw text for consistent chunking."""
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-
+PREPARE = TextPipeline("prepare_for_chunking", [
+    sub_rule("line_endings", r"\r\n?", "\n", guard=("\r",)),
     # Normalize patterns like "E7 2" → "E7.2"
-    text = re.sub(r"\b(E)\s+(\d+\.\d+)\b", r"\1\2", text)
-
+    sub_rule("section_codes", r"E(?<=\bE)\s+(\d+\.\d+)\b", r"E\1", guard=("E",)),
     # Ensure bullet-like items start on new lines
-    text = re.sub(r"(?<!\n)[•\-–\u2022]\s*", r"\n\g<0>", text)
-
+    sub_rule("bullet_breaks", r"[•\-–](?<!\n[•\-–])\s*", r"\n\g<0>"),
     # Ensure numbered lists (1., 2.) start on new lines
-    text = re.sub(r"(?<!\n)(\d+\.)\s+", r"\n\1 ", text)
-
+    sub_rule("numbered_breaks", r"(\d(?<!\n\d)\d*\.)\s+", r"\n\1 ", guard=(".",)),
     # Collapse redundant whitespace/newlines
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    SPACES_RULE,
+    sub_rule("blank_lines", r"\n{3,}", "\n\n", guard=("\n\n\n",)),
+])
+
 
-    return text.strip()
+def prepare_for_chunking(text: str, timings: dict[str, float] | None = None) -> str:
+    """Normalize raw text for consistent chunking."""
+    return PREPARE.run(text, timings)
 
 
 def chunk_text(text: str, chunk_size: int = 600, chunk_overlap: int = 100) -> list[str]:
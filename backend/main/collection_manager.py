@@ -0,0 +1,111 @@
+"""Serves several named collections from one process, keeping recently used indexes resident under a memory budget."""
+import logging
+import threading
+from collections import OrderedDict
+from main.config import Config
+from main.intent_detector.intent_detector_factory import create_intent_detector
+from main.pipeline_core import RAGPipeline
+from main.retrieval.vector_store.index_collections import DEFAULT_COLLECTION, IndexCollection
+from main.utils import metrics
+from main.utils.runtime_stats import index_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionManager:
+    """
+    One RAGPipeline per collection, created on first use with its saved index (built only if missing). Pipelines share
+    one intent detector. After each lookup, least recently used indexes are unloaded until the resident
+    total fits memory_budget_bytes; the default pipeline and the one just requested are never unloaded.
+    Queries already running on an unloaded index finish on it.
+    """
+
+    def __init__(self, collections: dict[str, IndexCollection], default_pipeline: RAGPipeline, memory_budget_bytes: int | None = None):
+        self.collections = collections
+        self.memory_budget_bytes = memory_budget_bytes if memory_budget_bytes is not None else Config.COLLECTION_MEMORY_BUDGET_MB * 1024 * 1024
+        self._pipelines: OrderedDict[str, RAGPipeline] = OrderedDict({DEFAULT_COLLECTION: default_pipeline})
+        self._sizes: dict[str, tuple[int, int]] = {}  # name -> (id of the sized store, bytes)
+        self._intent_detector = None
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @property
+    def default(self) -> RAGPipeline:
+        return self._pipelines[DEFAULT_COLLECTION]
+
+    def _shared_intent_detector(self):
+        if self._intent_detector is None:
+            self._intent_detector = self.default._intent_detector or create_intent_detector()
+        return self._intent_detector
+
+    def get(self, name: str | None = None) -> RAGPipeline:
+        """The initialized pipeline for a collection (default if name is None). KeyError if unknown."""
+        name = name or DEFAULT_COLLECTION
+        collection = self.collections.get(name)
+        if collection is None:
+            raise KeyError(f"Unknown collection: {name}")
+
+        with self._lock:
+            pipeline = self._pipelines.get(name)
+            metrics.record_cache("collection", hit=pipeline is not None and pipeline.initialized)
+            if pipeline is None:
+                pipeline = RAGPipeline(lazy=True, collection=collection, intent_detector=self._shared_intent_detector())
+                self._pipelines[name] = pipeline
+            self._pipelines.move_to_end(name)
+
+        pipeline.initialize()  # outside the manager lock: loading one collection does not block the others
+        self._enforce_budget(keep=name)
+        return pipeline
+
+    def peek(self, name: str | None = None) -> RAGPipeline | None:
+        """The pipeline for a collection if one exists, without loading anything. KeyError if unknown."""
+        name = name or DEFAULT_COLLECTION
+        if name not in self.collections:
+            raise KeyError(f"Unknown collection: {name}")
+        return self._pipelines.get(name)
+
+    def _resident_bytes(self, name: str, pipeline: RAGPipeline) -> int:
+        if not pipeline.initialized:
+            return 0
+        store = pipeline.index
+        cached = self._sizes.get(name)
+        if cached is None or cached[0] != id(store):  # sized once per store; a refresh swaps in a new one
+            cached = (id(store), index_memory_bytes(store))
+            self._sizes[name] = cached
+        return cached[1]
+
+    def _enforce_budget(self, keep: str):
+        with self._lock:
+            sizes = {name: self._resident_bytes(name, pipeline) for name, pipeline in self._pipelines.items()}
+            total = sum(sizes.values())
+            for name in list(self._pipelines):  # least recently used first
+                if total <= self.memory_budget_bytes:
+                    break
+                if name in (keep, DEFAULT_COLLECTION) or not sizes[name]:
+                    continue
+                del self._pipelines[name]
+                self._sizes.pop(name, None)
+                total -= sizes[name]
+                self.evictions += 1
+                logger.info("Unloaded collection %s (%.1f MB) to stay within the %.1f MB budget",
+                            name, sizes[name] / 1e6, self.memory_budget_bytes / 1e6)
+
+    def status(self) -> dict:
+        with self._lock:
+            resident = {name: self._resident_bytes(name, p) for name, p in self._pipelines.items() if p.initialized}
+            order = list(self._pipelines)
+        return {
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "resident_bytes": sum(resident.values()),
+            "evictions": self.evictions,
+            "collections": [
+                {
+                    **collection.to_dict(),
+                    "resident": name in resident,
+                    "index_bytes": resident.get(name),
+                    # 0 = least recently used among loaded pipelines
+                    "lru_position": order.index(name) if name in order else None,
+                }
+                for name, collection in self.collections.items()
+            ],
+        }
@@ -6,6 +6,9 @@ load_dotenv()
 class Config:
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    # "torch", "onnx", or "onnx-int8" (dynamically quantized ONNX export, cached under EMBEDDING_ONNX_DIR)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+    EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "avx2")  # arm64, avx2, avx512, avx512_vnni
     SAMPLE_DIR: str = os.getenv("SAMPLE_DIR", "sample_pdfs")
     DEBUG_OUTPUT_DIR: str = os.getenv("DEBUG_OUTPUT_DIR", "debug_chunks")
     CACHE_MODE = os.getenv("CACHE_MODE", "full").lower()
@@ -24,16 +27,43 @@ class Config:
     RERANK_PROVIDER = os.getenv("RERANK_PROVIDER", "none").lower()
 
     PDF_EXTRACTOR_PROVIDER = os.getenv("PDF_EXTRACTOR_PROVIDER", "pymupdf").lower()
+    # "text" (regex cleanup + recursive splitter) or "layout" (PyMuPDF font/position blocks; pymupdf extractor only)
+    CHUNKER = os.getenv("CHUNKER", "text").lower()
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "600"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "100"))
     AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 
     
     USE_S3 = os.getenv("USE_S3", "false").lower() == "true"
     S3_BUCKET = os.getenv("S3_BUCKET", "blcp-rag-pdf-files")
     S3_PREFIX = os.getenv("S3_PREFIX", "")
+    # Extra named collections as "name=prefix,..." (each with its own manifest and index), selected per request;
+    # the "default" collection is S3_PREFIX with the global index. Resident indexes beyond the memory budget
+    # are unloaded least recently used first.
+    COLLECTIONS = os.getenv("COLLECTIONS", "")
+    COLLECTION_MEMORY_BUDGET_MB = int(os.getenv("COLLECTION_MEMORY_BUDGET_MB", "2048"))
     CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+    EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", os.path.join(CACHE_DIR, "onnx_models"))
+    # Preprocessed text per (file hash, extractor, preprocessing rule set); a hit skips extraction and preprocessing
+    PREPROCESS_CACHE = os.getenv("PREPROCESS_CACHE", "true").lower() == "true"
+    PREPROCESS_CACHE_DIR = os.getenv("PREPROCESS_CACHE_DIR", os.path.join(CACHE_DIR, "preprocessed"))
+    # Raw extractor output (gzip) per (file hash, extractor provider, extractor version); independent of
+    # preprocessing, chunking and embedding settings, so rebuilds with new settings skip extraction
+    EXTRACTION_CACHE = os.getenv("EXTRACTION_CACHE", "true").lower() == "true"
+    EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(CACHE_DIR, "extracted"))
 
 
 
+    # Distributed ingestion (ingest_cli.py): SQLite work queue, per-document vector shards, lease length and retries
+    INGEST_QUEUE_PATH = os.getenv("INGEST_QUEUE_PATH", os.path.join(CACHE_DIR, "ingest_queue.sqlite"))
+    SHARD_DIR = os.getenv("SHARD_DIR", os.path.join("faiss_index", "shards"))
+    INGEST_LEASE_SECONDS = float(os.getenv("INGEST_LEASE_SECONDS", "600"))
+    INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+
+    # faiss index_factory spec ("Flat" = exact) and search-time parameters such as "nprobe=16" / "efSearch=64"
+    FAISS_INDEX_FACTORY = os.getenv("FAISS_INDEX_FACTORY", "Flat")
+    FAISS_SEARCH_PARAMS = os.getenv("FAISS_SEARCH_PARAMS", "")
+
     TOP_K_FAISS = int(os.getenv("TOP_K_FAISS", "40"))
     TOP_N_RERANK = int(os.getenv("TOP_N_RERANK", "10"))
     FAISS_SCORE_THRESHOLD = float(os.getenv("FAISS_SCORE_THRESHOLD", "0.2"))
@@ -42,12 +72,65 @@ class Config:
     BEDROCK_KNOWLEDGE_BASE_ID = os.getenv("BEDROCK_KNOWLEDGE_BASE_ID")
     BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
 
+    # Reduced-dimension index: "none", "pca" (fitted at build time) or "truncate" (Matryoshka-trained models only).
+    # Falls back to full-dim vectors if measured recall@10 vs. the full index is below PROJECTION_MIN_RECALL.
+    EMBEDDING_PROJECTION = os.getenv("EMBEDDING_PROJECTION", "none").lower()
+    PROJECTION_DIM = int(os.getenv("PROJECTION_DIM", "128"))
+    PROJECTION_MIN_RECALL = float(os.getenv("PROJECTION_MIN_RECALL", "0.9"))
+
     MERGE_WINDOW_SIZE = int(os.getenv("MERGE_WINDOW_SIZE", "1"))
     PROXIMITY_MERGE = os.getenv("PROXIMITY_MERGE", "false").lower() == "true"
 
+    # API: load model/index and run a dummy query in the background right after startup
+    WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+    # Run retrieval concurrently with intent detection; discarded for quick-response intents
+    SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+    SPECULATIVE_WORKERS = int(os.getenv("SPECULATIVE_WORKERS", "4"))
+
+    # Prompt size envelope; tokenizer is "approx", "whitespace" or a Hugging Face tokenizer name
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+    HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "600"))
+    PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "approx")
+
+    # Extractive compression: keep the top sentences / list and table blocks per query
+    CONTEXT_COMPRESSION = os.getenv("CONTEXT_COMPRESSION", "true").lower() == "true"
+    COMPRESSION_MAX_UNITS = int(os.getenv("COMPRESSION_MAX_UNITS", "15"))
+    COMPRESSION_MIN_SCORE = float(os.getenv("COMPRESSION_MIN_SCORE", "0.2"))
+
+    # Server-side chat sessions; SESSION_PERSIST_DIR="" keeps them in memory only
+    SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+    SESSION_PERSIST_DIR = os.getenv("SESSION_PERSIST_DIR", "")
+    SESSION_COMPACT_TOKENS = int(os.getenv("SESSION_COMPACT_TOKENS", "800"))
+    SESSION_KEEP_TURNS = int(os.getenv("SESSION_KEEP_TURNS", "3"))
+    SESSION_SUMMARIZER = os.getenv("SESSION_SUMMARIZER", "extractive").lower()
+
+    # Per-request trace spans: "memory" (last TRACE_MEMORY_SPANS spans, served at /traces), "file" (JSON lines) or "none"
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "memory").lower()
+    TRACE_FILE = os.getenv("TRACE_FILE", os.path.join("logs", "traces.jsonl"))
+    TRACE_MEMORY_SPANS = int(os.getenv("TRACE_MEMORY_SPANS", "5000"))
+
+    # On-demand cProfile of single /query requests (X-Profile header); off unless enabled.
+    # With PROFILING_TOKEN set, the header value must match it.
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+    COALESCE_QUERIES = os.getenv("COALESCE_QUERIES", "true").lower() == "true"
+
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "1000"))
+
+    # "embedding" classifies locally and escalates to the LLM below the threshold; "llm" always asks the LLM
+    INTENT_DETECTOR_PROVIDER = os.getenv("INTENT_DETECTOR_PROVIDER", "embedding").lower()
+    INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.55"))
+
 
     _overrides = {}
 
+    # Never returned by get_all() (served at GET /config)
+    _SECRETS = ("cohere_api_key", "profiling_token")
+
     OPTIONS = {
         "llm_provider": ["ollama", "bedrock"],
         "ollama_model": ["mistral", "gemma", "llama2"],
@@ -60,6 +143,11 @@ class Config:
         "retriever_type": ["faiss", "bedrock"],
         "pdf_extractor_provider": ["pymupdf", "aws-textract", "hybrid"],
         "cache_mode": ["full", "partial", "none"],
+        "chunker": ["text", "layout"],
+        "intent_detector_provider": ["embedding", "llm"],
+        "tracing_exporter": ["memory", "file", "none"],
+        "embedding_backend": ["torch", "onnx", "onnx-int8"],
+        "embedding_projection": ["none", "pca", "truncate"],
         "embedding_model": [
             "all-MiniLM-L6-v2",
             "multi-qa-MiniLM-L6-cos-v1",
@@ -87,6 +175,9 @@ class Config:
             if not k.startswith("_") and isinstance(v, allowed)
         }
         base.update(cls._overrides)
+        for key in cls._SECRETS:
+            if base.get(key):
+                base[key] = "***"
         return base
 
 
@@ -1,11 +1,22 @@
 """Embedding Generator Module"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import List, TYPE_CHECKING
 from main.config import Config
-from typing import List
-from sentence_transformers import SentenceTransformer
 from main.utils.normalize_tokens import normalize_text
 
-# Load the model once (cached)
-_model = SentenceTransformer(Config.EMBEDDING_MODEL)
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+# Loaded once, on first use (not at import time)
+_model = None
+_model_lock = threading.Lock()
+_load_seconds = None
 
 
 def embed_text_chunks(chunks: List[str]) -> List[List[float]]:
@@ -22,14 +33,79 @@ def embed_text_chunks(chunks: List[str]) -> List[List[float]]:
         return []
     
     normalized_chunks = [normalize_text(c) for c in chunks]
-    return _model.encode(normalized_chunks, convert_to_numpy=True, show_progress_bar=Config.DEBUG).tolist()
+    return get_model().encode(normalized_chunks, convert_to_numpy=True, show_progress_bar=Config.DEBUG).tolist()
 
 
-def get_model() -> SentenceTransformer:
+def get_model() -> "SentenceTransformer":
     """
-    Expose the internal model (used for query embedding).
+    Expose the internal model (used for query embedding), loading it on first call.
 
     Returns:
         SentenceTransformer: Preloaded embedding model.
     """
+    global _model, _load_seconds
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                start = time.perf_counter()
+                _model = load_model()
+                _load_seconds = time.perf_counter() - start
+                logger.info(
+                    "Loaded embedding model '%s' (%s backend) in %.2f sec",
+                    Config.EMBEDDING_MODEL, Config.EMBEDDING_BACKEND, _load_seconds
+                )
     return _model
+
+
+def load_model(model_name: str | None = None, backend: str | None = None) -> "SentenceTransformer":
+    """
+    Build a new embedding model for the given backend ("torch", "onnx" or "onnx-int8").
+    Defaults come from Config; get_model() keeps the shared instance.
+    """
+    from sentence_transformers import SentenceTransformer  # heavy import, deferred with the model
+
+    model_name = model_name or Config.EMBEDDING_MODEL
+    backend = (backend or Config.EMBEDDING_BACKEND).lower()
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    elif backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+    elif backend == "onnx-int8":
+        export_dir, file_name = _quantized_onnx_model(model_name, Config.EMBEDDING_QUANTIZATION)
+        return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": file_name})
+    else:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+
+
+def _find_quantized_file(export_dir: str, quantization: str) -> str | None:
+    onnx_dir = os.path.join(export_dir, "onnx")
+    if os.path.isdir(onnx_dir):
+        for name in sorted(os.listdir(onnx_dir)):
+            if name.endswith(f"int8_{quantization}.onnx"):  # qint8 or quint8 depending on the target
+                return f"onnx/{name}"
+    return None
+
+
+def _quantized_onnx_model(model_name: str, quantization: str) -> tuple[str, str]:
+    """Export and quantize the model once; later loads reuse the files in EMBEDDING_ONNX_DIR."""
+    export_dir = os.path.join(Config.EMBEDDING_ONNX_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+    file_name = _find_quantized_file(export_dir, quantization)
+    if file_name is None:
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        logger.info("Exporting int8 (%s) ONNX model for '%s' to %s", quantization, model_name, export_dir)
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save(export_dir)
+        export_dynamic_quantized_onnx_model(model, quantization, export_dir)
+        file_name = _find_quantized_file(export_dir, quantization)
+    return export_dir, file_name
+
+
+def is_loaded() -> bool:
+    return _model is not None
+
+
+def get_load_seconds() -> float | None:
+    """Wall time spent loading the model, or None if it has not been loaded yet."""
+    return _load_seconds
@@ -0,0 +1,82 @@
+"""Parity check between two embedding backends (e.g. PyTorch vs. int8 ONNX)."""
+import argparse
+import json
+import logging
+import time
+import numpy as np
+from main.config import Config
+from main.utils.normalize_tokens import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_parity(reference, candidate, texts: list[str], batch_size: int = 64) -> dict:
+    """
+    Encode texts with both models and report per-text cosine similarity between the
+    two embeddings, plus how often each text's nearest neighbour in the sample agrees.
+    """
+    texts = [normalize_text(t) for t in texts]
+
+    start = time.perf_counter()
+    ref = reference.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    reference_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cand = candidate.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    candidate_sec = time.perf_counter() - start
+
+    cosines = np.sum(ref * cand, axis=1)
+
+    neighbour_agreement = None
+    if len(texts) > 1:
+        ref_sim, cand_sim = ref @ ref.T, cand @ cand.T
+        np.fill_diagonal(ref_sim, -np.inf)
+        np.fill_diagonal(cand_sim, -np.inf)
+        neighbour_agreement = float(np.mean(ref_sim.argmax(axis=1) == cand_sim.argmax(axis=1)))
+
+    return {
+        "samples": len(texts),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "p01_cosine": float(np.percentile(cosines, 1)),
+        "max_drift": float(1.0 - cosines.min()),
+        "neighbour_agreement": neighbour_agreement,
+        "reference_sec": round(reference_sec, 4),
+        "candidate_sec": round(candidate_sec, 4),
+        "speedup": round(reference_sec / candidate_sec, 2) if candidate_sec else None,
+    }
+
+
+def sample_corpus(limit: int) -> list[str]:
+    """Evenly spaced chunks from the global FAISS index metadata."""
+    from main.retrieval.vector_store import faiss_indexer
+    from main.retrieval.vector_store.index_builder import FAISS_INDEX_PATH
+
+    chunks = faiss_indexer.load_faiss_index(FAISS_INDEX_PATH).metadata
+    if len(chunks) <= limit:
+        return list(chunks)
+    step = len(chunks) / limit
+    return [chunks[int(i * step)] for i in range(limit)]
+
+
+def main():
+    from main.embedder.embedder import load_model
+
+    parser = argparse.ArgumentParser(description="Compare an embedding backend against the PyTorch model")
+    parser.add_argument("--backend", default=Config.EMBEDDING_BACKEND, choices=Config.OPTIONS["embedding_backend"])
+    parser.add_argument("--reference", default="torch", choices=Config.OPTIONS["embedding_backend"])
+    parser.add_argument("--limit", type=int, default=500, help="Number of index chunks to compare")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="Fail if any text drifts below this")
+    args = parser.parse_args()
+
+    texts = sample_corpus(args.limit)
+    report = embedding_parity(load_model(backend=args.reference), load_model(backend=args.backend), texts)
+    report.update({"model": Config.EMBEDDING_MODEL, "reference": args.reference, "backend": args.backend})
+    print(json.dumps(report, indent=2))
+
+    if report["min_cosine"] < args.min_cosine:
+        raise SystemExit(f"Parity check failed: min cosine {report['min_cosine']:.4f} < {args.min_cosine}")
+
+
+if __name__ == "__main__":
+    main()
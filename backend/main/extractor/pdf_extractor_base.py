@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 from typing import Union
 
 class PDFExtractorBase(ABC):
+    # Identify the extractor's output in the extracted-text cache; bump version when output changes
+    provider: str = "base"
+    version: str = "1"
+
     @abstractmethod
     def extract_text(self, source: Union[str, bytes]) -> str:
         """Extract text from a file path or raw PDF bytes"""
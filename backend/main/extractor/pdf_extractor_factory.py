@@ -1,8 +1,12 @@
 from .pdf_extractor_base import PDFExtractorBase
-from .pdf_extractor_pymupdf import PyMuPDFExtractor
-from .pdf_extractor_textract import TextractExtractor
-from .pdf_extractor_hybrid import HybridPDFExtractor
 from main.config import Config
+from main.utils.plugin_registry import PluginRegistry
+
+PDF_EXTRACTORS = PluginRegistry("pdf_extractor", error_message="Unsupported PDF extractor provider: {name}")
+PDF_EXTRACTORS.register("pymupdf", "main.extractor.pdf_extractor_pymupdf:PyMuPDFExtractor")
+PDF_EXTRACTORS.register("textract", "main.extractor.pdf_extractor_textract:TextractExtractor")
+PDF_EXTRACTORS.register("aws-textract", "main.extractor.pdf_extractor_textract:TextractExtractor")
+PDF_EXTRACTORS.register("hybrid", "main.extractor.pdf_extractor_hybrid:HybridPDFExtractor")
 
 
 def create_pdf_extractor(config: dict | None = None) -> PDFExtractorBase:
@@ -12,11 +16,6 @@ def create_pdf_extractor(config: dict | None = None) -> PDFExtractorBase:
 
     provider = config.get("provider", Config.PDF_EXTRACTOR_PROVIDER).lower()
 
-    if provider == "pymupdf":
-        return PyMuPDFExtractor()
-    elif provider == "textract":
-        return TextractExtractor(region=config.get("region", Config.AWS_REGION))
-    elif provider == "hybrid":
-        return HybridPDFExtractor()
-    else:
-        raise ValueError(f"Unsupported PDF extractor provider: {provider}")
+    if provider in ("textract", "aws-textract"):
+        return PDF_EXTRACTORS.create(provider, region=config.get("region", Config.AWS_REGION))
+    return PDF_EXTRACTORS.create(provider)
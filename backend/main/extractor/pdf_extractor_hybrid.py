@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 
 
 class HybridPDFExtractor(PDFExtractorBase):
+    provider = "hybrid"
+    version = f"1-{PyMuPDFExtractor.version}-{TextractExtractor.version}"
+
     def __init__(self, region="us-east-1"):
         self.text_extractor = PyMuPDFExtractor()
         self.table_extractor = TextractExtractor(region=region)
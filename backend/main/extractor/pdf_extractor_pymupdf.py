@@ -3,6 +3,11 @@ from typing import Union
 from .pdf_extractor_base import PDFExtractorBase
 
 class PyMuPDFExtractor(PDFExtractorBase):
+    provider = "pymupdf"
+    version = f"1-{fitz.VersionBind}"
+    # Text-only "dict" output: no image bytes, ligatures and whitespace preserved
+    LAYOUT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
     def extract_text(self, source: Union[str, bytes]) -> str:
         text = []
         try:
@@ -18,3 +23,20 @@ class PyMuPDFExtractor(PDFExtractorBase):
             return "\n".join(text)
         except Exception as e:
             raise RuntimeError(f"PyMuPDF failed to extract text: {e}") from e
+
+    def extract_layout(self, source: Union[str, bytes]) -> list[dict]:
+        """Text blocks of each page in reading order, as {"number": 1-based page, "blocks": [...]}."""
+        try:
+            if isinstance(source, bytes):
+                doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                doc = fitz.open(source)
+
+            pages = []
+            for page in doc:
+                layout = page.get_text("dict", flags=self.LAYOUT_FLAGS, sort=True)
+                blocks = [block for block in layout["blocks"] if block["type"] == 0]
+                pages.append({"number": page.number + 1, "blocks": blocks})
+            return pages
+        except Exception as e:
+            raise RuntimeError(f"PyMuPDF failed to extract layout: {e}") from e
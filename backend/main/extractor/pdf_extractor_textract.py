@@ -12,6 +12,9 @@ logger = logging.getLogger(__name__)
 class TextractExtractor(PDFExtractorBase):
     """Extract text from PDFs using AWS Textract."""
 
+    provider = "aws-textract"
+    version = "1"
+
     def __init__(self, region="us-east-1", poll_interval=5, timeout=300):
         self.client = boto3.client("textract", region_name=region)
         self.poll_interval = poll_interval
@@ -0,0 +1,137 @@
+import logging
+import re
+import threading
+import numpy as np
+from main.config import Config
+from main.embedder import embedder
+from main.intent_detector.intent_detector_base import IntentDetectorBase
+
+logger = logging.getLogger(__name__)
+
+
+# Labeled example utterances; each intent is represented by the centroid of its examples
+INTENT_EXAMPLES = {
+    "greeting": [
+        "hello", "hi there", "hey", "good morning", "good afternoon",
+        "hello, how are you?", "hi, anyone there?",
+    ],
+    "thanks": [
+        "thanks", "thank you", "thanks a lot", "thank you so much",
+        "much appreciated", "great, thanks for the help",
+    ],
+    "goodbye": [
+        "bye", "goodbye", "see you later", "talk to you later",
+        "that's all for now, bye", "have a nice day",
+    ],
+    "help": [
+        "what can you do?", "how can you help me?", "help",
+        "what kind of questions can I ask?", "how does this assistant work?",
+    ],
+    "chitchat": [
+        "how are you doing today?", "tell me a joke", "what's your name?",
+        "are you a robot?", "what's the weather like?",
+    ],
+    "question": [
+        "what is the maximum flow rate of the E9.2 circulator?",
+        "which accessories are available for this pump?",
+        "what materials is the pump casing made of?",
+        "list the technical data for the E7.2B model",
+        "what is the operating temperature range?",
+        "how do I install the flange kit?",
+        "what motor options are available?",
+    ],
+    "unclear": [
+        "asdfgh", "???", "hmm", "stuff", "the thing",
+    ],
+}
+
+# Exact-match rules for very short messages, checked before any embedding work
+KEYWORD_INTENTS = {
+    "hi": "greeting", "hello": "greeting", "hey": "greeting", "yo": "greeting",
+    "thanks": "thanks", "thx": "thanks", "ty": "thanks", "thank you": "thanks",
+    "bye": "goodbye", "goodbye": "goodbye", "cya": "goodbye",
+    "help": "help", "?": "unclear",
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s?]")
+
+
+class EmbeddingIntentDetector(IntentDetectorBase):
+    """
+    In-process intent classifier using the shared SentenceTransformer.
+    Short inputs are resolved by rules; everything else by nearest centroid over
+    INTENT_EXAMPLES. Low-confidence matches are escalated to an LLM detector.
+    """
+
+    def __init__(self, model=None, fallback_factory=None, threshold: float = None):
+        self._model = model
+        self.fallback_factory = fallback_factory
+        self._fallback = None
+        self.threshold = Config.INTENT_CONFIDENCE_THRESHOLD if threshold is None else threshold
+
+        self.intents = list(INTENT_EXAMPLES)
+        self._centroids = None
+        self._centroids_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = embedder.get_model()
+        return self._model
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Intent centroids, computed on first use."""
+        if self._centroids is None:
+            with self._centroids_lock:
+                if self._centroids is None:
+                    self._centroids = self._build_centroids()
+        return self._centroids
+
+    def warmup(self):
+        _ = self.centroids
+
+    def _build_centroids(self) -> np.ndarray:
+        examples = [e for intent in self.intents for e in INTENT_EXAMPLES[intent]]
+        vectors = self.model.encode(examples, convert_to_numpy=True, normalize_embeddings=True)
+
+        centroids = []
+        offset = 0
+        for intent in self.intents:
+            count = len(INTENT_EXAMPLES[intent])
+            centroid = vectors[offset:offset + count].mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+            offset += count
+        return np.vstack(centroids).astype("float32")
+
+    def _rule_intent(self, text: str) -> str | None:
+        cleaned = _PUNCTUATION.sub("", text).strip().lower()
+        if not cleaned:
+            return "empty" if not text.strip() else "unclear"
+        if cleaned in KEYWORD_INTENTS:
+            return KEYWORD_INTENTS[cleaned]
+        if len(cleaned) <= 2:
+            return "unclear"
+        return None
+
+    def classify(self, text: str) -> tuple[str, float]:
+        """Return (intent, cosine score) of the nearest centroid, without rules or escalation."""
+        vector = self.model.encode([text.strip()], convert_to_numpy=True, normalize_embeddings=True)[0]
+        scores = self.centroids @ vector
+        best = int(np.argmax(scores))
+        return self.intents[best], float(scores[best])
+
+    def detect(self, text: str) -> str:
+        intent = self._rule_intent(text)
+        if intent:
+            return intent
+
+        intent, confidence = self.classify(text)
+        if confidence >= self.threshold or self.fallback_factory is None:
+            logger.debug("Local intent '%s' (confidence %.2f)", intent, confidence)
+            return intent
+
+        logger.debug("Local intent '%s' below threshold (%.2f), escalating to LLM.", intent, confidence)
+        if self._fallback is None:
+            self._fallback = self.fallback_factory()
+        return self._fallback.detect(text)
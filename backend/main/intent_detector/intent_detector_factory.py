@@ -1,13 +1,25 @@
 from main.config import Config
-from main.intent_detector.ollama_intent_detector import OllamaIntentDetector
-from main.intent_detector.bedrock_intent_detector import BedrockIntentDetector
+from main.utils.plugin_registry import PluginRegistry
 
+INTENT_DETECTORS = PluginRegistry("intent_detector", error_message="Unsupported intent detector provider: {name}")
+INTENT_DETECTORS.register("bedrock", "main.intent_detector.bedrock_intent_detector:BedrockIntentDetector")
+INTENT_DETECTORS.register("ollama", "main.intent_detector.ollama_intent_detector:OllamaIntentDetector")
+INTENT_DETECTORS.register("embedding", "main.intent_detector.embedding_intent_detector:EmbeddingIntentDetector")
 
-def create_intent_detector():
+
+def create_llm_intent_detector():
     provider = Config.LLM_PROVIDER.lower()
-    if provider == "bedrock":
-        return BedrockIntentDetector()
-    elif provider == "ollama":
-        return OllamaIntentDetector()
+    if provider not in ("bedrock", "ollama"):
+        raise ValueError(f"Unsupported intent detector provider: {provider}")
+    return INTENT_DETECTORS.create(provider)
+
+
+def create_intent_detector():
+    provider = Config.INTENT_DETECTOR_PROVIDER.lower()
+    if provider == "embedding":
+        # LLM detector is only constructed on the first low-confidence message
+        return INTENT_DETECTORS.create("embedding", fallback_factory=create_llm_intent_detector)
+    elif provider == "llm":
+        return create_llm_intent_detector()
     else:
         raise ValueError(f"Unsupported intent detector provider: {provider}")
@@ -0,0 +1,114 @@
+"""Extractive compression of retrieved sections before prompt building."""
+import logging
+import re
+import numpy as np
+from main.config import Config
+from main.embedder import embedder
+from main.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+_LIST_LINE = re.compile(r"^\s*([•\-–*]|\d+[.)])\s+")
+_TABLE_LINE = re.compile(r"\|| {2,}|\t")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"(])")
+
+
+def _is_structured(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if _LIST_LINE.match(stripped) or _TABLE_LINE.search(stripped):
+        return True
+    # Numeric-heavy lines (spec rows like "Flow 10 gpm 38 l/min") read as table rows
+    tokens = stripped.split()
+    numeric = sum(any(ch.isdigit() for ch in t) for t in tokens)
+    return numeric >= 2 and numeric / len(tokens) >= 0.3 and not stripped.endswith((".", "!", "?"))
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    return 0 < len(stripped.split()) <= 6 and not stripped.endswith((".", "!", "?", ";"))
+
+
+def split_units(section: str) -> list[str]:
+    """
+    Split a section into scoring units: sentences of prose, and list/table blocks
+    (consecutive structured lines plus a directly preceding heading) kept whole.
+    """
+    units = []
+    prose = []
+    block = []
+
+    def flush_prose():
+        if prose:
+            text = " ".join(prose)
+            units.extend(s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip())
+            prose.clear()
+
+    def flush_block():
+        if block:
+            units.append("\n".join(block))
+            block.clear()
+
+    for line in section.splitlines():
+        if _is_structured(line):
+            if not block and prose and _is_heading(prose[-1]):
+                heading = prose.pop()
+                flush_prose()
+                block.append(heading.strip())
+            else:
+                flush_prose()
+            block.append(line.strip())
+        elif line.strip():
+            flush_block()
+            prose.append(line.strip())
+        else:
+            flush_block()
+            flush_prose()
+
+    flush_block()
+    flush_prose()
+    return units
+
+
+@tracing.traced("compress_sections")
+def compress_sections(query_text: str, sections: list[str], model=None, max_units: int = None, min_score: float = None) -> list[str]:
+    """
+    Keep only the units of each section most similar to the query.
+    All units across all sections are scored in one encode call; the top max_units
+    scoring at least min_score survive (at least one overall), in original order.
+    Sections left empty are dropped; section order is preserved.
+    """
+    if not sections:
+        return sections
+
+    model = model or embedder.get_model()
+    max_units = max_units or Config.COMPRESSION_MAX_UNITS
+    min_score = Config.COMPRESSION_MIN_SCORE if min_score is None else min_score
+
+    section_units = [split_units(section) for section in sections]
+    flat = [(s, u) for s, units in enumerate(section_units) for u in range(len(units))]
+    if len(flat) <= max_units:
+        return sections
+
+    texts = [query_text] + [section_units[s][u] for s, u in flat]
+    vectors = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    scores = vectors[1:] @ vectors[0]
+
+    order = np.argsort(-scores)
+    keep = {flat[i] for i in order[:max_units] if scores[i] >= min_score}
+    if not keep:
+        keep = {flat[order[0]]}
+
+    compressed = []
+    for s, units in enumerate(section_units):
+        kept = [unit for u, unit in enumerate(units) if (s, u) in keep]
+        if kept:
+            compressed.append("\n".join(kept))
+
+    logger.debug(
+        "Compressed %d sections (%d units) to %d sections (%d units), %d -> %d chars",
+        len(sections), len(flat), len(compressed), len(keep),
+        sum(len(s) for s in sections), sum(len(s) for s in compressed)
+    )
+    return compressed
@@ -0,0 +1,120 @@
+"""Fit retrieved sections and conversation history into a fixed prompt token budget."""
+import logging
+from typing import Callable
+from main.config import Config
+from main.llm.token_counter import get_token_counter
+from main.session.session_store import SUMMARY_QUESTION
+
+logger = logging.getLogger(__name__)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """Longest prefix of text (cut at a line or word boundary when possible) within max_tokens."""
+    if max_tokens <= 0:
+        return ""
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = text[:low]
+    cut = max(prefix.rfind("\n"), prefix.rfind(" "))
+    return prefix[:cut] if cut > 0 else prefix
+
+
+def _fit_summary(summary: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """Summary within max_tokens, dropping its oldest lines first (newest are at the end)."""
+    lines = summary.splitlines()
+    while len(lines) > 1 and count_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return _truncate_to_tokens("\n".join(lines), max_tokens, count_tokens)
+
+
+def pack_context(
+    sections: list[str],
+    history: list[tuple[str, str]],
+    overhead_tokens: int,
+    budget: int | None = None,
+    history_budget: int | None = None,
+    count_tokens: Callable[[str], int] | None = None,
+) -> tuple[list[str], list[tuple[str, str]], dict]:
+    """
+    Select the history turns and context sections that fit the budget.
+
+    History is trimmed oldest-first to at most history_budget tokens, except that a
+    compacted session's summary (a leading SUMMARY_QUESTION turn) is always kept, cut to
+    at most half of that budget, since it stands for everything older; the remaining
+    budget (after the fixed instructions/question overhead) is filled with sections in
+    the given relevance order, skipping any that no longer fit. If not even the most
+    relevant section fits, it is truncated rather than sending no context at all.
+
+    Returns (kept_sections, kept_history, report).
+    """
+    budget = budget or Config.PROMPT_TOKEN_BUDGET
+    history_budget = Config.HISTORY_TOKEN_BUDGET if history_budget is None else history_budget
+    count_tokens = count_tokens or get_token_counter()
+
+    available = max(budget - overhead_tokens, 0)
+
+    # --- History: the session summary, then the newest turns that fit ---
+    history_tokens = 0
+    history_limit = min(history_budget, available)
+    turn_costs = [count_tokens(f"\nQ: {q}\nA: {a}") for q, a in history]
+    turns, costs, summary_turns = history, turn_costs, []
+    if history and history[0][0] == SUMMARY_QUESTION:
+        turns, costs = history[1:], turn_costs[1:]
+        summary = history[0][1]
+        if turn_costs[0] > history_limit // 2:
+            label_cost = count_tokens(f"\nQ: {SUMMARY_QUESTION}\nA: ")
+            summary = _fit_summary(summary, history_limit // 2 - label_cost, count_tokens)
+        if summary:
+            summary_turns = [(SUMMARY_QUESTION, summary)]
+            history_tokens = count_tokens(f"\nQ: {SUMMARY_QUESTION}\nA: {summary}")
+
+    kept_history = []
+    for turn, cost in zip(reversed(turns), reversed(costs)):
+        if history_tokens + cost > history_limit:
+            break
+        kept_history.insert(0, turn)
+        history_tokens += cost
+    kept_history = summary_turns + kept_history
+    dropped_history_tokens = sum(turn_costs) - history_tokens
+
+    # --- Context: fill the rest in relevance order ---
+    remaining = available - history_tokens
+    kept_sections = []
+    context_tokens = 0
+    dropped_sections = 0
+    dropped_context_tokens = 0
+    separator_cost = count_tokens("\n\n")
+
+    for section in sections:
+        cost = count_tokens(section) + (separator_cost if kept_sections else 0)
+        if context_tokens + cost <= remaining:
+            kept_sections.append(section)
+            context_tokens += cost
+        else:
+            dropped_sections += 1
+            dropped_context_tokens += cost
+
+    if sections and not kept_sections:
+        truncated = _truncate_to_tokens(sections[0], remaining, count_tokens)
+        if truncated:
+            kept_sections.append(truncated)
+            context_tokens = count_tokens(truncated)
+            dropped_sections -= 1
+            dropped_context_tokens -= count_tokens(sections[0]) - context_tokens
+
+    report = {
+        "budget": budget,
+        "used_tokens": overhead_tokens + history_tokens + context_tokens,
+        "context_tokens": context_tokens,
+        "history_tokens": history_tokens,
+        "overhead_tokens": overhead_tokens,
+        "dropped_tokens": dropped_context_tokens + dropped_history_tokens,
+        "dropped_sections": dropped_sections,
+        "dropped_history_turns": len(history) - len(kept_history),
+    }
+    return kept_sections, kept_history, report
@@ -1,16 +1,10 @@
-from main.llm.bedrock_client import BedrockClient
-from main.llm.ollama_client import OllamaClient
+from main.utils.plugin_registry import PluginRegistry
 
 
-LLM_CLIENTS = {
-    "bedrock": BedrockClient,
-    "ollama": OllamaClient,
-}
+LLM_CLIENTS = PluginRegistry("llm", error_message="Unsupported LLM provider: {name}")
+LLM_CLIENTS.register("bedrock", "main.llm.bedrock_client:BedrockClient")
+LLM_CLIENTS.register("ollama", "main.llm.ollama_client:OllamaClient")
 
 def get_llm_client(provider: str | None = None):
     """Factory function to get the appropriate LLM client based on configuration."""
-    client_cls = LLM_CLIENTS.get(provider)
-    if not client_cls:
-        raise ValueError(f"Unsupported LLM provider: {provider}")
-
-    return client_cls()
+    return LLM_CLIENTS.create(provider)
@@ -1,3 +1,10 @@
+from typing import Callable
+from main.llm.context_packer import pack_context
+from main.logger_config import log_duration
+from main.utils import tracing
+from main.llm.token_counter import get_token_counter
+
+
 def build_prompt(context: str, query: str, history: list[tuple[str, str]]) -> str:
     """
     Construct the LLM prompt given context, query, and conversation history.
@@ -16,3 +23,24 @@ def build_prompt(context: str, query: str, history: list[tuple[str, str]]) -> st
         "When listing items, preserve their exact names and units from the source.\n\n"
         f"{conversation}\n\nContext:\n{context}\n\nQuestion: {query}"
     )
+
+
+@tracing.traced("build_prompt")
+@log_duration("Prompt Build", stage="prompt_build")
+def build_packed_prompt(
+    sections: list[str],
+    query: str,
+    history: list[tuple[str, str]],
+    budget: int | None = None,
+    count_tokens: Callable[[str], int] | None = None,
+) -> tuple[str, dict]:
+    """
+    Build the prompt from context sections (most relevant first) within a token budget.
+    Returns (prompt, report) where report holds the tokens used and dropped.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    overhead = count_tokens(build_prompt("", query, []))
+    kept_sections, kept_history, report = pack_context(
+        sections, history, overhead, budget=budget, count_tokens=count_tokens
+    )
+    return build_prompt("\n\n".join(kept_sections), query, kept_history), report
@@ -0,0 +1,43 @@
+"""Pluggable token counters used to keep prompts inside a token budget."""
+import logging
+from functools import lru_cache
+from typing import Callable
+from main.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def approx_token_count(text: str) -> int:
+    """Cheap estimate (~4 characters per token for English), never below the word count."""
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, len(text.split()))
+
+
+def whitespace_token_count(text: str) -> int:
+    return len(text.split())
+
+
+@lru_cache(maxsize=4)
+def _hf_token_counter(name: str) -> Callable[[str], int]:
+    from transformers import AutoTokenizer  # optional: only needed for exact counts
+
+    tokenizer = AutoTokenizer.from_pretrained(name)
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False)) if text else 0
+
+
+def get_token_counter(name: str | None = None) -> Callable[[str], int]:
+    """
+    Resolve a token counter by name: 'approx' (default), 'whitespace',
+    or any Hugging Face tokenizer name/path for exact counts.
+    """
+    name = name or Config.PROMPT_TOKENIZER
+    if name == "approx":
+        return approx_token_count
+    if name == "whitespace":
+        return whitespace_token_count
+    try:
+        return _hf_token_counter(name)
+    except Exception as e:
+        logger.warning("Could not load tokenizer '%s', falling back to approximate counts: %s", name, e)
+        return approx_token_count
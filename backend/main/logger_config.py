@@ -1,6 +1,7 @@
 import logging
 from functools import wraps
 import time
+from main.utils import metrics
 
 def setup_logging(level=logging.INFO):
     logging.basicConfig(
@@ -9,21 +10,25 @@ def setup_logging(level=logging.INFO):
     )
 
     # Suppress noisy loggers
-    noisy_loggers = ["httpx", "httpcore", "ollama", "langchain_ollama", "boto3", "botocore", "urllib3"]
+    noisy_loggers = ["httpx", "httpcore", "ollama", "langchain_ollama", "boto3", "botocore", "urllib3", "sentence_transformers"]
     for name in noisy_loggers:
         logging.getLogger(name).setLevel(logging.WARNING)
 
 
-def log_duration(name: str):
-    """Decorator to log duration of a function call."""
+def log_duration(name: str, stage: str | None = None):
+    """Decorator to log duration of a function call, and record it in the stage histogram when stage is given."""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start = time.time()
-            result = func(*args, **kwargs)
-            logger_name = getattr(func, "__module__", "__main__")
-            logger = logging.getLogger(logger_name)
-            logger.debug("%s took %.2f sec", name, time.time() - start)
-            return result
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if stage:
+                    metrics.observe_stage(stage, elapsed)
+                logger_name = getattr(func, "__module__", "__main__")
+                logger = logging.getLogger(logger_name)
+                logger.debug("%s took %.2f sec", name, elapsed)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
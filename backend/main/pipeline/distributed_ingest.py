@@ -0,0 +1,156 @@
+"""
+Index builds split across processes or hosts: the coordinator enqueues one work item per file, any number
+of workers lease items and write per-document vector shards, and the coordinator merges the shards into
+the collection's index and manifest.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from main.config import Config
+from main.extractor.pdf_extractor_factory import create_pdf_extractor
+from main.pipeline.work_queue import WorkItem, WorkQueue
+from main.retrieval.vector_store.index_builder import finalize_index, shard_file
+from main.retrieval.vector_store.index_collections import IndexCollection, default_collection
+from main.retrieval.vector_store.shards import read_shard
+from main.utils.manifest_helper import manifest_entry, save_index_manifest
+from main.utils.pdf_helper import list_pdf_files
+
+logger = logging.getLogger(__name__)
+
+
+def open_queue(path: str | None = None) -> WorkQueue:
+    return WorkQueue(path or Config.INGEST_QUEUE_PATH, max_attempts=Config.INGEST_MAX_ATTEMPTS)
+
+
+def enqueue_build(queue: WorkQueue, job: str | None = None, collection: IndexCollection | None = None,
+                  chunk_size: int | None = None, chunk_overlap: int | None = None, chunker: str | None = None) -> dict:
+    """Create a job with one item per file of the collection; settings are fixed here for all workers."""
+    collection = collection or default_collection()
+    job = job or f"{collection.name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
+    settings = {
+        "collection": collection.to_dict(),
+        "chunker": chunker or Config.CHUNKER,
+        "chunk_size": chunk_size or Config.CHUNK_SIZE,
+        "chunk_overlap": Config.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap,
+    }
+    keys = list_pdf_files(collection.prefix)
+    queue.create_job(job, settings)
+    added = queue.enqueue(job, keys)
+    logger.info("Enqueued %d files for ingest job %s", added, job)
+    return {"job": job, "files": added, **settings}
+
+
+@contextmanager
+def _keep_leased(queue: WorkQueue, item: WorkItem, owner: str, lease_seconds: float):
+    """Renew the lease in the background while the item is processed."""
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(lease_seconds / 3):
+            if not queue.renew(item, owner, lease_seconds):
+                logger.warning("Lost the lease on %s; another worker may take it over", item.s3_key)
+                return
+
+    thread = threading.Thread(target=renew, name=f"lease-{item.id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def process_item(item: WorkItem, extractor, settings: dict, cache_mode: str) -> dict:
+    """Chunk and embed one file into its shard (reused if the same contents were already sharded with these settings)."""
+    chunk_settings = {k: settings[k] for k in ("chunker", "chunk_size", "chunk_overlap")}
+    return shard_file(item.s3_key, extractor, cache_mode, chunk_settings)
+
+
+def run_worker(queue: WorkQueue, job: str, owner: str | None = None, lease_seconds: float | None = None,
+               poll_seconds: float = 2.0, max_items: int | None = None, cache_mode: str | None = None) -> dict:
+    """
+    Lease and process items of a job until none are pending or leased (or max_items were handled).
+    While other workers hold leases, polls so that items of a crashed worker are picked up when their lease expires.
+    """
+    settings = queue.job_settings(job)
+    if settings is None:
+        raise ValueError(f"Unknown ingest job: {job}")
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+    lease_seconds = lease_seconds or Config.INGEST_LEASE_SECONDS
+    cache_mode = cache_mode or Config.CACHE_MODE
+    extractor = create_pdf_extractor()
+    stats = {"owner": owner, "done": 0, "failed": 0, "reused": 0}
+
+    while max_items is None or stats["done"] + stats["failed"] < max_items:
+        item = queue.lease(job, owner, lease_seconds)
+        if item is None:
+            counts = queue.counts(job)
+            if not counts["pending"] and not counts["leased"]:
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        logger.info("Worker %s processing %s (attempt %d)", owner, item.s3_key, item.attempts)
+        with _keep_leased(queue, item, owner, lease_seconds):
+            try:
+                result = process_item(item, extractor, settings, cache_mode)
+            except Exception as e:
+                logger.exception("Ingest item %s failed", item.s3_key)
+                queue.fail(item, owner, f"{type(e).__name__}: {e}")
+                stats["failed"] += 1
+                continue
+        if queue.complete(item, owner, json.dumps(result)):
+            stats["done"] += 1
+            stats["reused"] += result["reused"]
+        else:
+            logger.warning("Lease on %s expired before completion; result discarded", item.s3_key)
+    return stats
+
+
+def merge_job(queue: WorkQueue, job: str, allow_failed: bool = False) -> dict:
+    """
+    Build the collection's index and manifest from the shards of a finished job, replacing both.
+    RuntimeError while items are outstanding, or if any failed and allow_failed is False.
+    """
+    settings = queue.job_settings(job)
+    if settings is None:
+        raise ValueError(f"Unknown ingest job: {job}")
+    counts = queue.counts(job)
+    if counts["pending"] or counts["leased"]:
+        raise RuntimeError(f"Ingest job {job} is not finished: {counts}")
+    if counts["failed"] and not allow_failed:
+        raise RuntimeError(f"Ingest job {job} has {counts['failed']} failed items; merge with allow_failed to skip them")
+
+    start = time.perf_counter()
+    collection = IndexCollection(**settings["collection"])
+    all_chunks, all_embeddings, manifest = [], [], {}
+    for item in queue.items(job):
+        if item["state"] != "done":
+            continue
+        result = json.loads(item["result"])
+        if result["shard"]:
+            chunks, embeddings = read_shard(result["shard"])
+            all_chunks.extend(chunks)
+            all_embeddings.extend(embeddings)
+        manifest[item["s3_key"]] = manifest_entry(result["hash"], result["chunks"], result["chunks"], result["size"], shard=result["shard"])
+
+    if finalize_index(all_chunks, all_embeddings, collection.index_path) is None:
+        raise RuntimeError(f"Ingest job {job} produced no chunks")
+    save_index_manifest(manifest, collection.manifest_path)
+
+    summary = {
+        "job": job,
+        "collection": collection.name,
+        "index_path": collection.index_path,
+        "documents": len(manifest),
+        "failed": counts["failed"],
+        "chunks": len(all_chunks),
+        "merge_seconds": round(time.perf_counter() - start, 2),
+    }
+    logger.info("Merged ingest job %s: %d chunks from %d files into %s", job, summary["chunks"], summary["documents"], collection.index_path)
+    return summary
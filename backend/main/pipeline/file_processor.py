@@ -1,39 +1,168 @@
+import json
 import logging
 import os
 from typing import Union
 from main.config import Config
 from main.embedder import embedder
-from main.chunker import text_chunker
+from main.chunker import layout_chunker, text_chunker
+from main.utils import metrics, profiling
 from main.utils.pdf_helper import save_debug_outputs
-from main.utils.text_preprocessor import preprocess_text
+from main.utils.text_cache import TextCache, content_hash
+from main.utils.text_preprocessor import PREPROCESS, preprocess_text
 
 logger = logging.getLogger(__name__)
 
 
-def process_file(source: Union[str, bytes], extractor, debug_name: str = None) -> tuple[list[str], list[list[float]]]:
+_preprocessed = TextCache(Config.PREPROCESS_CACHE_DIR)
+_extracted = TextCache(Config.EXTRACTION_CACHE_DIR, compress=True)
+
+
+def _source_hash(source: Union[str, bytes]) -> str | None:
+    if not (Config.PREPROCESS_CACHE or Config.EXTRACTION_CACHE):
+        return None
+    try:
+        return content_hash(source)
+    except OSError as e:
+        logger.debug("Not caching extracted text, cannot hash source: %s", e)
+        return None
+
+
+def extractor_key(extractor) -> tuple[str, str]:
+    """(provider, version) identifying an extractor's output; extractors without them fall back to the class name."""
+    return getattr(extractor, "provider", type(extractor).__name__), str(getattr(extractor, "version", "0"))
+
+
+def extract_text(source: Union[str, bytes], extractor, file_hash: str | None = None) -> str:
+    """Raw extractor output, read from / written to the extraction cache when EXTRACTION_CACHE is on."""
+    provider, version = extractor_key(extractor)
+    use_cache = bool(file_hash) and Config.EXTRACTION_CACHE
+    if use_cache:
+        cached = _extracted.get(file_hash, provider, version)
+        metrics.record_cache("extraction", hit=cached is not None)
+        if cached is not None:
+            return cached
+
+    with profiling.stage("extract"):
+        text = extractor.extract_text(source)
+    if use_cache and text.strip():
+        _extracted.put(file_hash, provider, version, text)
+    return text
+
+
+def _compact_layout(pages: list[dict]) -> list[dict]:
+    """Only the layout fields the layout chunker reads (line bbox, span text/size/flags)."""
+    return [
+        {
+            "number": page["number"],
+            "blocks": [
+                {"lines": [
+                    {"bbox": line["bbox"], "spans": [
+                        {"text": span["text"], "size": span["size"], "flags": span["flags"]} for span in line["spans"]
+                    ]}
+                    for line in block["lines"]
+                ]}
+                for block in page["blocks"]
+            ],
+        }
+        for page in pages
+    ]
+
+
+def extract_layout(source: Union[str, bytes], extractor, file_hash: str | None = None) -> list[dict]:
+    """Layout pages from extractor.extract_layout, cached like extract_text() under a "-layout" variant."""
+    provider, version = extractor_key(extractor)
+    variant = f"{provider}-layout"
+    use_cache = bool(file_hash) and Config.EXTRACTION_CACHE
+    if use_cache:
+        cached = _extracted.get(file_hash, variant, version)
+        metrics.record_cache("extraction", hit=cached is not None)
+        if cached is not None:
+            return json.loads(cached)
+
+    with profiling.stage("extract"):
+        pages = extractor.extract_layout(source)
+    if use_cache and pages:
+        _extracted.put(file_hash, variant, version, json.dumps(_compact_layout(pages), separators=(",", ":")))
+    return pages
+
+
+def extract_and_preprocess(source: Union[str, bytes], extractor, file_hash: str | None = None) -> str:
+    """
+    Extracted and preprocessed text of one document ("" if nothing was extracted). Reuses the cached
+    result for the same file contents, extractor and preprocessing rule set when PREPROCESS_CACHE is on,
+    and the cached extractor output when only the rule set changed.
+    """
+    if file_hash is None:
+        file_hash = _source_hash(source)
+    provider, version = extractor_key(extractor)
+    variant = f"{provider}-{version}"
+    if file_hash and Config.PREPROCESS_CACHE:
+        cached = _preprocessed.get(file_hash, variant, PREPROCESS.fingerprint)
+        metrics.record_cache("preprocess", hit=cached is not None)
+        if cached is not None:
+            return cached
+
+    text = extract_text(source, extractor, file_hash)
+    if not text.strip():
+        logger.warning("No text extracted from %s", source if isinstance(source, str) else "<bytes>")
+        return ""
+
+    with profiling.stage("preprocess"):
+        cleaned_text = preprocess_text(text)
+    if file_hash and Config.PREPROCESS_CACHE:
+        _preprocessed.put(file_hash, variant, PREPROCESS.fingerprint, cleaned_text)
+    return cleaned_text
+
+
+def has_cached_extraction(file_hash: str, extractor, chunker: str | None = None) -> bool:
+    """Whether process_file(None, extractor, file_hash=file_hash) can run from the extraction cache alone."""
+    provider, version = extractor_key(extractor)
+    if (chunker or Config.CHUNKER) == "layout" and hasattr(extractor, "extract_layout"):
+        provider = f"{provider}-layout"
+    return Config.EXTRACTION_CACHE and os.path.exists(_extracted.path(file_hash, provider, version))
+
+
+def process_file(
+    source: Union[str, bytes, None], extractor, debug_name: str = None, chunk_size: int | None = None,
+    chunk_overlap: int | None = None, chunker: str | None = None, file_hash: str | None = None,
+    raise_errors: bool = False,
+) -> tuple[list[str], list[list[float]]]:
     """
     Extracts text from a PDF (file path or raw bytes), preprocesses it, chunks it, and embeds the chunks.
+    Chunk settings default to CHUNKER / CHUNK_SIZE / CHUNK_OVERLAP. With file_hash given and its extraction
+    cached (see has_cached_extraction), source may be None.
+    A failure is logged and returns no chunks, like a PDF without text, unless raise_errors is set.
     Returns: (chunks, embeddings)
     """
+    chunker = chunker or Config.CHUNKER
+    chunk_size = chunk_size or Config.CHUNK_SIZE
+    chunk_overlap = Config.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
     try:
         logger.debug("Processing: %s", source if isinstance(source, str) else "<in-memory bytes>")
-        text = extractor.extract_text(source)
+        file_hash = file_hash or _source_hash(source)
+        if chunker == "layout" and hasattr(extractor, "extract_layout"):
+            pages = extract_layout(source, extractor, file_hash)
+            with profiling.stage("chunk"):
+                chunks = [chunk.text for chunk in layout_chunker.chunk_layout(pages, chunk_size, chunk_overlap)]
+        else:
+            cleaned_text = extract_and_preprocess(source, extractor, file_hash)
+            if not cleaned_text:
+                return [], []
 
-        if not text.strip():
-            logger.warning("No text extracted from %s", source if isinstance(source, str) else "<bytes>")
-            return [], []
-
-        cleaned_text = preprocess_text(text)
-        chunks = text_chunker.chunk_text(cleaned_text)
+            with profiling.stage("chunk"):
+                chunks = text_chunker.chunk_text(cleaned_text, chunk_size, chunk_overlap)
 
         if not chunks:
             logger.warning("No chunks created for %s", source if isinstance(source, str) else "<bytes>")
             return [], []
 
-        embeddings = embedder.embed_text_chunks(chunks)
+        with profiling.stage("embed"):
+            embeddings = embedder.embed_text_chunks(chunks)
 
         if not embeddings:
             logger.warning("No embeddings created for %s", source if isinstance(source, str) else "<bytes>")
+            if raise_errors:
+                raise RuntimeError(f"Embedding returned nothing for {len(chunks)} chunks")
             return [], []
 
         logger.debug("Created %d chunks and %d embeddings from %s", len(chunks), len(embeddings), source if isinstance(source, str) else "<bytes>")
@@ -46,4 +175,6 @@ def process_file(source: Union[str, bytes], extractor, debug_name: str = None) -
 
     except Exception as e:
         logger.error(f"Failed to process {source if isinstance(source, str) else '<bytes>'}: {e}")
+        if raise_errors:
+            raise
         return [], []
@@ -0,0 +1,165 @@
+"""Durable SQLite work queue with leases, shared by ingest worker processes on one host or a shared volume."""
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    s3_key TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (job, s3_key)
+);
+CREATE INDEX IF NOT EXISTS work_items_job_state ON work_items (job, state);
+CREATE TABLE IF NOT EXISTS jobs (
+    job TEXT PRIMARY KEY,
+    settings TEXT NOT NULL,
+    created_at REAL
+);
+"""
+
+
+class WorkItem:
+    def __init__(self, item_id: int, job: str, s3_key: str, attempts: int):
+        self.id = item_id
+        self.job = job
+        self.s3_key = s3_key
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"WorkItem(id={self.id}, job={self.job!r}, s3_key={self.s3_key!r}, attempts={self.attempts})"
+
+
+class WorkQueue:
+    """
+    Items move pending -> leased -> done, or back to pending on failure until max_attempts is reached
+    (then failed). A lease that is not renewed or completed before it expires is handed to another
+    worker, so a crashed worker only delays its item. complete/fail/renew only succeed for the current
+    lease owner, so a worker whose lease was taken over cannot overwrite the new owner's result.
+
+    Each call opens its own connection, so one WorkQueue can be used from several threads. Across hosts
+    the database must sit on a filesystem with working POSIX locks.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE takes the write lock up front)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def create_job(self, job: str, settings: dict):
+        """Record the settings every worker of the job must use; ValueError if the job already exists."""
+        with self._transaction() as conn:
+            try:
+                conn.execute("INSERT INTO jobs (job, settings, created_at) VALUES (?, ?, ?)", (job, json.dumps(settings), time.time()))
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Ingest job already exists: {job}")
+
+    def job_settings(self, job: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT settings FROM jobs WHERE job = ?", (job,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def enqueue(self, job: str, s3_keys: list[str]) -> int:
+        """Add items for keys not already in the job; returns how many were added."""
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO work_items (job, s3_key, updated_at) VALUES (?, ?, ?)",
+                [(job, key, now) for key in s3_keys],
+            )
+            return conn.total_changes - before
+
+    def lease(self, job: str, owner: str, lease_seconds: float) -> WorkItem | None:
+        """Claim the oldest pending item, or one whose lease expired; None if there is none right now."""
+        now = time.time()
+        with self._transaction() as conn:
+            # An expired lease on the last attempt means the item took its worker down every time
+            conn.execute(
+                "UPDATE work_items SET state = 'failed', lease_owner = NULL, error = 'lease expired on last attempt', updated_at = ? "
+                "WHERE job = ? AND state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, job, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, s3_key, attempts FROM work_items WHERE job = ? AND "
+                "(state = 'pending' OR (state = 'leased' AND lease_expires < ?)) ORDER BY id LIMIT 1",
+                (job, now),
+            ).fetchone()
+            if row is None:
+                return None
+            item_id, s3_key, attempts = row
+            conn.execute(
+                "UPDATE work_items SET state = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (owner, now + lease_seconds, now, item_id),
+            )
+            return WorkItem(item_id, job, s3_key, attempts + 1)
+
+    def _update_owned(self, item: WorkItem, owner: str, assignments: str, params: tuple) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE work_items SET {assignments}, updated_at = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (*params, time.time(), item.id, owner),
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, item: WorkItem, owner: str, lease_seconds: float) -> bool:
+        return self._update_owned(item, owner, "lease_expires = ?", (time.time() + lease_seconds,))
+
+    def complete(self, item: WorkItem, owner: str, result: str = "") -> bool:
+        """Mark done with a result string (e.g. JSON); False if the lease was lost meanwhile."""
+        return self._update_owned(item, owner, "state = 'done', lease_owner = NULL, result = ?, error = NULL", (result,))
+
+    def fail(self, item: WorkItem, owner: str, error: str) -> bool:
+        """Return the item to pending for a retry, or mark it failed after max_attempts."""
+        state = "failed" if item.attempts >= self.max_attempts else "pending"
+        return self._update_owned(item, owner, "state = ?, lease_owner = NULL, error = ?", (state, error))
+
+    def counts(self, job: str) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM work_items WHERE job = ? GROUP BY state", (job,)).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def items(self, job: str) -> list[dict]:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT s3_key, state, attempts, lease_owner, result, error FROM work_items WHERE job = ? ORDER BY id", (job,)
+            ).fetchall()
+        return [dict(row) for row in rows]
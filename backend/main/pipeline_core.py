@@ -1,33 +1,129 @@
+import hashlib
+import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from main.config import Config
+from main.logger_config import log_duration
 from main.embedder import embedder
 from main.retrieval.retrievers.retriever_factory import get_retriever
 from main.intent_detector.intent_detector_factory import create_intent_detector
-from main.llm.prompt_builder import build_prompt
-from main.retrieval.rerankers.reranker_factory import CohereReranker, BedrockCohereReranker
+from main.llm.prompt_builder import build_packed_prompt
+from main.llm.context_compressor import compress_sections
+from main.retrieval.rerankers.reranker_factory import RERANKERS
 from main.llm.factory import get_llm_client
 from main.retrieval.vector_store.index_builder import build_global_index
+from main.retrieval.vector_store.index_refresher import IndexRefresher
+from main.retrieval.vector_store import faiss_indexer
+from main.utils.normalize_tokens import normalize_text
+from main.utils import metrics, profiling, tracing
+from main.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
 class RAGPipeline:
     """Retrieval-Augmented Generation Pipeline Class"""
-    def __init__(self, force_index: bool = False, cache_mode: str = None, retriever_type="faiss"):
-        self.intent_detector = create_intent_detector()
+    def __init__(self, force_index: bool = False, cache_mode: str = None, retriever_type="faiss", lazy: bool = False,
+                 collection=None, intent_detector=None):
         self.retriever_type = retriever_type or Config.RETRIEVER_TYPE or "faiss"
-        self.embedding_model = embedder.get_model()
         self.cache_mode = cache_mode or Config.CACHE_MODE
+        self.force_index = force_index
+        # IndexCollection to serve (None = S3_PREFIX and the global index); an intent detector may be shared across pipelines
+        self.collection = collection
+        self._shared_intent_detector = intent_detector
 
         self.top_k_faiss = Config.TOP_K_FAISS
         self.top_n_rerank = Config.TOP_N_RERANK
         self.score_threshold = Config.FAISS_SCORE_THRESHOLD
-        
-        logger.info(f"Initializing RAGPipeline with retriever: {self.retriever_type.upper()}")
-        self.retriever = get_retriever(retriever_type, force=force_index)
 
-        # Build or refresh index if needed
-        self.index = build_global_index(force=force_index, cache_mode=self.cache_mode)
+        self._intent_detector = None
+        self._retriever = None
+        self.index_refresher = None
+        self._init_lock = threading.Lock()
+        self.ready = False
+
+        # lazy=True defers model and index loading to initialize()/warmup() or the first query
+        if not lazy:
+            self.initialize()
+
+
+    def initialize(self):
+        """Create the intent detector and retriever (building/loading the index) exactly once."""
+        if self._retriever is not None:
+            return
+        with self._init_lock:
+            if self._retriever is not None:
+                return
+            logger.info(f"Initializing RAGPipeline with retriever: {self.retriever_type.upper()}")
+            self._intent_detector = self._shared_intent_detector or create_intent_detector()
+            retriever = get_retriever(self.retriever_type, force=self.force_index, collection=self.collection)
+            if hasattr(retriever, "live_index"):
+                self.index_refresher = IndexRefresher(retriever.live_index, self._build_updated_index)
+            self._retriever = retriever
+
+
+    def warmup(self):
+        """Load everything and run a dummy encode + search so the first real query is hot."""
+        start = time.perf_counter()
+        self.initialize()
+        if hasattr(self._intent_detector, "warmup"):
+            self._intent_detector.warmup()
+        if self.index is not None:
+            faiss_indexer.query_faiss_index(self.index, "warmup", self.embedding_model, k=1)
+        else:
+            self.embedding_model.encode(["warmup"], convert_to_numpy=True)
+        self.ready = True
+        logger.info("RAGPipeline warm in %.2f sec", time.perf_counter() - start)
+
+
+    @property
+    def intent_detector(self):
+        self.initialize()
+        return self._intent_detector
+
+
+    @property
+    def retriever(self):
+        self.initialize()
+        return self._retriever
+
+
+    @property
+    def initialized(self) -> bool:
+        return self._retriever is not None
+
+
+    @property
+    def embedding_model(self):
+        return embedder.get_model()
+
+
+    @property
+    def index(self):
+        return getattr(self.retriever, "index", None)
+
+
+    def _build_updated_index(self, force: bool):
+        collection_kwargs = self.collection.build_kwargs() if self.collection else {}
+        return build_global_index(force=force, cache_mode=self.cache_mode, reload_if_unchanged=False, **collection_kwargs)
+
+
+    def start_index_refresh(self, force: bool = False) -> bool:
+        """Rebuild the index in the background and hot-swap it in when ready. False if one is already running."""
+        self.initialize()
+        if self.index_refresher is None:
+            raise RuntimeError(f"Index refresh is not supported for retriever type '{self.retriever_type}'.")
+        return self.index_refresher.start(force=force)
+
+
+    def index_refresh_status(self) -> dict:
+        if self._retriever is None:
+            return {"state": "not_initialized"}
+        if self.index_refresher is None:
+            return {"state": "unsupported"}
+        return dict(self.index_refresher.status, live_version=self.retriever.live_index.version)
 
 
     def refresh_index(self):
@@ -39,6 +135,7 @@ class RAGPipeline:
             return None
  
 
+    @tracing.traced("query_knowledge_base")
     def query_knowledge_base(self, query_text, reranker=None, top_k=None):
         top_k = top_k or self.top_k_faiss
         try:
@@ -49,6 +146,7 @@ class RAGPipeline:
                 reranker=reranker
             )
 
+            tracing.set_attribute("rag.sections", len(results or []))
             if not results:
                 print("No results retrieved!")
                 return []
@@ -56,45 +154,224 @@ class RAGPipeline:
             return results
         except Exception as e:
             logger.error("Error during retrieval: %s", e)
+            metrics.record_error("retriever", self.retriever_type)
             return []
 
 
-def generate_response(rag_pipeline: RAGPipeline, query_text: str, llm, history: list[tuple[str, str]], reranker=None) -> str:
-    """Query global index and generate a response using LLM."""
+    def query_knowledge_base_batch(self, query_texts: list[str], top_k=None):
+        """
+        Embed and search all queries with one encode and one FAISS search call.
+        Returns raw candidates per query, or None if the retriever has no batch path.
+        """
+        if not hasattr(self.retriever, "retrieve_batch"):
+            return None
+        top_k = top_k or self.top_k_faiss
+        try:
+            return self.retriever.retrieve_batch(query_texts, top_k=top_k, embedding_model=self.embedding_model)
+        except Exception as e:
+            logger.error("Error during batch retrieval: %s", e)
+            metrics.record_error("retriever", self.retriever_type)
+            return None
+
+
+DEFAULT_RESPONSE = "The retrieved documents do not provide enough information."
+NO_DOCS_RESPONSE = "Sorry, I couldn't find relevant information in the documents."
+
+QUICK_RESPONSES = {
+    "greeting": "Hello! I'm your Armstrong assistant. Ask me a technical question and I’ll look it up for you.",
+    "thanks": "You're welcome! Let me know if you have more questions.",
+    "goodbye": "Goodbye! Feel free to come back with more questions anytime.",
+    "help": "I can help answer questions about your HVAC questions and Armstrong products. Ask me something specific!",
+    "vague": "Could you please rephrase your question or ask something more specific?",
+    "empty": None
+}
+
+# Shared pool for retrieval launched speculatively alongside intent detection
+_speculative_executor = ThreadPoolExecutor(max_workers=Config.SPECULATIVE_WORKERS, thread_name_prefix="rag-speculative")
+
+# Identical concurrent requests share one in-flight computation
+_inflight = SingleFlight()
 
-    response = "The retrieved documents do not provide enough information."
+# Config keys that change the answer for a given query
+_RESPONSE_CONFIG_KEYS = (
+    "llm_provider", "ollama_model", "bedrock_model_id", "rerank_provider", "retriever_type",
+    "top_k_faiss", "top_n_rerank", "faiss_score_threshold", "merge_window_size", "proximity_merge",
+)
+
+
+def _timed(stage: str, timings: dict, t0: float, func, *args, **kwargs):
+    """Run func and record its (start, end) offsets relative to t0 under timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[stage] = (start - t0, time.perf_counter() - t0)
+
+
+def _log_stage_timings(query_text: str, timings: dict):
+    stages = " | ".join(f"{stage} {start:.2f}-{end:.2f}s" for stage, (start, end) in timings.items())
+    logger.debug("Stage timings for '%s': %s", query_text, stages)
+
+
+@tracing.traced("intent_detection")
+@log_duration("Intent Detection", stage="intent")
+def _detect_intent(rag_pipeline: RAGPipeline, query_text: str) -> str:
     intent = rag_pipeline.intent_detector.detect(query_text)
+    tracing.set_attribute("rag.intent", intent)
+    return intent
+
+
+@tracing.traced("llm.generate")
+@log_duration("LLM Generation", stage="llm")
+def _generate_answer(llm, prompt: str) -> str:
+    tracing.set_attribute("llm.client", type(llm).__name__)
+    tracing.set_attribute("llm.prompt_chars", len(prompt))
+    try:
+        return llm.generate_answer(prompt)
+    except Exception:
+        metrics.record_error("llm", type(llm).__name__)
+        raise
 
-    quick_responses = {
-        "greeting": "Hello! I'm your Armstrong assistant. Ask me a technical question and I’ll look it up for you.",
-        "thanks": "You're welcome! Let me know if you have more questions.",
-        "goodbye": "Goodbye! Feel free to come back with more questions anytime.",
-        "help": "I can help answer questions about your HVAC questions and Armstrong products. Ask me something specific!",
-        "vague": "Could you please rephrase your question or ask something more specific?",
-        "empty": None
-    }
-    
-    if intent in quick_responses:
-        return quick_responses[intent] or response
 
-    final_docs = rag_pipeline.query_knowledge_base(query_text, reranker)
+def _answer_from_docs(query_text: str, final_docs: list[str], llm, history, timings: dict, t0: float) -> str:
     if not final_docs:
-        return "Sorry, I couldn't find relevant information in the documents."
-    
+        return NO_DOCS_RESPONSE
+
     logger.debug("Retrieved %d chunks for query: '%s'", len(final_docs), query_text)
-    context = "\n\n".join(final_docs)
-    prompt = build_prompt(context, query_text, history)
-    return llm.generate_answer(prompt)
+    if Config.CONTEXT_COMPRESSION:
+        final_docs = _timed("compress", timings, t0, compress_sections, query_text, final_docs)
+    prompt, report = _timed("prompt", timings, t0, build_packed_prompt, final_docs, query_text, history)
+    logger.info(
+        "Prompt tokens: %d/%d used (context %d, history %d), %d dropped (%d sections, %d history turns)",
+        report["used_tokens"], report["budget"], report["context_tokens"], report["history_tokens"],
+        report["dropped_tokens"], report["dropped_sections"], report["dropped_history_turns"]
+    )
+    return _timed("llm", timings, t0, _generate_answer, llm, prompt)
+
+
+def _request_fingerprint(rag_pipeline: RAGPipeline, query_text: str, llm, history, reranker) -> str:
+    """Key for coalescing: normalized query, history, response-affecting config and clients."""
+    cfg = Config.get_all()
+    payload = {
+        "pipeline": id(rag_pipeline),
+        "query": normalize_text(query_text).lower(),
+        "history": [list(turn) for turn in history],
+        "config": {k: cfg.get(k) for k in _RESPONSE_CONFIG_KEYS},
+        "llm": [type(llm).__name__, getattr(llm, "model_id", None) or getattr(llm, "model", None)],
+        "reranker": getattr(reranker, "provider", None),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@tracing.traced("generate_response")
+@log_duration("Generate Response", stage="generate_response")
+def generate_response(rag_pipeline: RAGPipeline, query_text: str, llm, history: list[tuple[str, str]], reranker=None) -> str:
+    """Query global index and generate a response using LLM.
+
+    Concurrent calls with the same normalized query, history and config are coalesced
+    into a single computation whose result is shared by all callers.
+    """
+    if not Config.COALESCE_QUERIES:
+        return _generate_response(rag_pipeline, query_text, llm, history, reranker)
+
+    key = _request_fingerprint(rag_pipeline, query_text, llm, history, reranker)
+    response, shared = _inflight.do(key, _generate_response, rag_pipeline, query_text, llm, history, reranker)
+    metrics.record_cache("query_coalesce", hit=shared)
+    tracing.set_attribute("rag.coalesced", shared)
+    if shared:
+        logger.debug("Coalesced query '%s' onto an in-flight request.", query_text)
+    return response
+
+
+def _generate_response(rag_pipeline: RAGPipeline, query_text: str, llm, history: list[tuple[str, str]], reranker=None) -> str:
+    """
+    Retrieval (plus reranking) is started speculatively while the intent is detected,
+    so real questions pay max(intent, retrieval) instead of their sum. The retrieval
+    result is discarded when the intent resolves to a quick response.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+
+    retrieval = None
+    if Config.SPECULATIVE_RETRIEVAL:
+        retrieval = _speculative_executor.submit(
+            tracing.in_current_context(profiling.in_request_profile(_timed)), "retrieval", timings, t0, rag_pipeline.query_knowledge_base, query_text, reranker
+        )
+
+    intent = _timed("intent", timings, t0, _detect_intent, rag_pipeline, query_text)
+
+    if intent in QUICK_RESPONSES:
+        if retrieval is not None and not retrieval.cancel():
+            logger.debug("Discarding speculative retrieval for '%s' intent.", intent)
+        _log_stage_timings(query_text, timings)
+        return QUICK_RESPONSES[intent] or DEFAULT_RESPONSE
+
+    if retrieval is not None:
+        final_docs = retrieval.result()
+    else:
+        final_docs = _timed("retrieval", timings, t0, rag_pipeline.query_knowledge_base, query_text, reranker)
+
+    answer = _answer_from_docs(query_text, final_docs, llm, history, timings, t0)
+    _log_stage_timings(query_text, timings)
+    return answer
+
+
+def generate_batch_responses(rag_pipeline: RAGPipeline, query_texts: list[str], llm, reranker=None, max_concurrency: int = None):
+    """
+    Answer many independent queries (no history).
+    All queries are embedded and searched up front in one call; intent detection,
+    rerank and generation then run with bounded concurrency (max_concurrency, capped at BATCH_MAX_CONCURRENCY).
+    Yields (position, response) in completion order.
+    """
+    max_concurrency = min(max_concurrency or Config.BATCH_MAX_CONCURRENCY, Config.BATCH_MAX_CONCURRENCY)
+    start = time.perf_counter()
+    candidates = rag_pipeline.query_knowledge_base_batch(query_texts)
+
+    def answer(position: int) -> str:
+        query_text = query_texts[position]
+        timings = {}
+        t0 = time.perf_counter()
+        try:
+            intent = _timed("intent", timings, t0, _detect_intent, rag_pipeline, query_text)
+            if intent in QUICK_RESPONSES:
+                return QUICK_RESPONSES[intent] or DEFAULT_RESPONSE
+
+            if candidates is None:
+                final_docs = _timed("retrieval", timings, t0, rag_pipeline.query_knowledge_base, query_text, reranker)
+            else:
+                final_docs = _timed("rerank", timings, t0, rag_pipeline.retriever.select, query_text, candidates[position], reranker)
+            return _answer_from_docs(query_text, final_docs, llm, [], timings, t0)
+        except Exception as e:
+            logger.exception("Batch query %d failed", position)
+            return f"Error: could not answer query: {e}"
+        finally:
+            _log_stage_timings(query_text, timings)
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="rag-batch")
+    try:
+        futures = {executor.submit(tracing.in_current_context(profiling.in_request_profile(answer)), position): position for position in range(len(query_texts))}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Answered %d queries in %.2f sec (%.2f queries/sec)",
+        len(query_texts), elapsed, len(query_texts) / elapsed if elapsed else 0.0
+    )
 
 
+@tracing.traced("get_reranker")
 def get_reranker(provider: str | None = None):
     if provider == "cohere-direct":
-        return CohereReranker(api_key=Config.COHERE_API_KEY)
+        return RERANKERS.create("cohere", api_key=Config.COHERE_API_KEY)
     elif provider == "cohere-bedrock":
-        return BedrockCohereReranker(model_id=Config.COHERE_BEDROCK_RERANK_MODEL_ID, region=Config.BEDROCK_REGION)
+        return RERANKERS.create("bedrock-cohere", model_id=Config.COHERE_BEDROCK_RERANK_MODEL_ID, region=Config.BEDROCK_REGION)
     return None
 
 
+@tracing.traced("get_llm")
 def get_llm(provider: str | None = None):
     client = get_llm_client(provider=provider)
     if not client.is_running():
@@ -9,20 +9,23 @@ def merge_adjacent_chunks(top_results, all_chunks, window_size=Config.MERGE_WIND
     """
     Merge adjacent chunks around selected FAISS results to preserve section completeness.
     Expands merge window to capture full tables/lists.
+    Sections are returned most relevant first (by the best-ranked result they contain).
     """
     merged = []
     used = set()
 
-    # Sort to ensure merging in text order
-    ranked_indices = []
-    for chunk_text, _ in top_results:
+    # Rank of each hit in top_results (already sorted by score)
+    rank_of = {}
+    for rank, (chunk_text, _) in enumerate(top_results):
         try:
             idx = all_chunks.index(chunk_text)
-            ranked_indices.append(idx)
+            rank_of.setdefault(idx, rank)
         except ValueError:
             continue
 
-    ranked_indices = sorted(set(ranked_indices))
+    # Sort to ensure merging in text order
+    ranked_indices = sorted(rank_of)
+    section_ranks = []
     last_end = -1
 
     for idx in ranked_indices:
@@ -50,6 +53,7 @@ def merge_adjacent_chunks(top_results, all_chunks, window_size=Config.MERGE_WIND
         )
 
         merged.append(merged_text)
+        section_ranks.append(min(rank_of[i] for i in range(start, end) if i in rank_of))
         used.update(range(start, end))
 
-    return merged
+    return [text for _, text in sorted(zip(section_ranks, merged), key=lambda pair: pair[0])]
@@ -1,10 +1,13 @@
 # reranker_factory.py
 import os
-from .cohere_reranker import CohereReranker
-from .bedrock_cohere_reranker import BedrockCohereReranker
+from main.utils.plugin_registry import PluginRegistry
 from .reranker_base import RerankerBase
 from main.config import Config
 
+RERANKERS = PluginRegistry("reranker", error_message="Unsupported reranker provider: {name}")
+RERANKERS.register("cohere", "main.retrieval.rerankers.cohere_reranker:CohereReranker")
+RERANKERS.register("bedrock-cohere", "main.retrieval.rerankers.bedrock_cohere_reranker:BedrockCohereReranker")
+
 
 def create_reranker(config: dict) -> RerankerBase | None:
     """Factory to create reranker instance from config dict."""
@@ -14,13 +17,15 @@ def create_reranker(config: dict) -> RerankerBase | None:
     provider = config["provider"]
 
     if provider == "cohere":
-        return CohereReranker(
+        return RERANKERS.create(
+            "cohere",
             api_key=config.get("api_key") or os.getenv("COHERE_API_KEY"),
             model=config.get("model", "rerank-english-v3.0"),
         )
 
     elif provider == "bedrock-cohere":
-        return BedrockCohereReranker(
+        return RERANKERS.create(
+            "bedrock-cohere",
             model_id=config.get("model_id",  Config.COHERE_BEDROCK_RERANK_MODEL_ID),
             region=config.get("region", "us-east-1"),
         )
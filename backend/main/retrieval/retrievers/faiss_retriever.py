@@ -1,17 +1,49 @@
 import logging
+import os
+from main.retrieval.vector_store import faiss_indexer
 from main.retrieval.vector_store import index_builder as index_builder
 from main.retrieval.vector_store import vector_store_manager as index_manager
+from main.retrieval.vector_store.live_index import LiveIndex
 from main.retrieval.retrievers.retriever_base import RetrieverBase
 from main.config import Config
+from main.utils import metrics
 
 
 logger = logging.getLogger(__name__)
 
 class FAISSRetriever(RetrieverBase):
-    def __init__(self, force=False):
-        self.index = index_builder.build_global_index(force=force)
+    def __init__(self, force=False, index=None, collection=None):
+        # A prebuilt FaissStore (benchmarks, evaluation) skips building the global index;
+        # an IndexCollection loads that collection's saved index (rebuilds are left to /refresh-index
+        # and ingest, as collections are reloaded on the request path), building it only if missing
+        if index is None and collection is not None and not force and os.path.exists(collection.index_path):
+            index = faiss_indexer.load_faiss_index(collection.index_path, search_params=Config.FAISS_SEARCH_PARAMS)
+        if index is None:
+            index = index_builder.build_global_index(force=force, **(collection.build_kwargs() if collection else {}))
+        self.live_index = LiveIndex(index)
+        metrics.set_index_gauges(self.live_index.current, self.live_index.version)
+
+    @property
+    def index(self):
+        return self.live_index.current
+
+    def swap_index(self, store) -> int:
+        """Publish a new FaissStore to subsequent queries; in-flight queries finish on the old one."""
+        version = self.live_index.swap(store)
+        metrics.set_index_gauges(store, version)
+        return version
 
     def retrieve(self, query_text: str, top_k: int = Config.TOP_K_FAISS, embedding_model=None, reranker=None):
-        return index_manager.retrieve_relevant_docs(
-            self.index, query_text, embedding_model, reranker, top_k=top_k
-        )
+        with self.live_index.acquire() as index:
+            return index_manager.retrieve_relevant_docs(
+                index, query_text, embedding_model, reranker, top_k=top_k
+            )
+
+    def retrieve_batch(self, query_texts: list[str], top_k: int = Config.TOP_K_FAISS, embedding_model=None):
+        """Return raw FAISS candidates for every query using one encode and one search call."""
+        with self.live_index.acquire() as index:
+            return index_manager.search_candidates_batch(index, query_texts, embedding_model, top_k=top_k)
+
+    def select(self, query_text: str, candidates, reranker=None):
+        """Rerank and merge the candidates returned by retrieve_batch for a single query."""
+        return index_manager.select_relevant_docs(query_text, candidates, reranker)
@@ -1,11 +1,11 @@
-from main.retrieval.retrievers.faiss_retriever import FAISSRetriever
-from main.retrieval.retrievers.bedrock_retriever import BedrockRetriever
+from main.utils.plugin_registry import PluginRegistry
 
-def get_retriever(retriever_type="faiss", force=False):
+RETRIEVERS = PluginRegistry("retriever", error_message="Unknown retriever type: {name}")
+RETRIEVERS.register("faiss", "main.retrieval.retrievers.faiss_retriever:FAISSRetriever")
+RETRIEVERS.register("bedrock", "main.retrieval.retrievers.bedrock_retriever:BedrockRetriever")
+
+def get_retriever(retriever_type="faiss", force=False, collection=None):
     retriever_type = retriever_type.lower()
     if retriever_type == "faiss":
-        return FAISSRetriever(force=force)
-    elif retriever_type == "bedrock":
-        return BedrockRetriever()
-    else:
-        raise ValueError(f"Unknown retriever type: {retriever_type}")
+        return RETRIEVERS.create("faiss", force=force, collection=collection)
+    return RETRIEVERS.create(retriever_type)
@@ -0,0 +1,78 @@
+"""Append-only journal of an index build, so a killed build resumes from its last completed document."""
+import json
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def journal_path(index_path: str) -> str:
+    return os.path.splitext(index_path)[0] + ".journal.jsonl"
+
+
+class BuildJournal:
+    """
+    One JSON line per completed document ({"key", "hash", "shard", "chunks", "size"}), fsynced as it is
+    written, after a start line holding the build settings. Opening a journal left behind by a build with
+    the same settings resumes it: completed holds its documents. A journal with other settings is
+    discarded. finish() deletes the journal once the index is saved.
+    """
+
+    def __init__(self, index_path: str, settings: dict):
+        self.path = journal_path(index_path)
+        self.settings = settings
+        self.completed: dict[str, dict] = {}
+        previous = self._read()
+        if previous is not None and previous[0] == settings:
+            completed = previous[1]
+            logger.info("Resuming interrupted index build: %d documents already done", len(completed))
+        else:
+            completed = {}
+            if previous is not None:
+                logger.info("Discarding the journal of an interrupted build with other settings")
+
+        # Rewritten rather than appended to, so a torn last line of a killed build is dropped
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._append({"event": "start", "settings": settings, "started_at": datetime.utcnow().isoformat()})
+        for key, result in completed.items():
+            self.record(key, result)
+
+    def _read(self) -> tuple[dict, dict[str, dict]] | None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+
+        settings, completed = None, {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # torn last line of a killed build
+            if entry.get("event") == "start":
+                settings = entry["settings"]
+            elif entry.get("event") == "done":
+                completed[entry["key"]] = {k: v for k, v in entry.items() if k not in ("event", "key")}
+        return (settings, completed) if settings is not None else None
+
+    def _append(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, key: str, result: dict):
+        self.completed[key] = result
+        self._append({"event": "done", "key": key, **result})
+
+    def close(self):
+        self._file.close()
+
+    def finish(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning("Failed to remove build journal %s: %s", self.path, e)
@@ -1,38 +1,69 @@
 import os
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING
+from main.logger_config import log_duration
+from main.utils import tracing
+from main.retrieval.vector_store.projection import Projection, save_projection, load_projection
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 class FaissStore:
-    def __init__(self, dim: int):
+    def __init__(self, dim: int, projection: Projection | None = None, index_factory: str = "Flat"):
         self.dim = dim
-        # Using IndexFlatIP for cosine similarity (normalized vectors)
-        self.index = faiss.IndexFlatIP(dim)
+        # Inner product on normalized vectors = cosine similarity. "Flat" is exact search;
+        # other faiss index_factory specs (e.g. "HNSW32", "IVF256,Flat") trade recall for speed.
+        if index_factory == "Flat":
+            self.index = faiss.IndexFlatIP(dim)
+        else:
+            self.index = faiss.index_factory(dim, index_factory, faiss.METRIC_INNER_PRODUCT)
         self.metadata = []
+        # Applied to both stored and query vectors, so callers always pass model-dim embeddings
+        self.projection = projection
 
     def add(self, embeddings: np.ndarray, documents: list[str]):
+        if self.projection is not None:
+            embeddings = self.projection.apply(embeddings)
         if embeddings.shape[1] != self.dim:
             raise ValueError(f"Expected dim {self.dim}, got {embeddings.shape[1]}")
 
         faiss.normalize_L2(embeddings)
+        if not self.index.is_trained:
+            self.index.train(embeddings)
         self.index.add(embeddings)
         self.metadata.extend(documents)
 
+    def set_search_params(self, params: str):
+        """Apply faiss search-time parameters, e.g. "nprobe=16" or "efSearch=64"."""
+        if params:
+            faiss.ParameterSpace().set_index_parameters(self.index, params)
+
     def search(self, query_embedding: np.ndarray, k: int = 5):
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1)
+        return [hit for row in self.search_batch(query_embedding, k) for hit in row]
 
-        faiss.normalize_L2(query_embedding)
+    @tracing.traced("faiss_search")
+    @log_duration("FAISS Search", stage="faiss_search")
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5) -> list[list[tuple[str, float]]]:
+        """Search all rows in one FAISS call; returns one result list per query row."""
+        if query_embeddings.ndim == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
+        if self.projection is not None:
+            query_embeddings = self.projection.apply(query_embeddings)
 
-        distances, indices = self.index.search(query_embedding, k)
+        faiss.normalize_L2(query_embeddings)
+
+        distances, indices = self.index.search(query_embeddings, k)
         results = []
 
         for dist_list, idx_list in zip(distances, indices):
+            row = []
             for dist, idx in zip(dist_list, idx_list):
                 if idx == -1:
                     continue
-                results.append((self.metadata[idx], float(dist)))
+                row.append((self.metadata[idx], float(dist)))
+            results.append(row)
 
         return results
 
@@ -48,32 +79,49 @@ class FaissStore:
         self.metadata = np.load(metadata_path, allow_pickle=True).tolist()
 
 
-def build_faiss_index(embeddings: list[list[float]], documents: list[str]) -> FaissStore:
+def build_faiss_index(embeddings: list[list[float]], documents: list[str], projection: Projection | None = None,
+                      index_factory: str = "Flat", search_params: str = "") -> FaissStore:
     array = np.array(embeddings).astype("float32")
-    dim = array.shape[1]
-    store = FaissStore(dim)
+    dim = projection.dim if projection is not None else array.shape[1]
+    store = FaissStore(dim, projection, index_factory)
     store.add(array, documents)
+    store.set_search_params(search_params)
     return store
 
 
 def save_faiss_index(store: FaissStore, index_path: str):
     base_path = os.path.splitext(index_path)[0]
     store.save(base_path + ".index", base_path + ".metadata.npy")
+    save_projection(store.projection, base_path)
 
 
-def load_faiss_index(index_path: str) -> FaissStore:
+def load_faiss_index(index_path: str, search_params: str = "") -> FaissStore:
     base_path = os.path.splitext(index_path)[0]
     index = faiss.read_index(base_path + ".index")
     dim = index.d  # dim comes from embedding model. For all-MiniLM-L6-v2, it's 384.
-    store = FaissStore(dim)
+    store = FaissStore(dim, load_projection(base_path))
     store.index = index
     store.metadata = np.load(base_path + ".metadata.npy", allow_pickle=True).tolist()
+    store.set_search_params(search_params)
     return store
 
-def query_faiss_index(store: FaissStore, query_text: str, model: SentenceTransformer, k: int = 5) -> list[tuple[str, float]]:
+@tracing.traced("query_embedding")
+@log_duration("Query Embedding", stage="query_embedding")
+def embed_queries(query_texts: list[str], model: "SentenceTransformer") -> np.ndarray:
     from main.utils.normalize_tokens import normalize_text  # local import to avoid circular dependency
     show_progress = os.getenv("DEBUG", "false").lower() == "true"
-    normalized_query = normalize_text(query_text)
-    query_embedding = model.encode([normalized_query], convert_to_numpy=True, show_progress_bar=show_progress)
+    normalized_queries = [normalize_text(q) for q in query_texts]
+    return model.encode(normalized_queries, convert_to_numpy=True, show_progress_bar=show_progress).astype("float32")
+
+
+def query_faiss_index(store: FaissStore, query_text: str, model: "SentenceTransformer", k: int = 5) -> list[tuple[str, float]]:
+    query_embedding = embed_queries([query_text], model)
     results = store.search(query_embedding, k)
     return results  # returns list of (chunk_text, score)
+
+
+def query_faiss_index_batch(store: FaissStore, query_texts: list[str], model: "SentenceTransformer", k: int = 5) -> list[list[tuple[str, float]]]:
+    """Embed all queries in a single encode call and search them in a single multi-row FAISS search."""
+    if not query_texts:
+        return []
+    return store.search_batch(embed_queries(query_texts, model), k)
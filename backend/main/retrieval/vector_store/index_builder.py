@@ -1,14 +1,20 @@
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from main.config import Config
 from main.retrieval.vector_store import faiss_indexer
+from main.retrieval.vector_store.build_journal import BuildJournal
+from main.retrieval.vector_store.shards import read_shard, shard_key, shard_path, write_shard
+from main.retrieval.vector_store.projection import Projection, fit_projection, measure_recall
 from main.utils.pdf_helper import list_pdf_files
 from main.extractor.pdf_extractor_factory import create_pdf_extractor
 from main.logger_config import log_duration
 from main.pipeline.file_processor import process_file
 from main.utils.s3_helper import download_pdf, hash_file, download_pdf_stream
-from main.utils.manifest_helper import load_index_manifest, update_manifest_entry, prune_manifest
+from main.utils import metrics, profiling
+from main.utils.text_cache import content_hash
+from main.utils.manifest_helper import update_manifest_entry, prune_manifest
 
 
 logger = logging.getLogger(__name__)
@@ -38,8 +44,27 @@ def cleanup_stale_cache(pruned_keys: list[str]):
             logger.warning(f"Failed to delete stale cache file {cached_path}: {e}")
 
 
-def get_keys_to_index(all_keys, manifest, force, cache_mode):
+def default_chunk_settings() -> dict:
+    return {"chunker": Config.CHUNKER, "chunk_size": Config.CHUNK_SIZE, "chunk_overlap": Config.CHUNK_OVERLAP}
+
+
+def expected_shard(file_hash: str, extractor, chunk_settings: dict | None = None) -> str:
+    """Shard path of a file's contents under the current extraction, chunking and embedding settings."""
+    return shard_path(Config.SHARD_DIR, shard_key(file_hash, extractor, **(chunk_settings or default_chunk_settings())))
+
+
+def _has_current_shard(entry: dict | None, shard: str) -> bool:
+    """A manifest or journal entry whose vectors are on disk and were built from these contents and settings."""
+    return entry is not None and entry.get("shard") == shard and os.path.exists(shard)
+
+
+def get_keys_to_index(all_keys, manifest, force, cache_mode, extractor, chunk_settings: dict | None = None):
+    """
+    Keys whose file is new, changed, forced, or has no shard under the current settings, and
+    s3_key -> current content hash of every file hashed on the way (none in streaming mode).
+    """
     keys_to_index = []
+    hashes = {}
     for s3_key in all_keys:
         if cache_mode == "none":
             # Always reindex in streaming mode
@@ -49,89 +74,200 @@ def get_keys_to_index(all_keys, manifest, force, cache_mode):
         local_path = download_pdf(s3_key, cache_mode=cache_mode)
         actual_path = local_path.replace("::ephemeral", "")
         current_hash = hash_file(actual_path)
+        hashes[s3_key] = current_hash
         manifest_entry = manifest.get(s3_key)
 
-        if force or manifest_entry is None or manifest_entry.get("hash") != current_hash:
+        if (force or manifest_entry is None or manifest_entry.get("hash") != current_hash
+                or not _has_current_shard(manifest_entry, expected_shard(current_hash, extractor, chunk_settings))):
             keys_to_index.append(s3_key)
+            metrics.record_cache("ingest_manifest", hit=False)
         else:
             logger.debug(f"Skipping unchanged file: {s3_key}")
+            metrics.record_cache("ingest_manifest", hit=True)
+            cleanup_if_ephemeral(local_path)
+    return keys_to_index, hashes
+
+
+def shard_file(s3_key: str, extractor, cache_mode: str, chunk_settings: dict | None = None, reuse: bool = True) -> dict:
+    """
+    Chunk and embed one file into its shard under SHARD_DIR (empty for a file without text), or with reuse,
+    take the existing shard of the same contents and settings. Returns {"shard", "hash", "size", "chunks", "reused"}.
+    Extraction or embedding failures raise, so they are not recorded as empty files.
+    """
+    chunk_settings = chunk_settings or default_chunk_settings()
+    local_path = None
+    if cache_mode == "none":
+        source = download_pdf_stream(s3_key)
+        file_hash, size = content_hash(source), len(source)
+        debug_name = None
+    else:
+        local_path = download_pdf(s3_key, cache_mode=cache_mode)
+        source = local_path.replace("::ephemeral", "")
+        # Hash and size the file where download_pdf put it (SAMPLE_DIR locally), before an ephemeral copy is removed
+        file_hash, size = hash_file(source), os.path.getsize(source)
+        debug_name = os.path.basename(source).replace(" ", "_").replace("\\", "_").replace("/", "_")
+
+    try:
+        path = expected_shard(file_hash, extractor, chunk_settings)
+        if reuse and os.path.exists(path):
+            chunks, _ = read_shard(path)
+            return {"shard": path, "hash": file_hash, "size": size, "chunks": len(chunks), "reused": True}
+
+        chunks, embeddings = process_file(source, extractor, debug_name=debug_name, file_hash=file_hash, raise_errors=True, **chunk_settings)
+        write_shard(path, chunks, embeddings)
+        return {"shard": path, "hash": file_hash, "size": size, "chunks": len(chunks), "reused": False}
+    finally:
+        if local_path:
             cleanup_if_ephemeral(local_path)
-    return keys_to_index
 
 
-def index_files(keys_to_index, extractor, cache_mode):
-    all_chunks = []
-    all_embeddings = []
+def index_files(keys_to_index, extractor, cache_mode, manifest_path: str | None = None, journal: BuildJournal | None = None,
+                chunk_settings: dict | None = None, reuse: bool = True, hashes: dict[str, str] | None = None) -> dict[str, dict]:
+    """
+    Shard each file (see shard_file) and record it in the manifest and the journal as soon as it finishes.
+    A file the journal already holds as completed is not processed again if its current hash (from hashes)
+    gives the same shard; without a known hash (streaming) it is downloaded and reuses that shard if so.
+    A file that fails is logged and left out (and unrecorded, so the next build retries it).
+    Returns s3_key -> shard_file() result.
+    """
+    hashes = hashes or {}
+    results = {}
+    resumable = set()
+    if journal is not None:
+        for k in keys_to_index:
+            done = journal.completed.get(k)
+            if done is None:
+                continue
+            if k not in hashes:
+                resumable.add(k)
+            elif _has_current_shard(done, expected_shard(hashes[k], extractor, chunk_settings)):
+                results[k] = done
+        if results or resumable:
+            logger.info(f"Resuming build: {len(results) + len(resumable)} of {len(keys_to_index)} files already done.")
+    pending = [k for k in keys_to_index if k not in results]
 
     max_workers = getattr(Config, "MAX_WORKERS", os.cpu_count()) or 4
-    logger.info(f"Indexing {len(keys_to_index)} files with {max_workers} workers.")
-
-    def task(s3_key):
-        if cache_mode == "none":
-            pdf_bytes = download_pdf_stream(s3_key)
-            return process_file(pdf_bytes, extractor)
-        else:
-            local_path = download_pdf(s3_key, cache_mode=cache_mode)
-            actual_path = local_path.replace("::ephemeral", "")
-            safe_name = os.path.basename(actual_path).replace(" ", "_").replace("\\", "_").replace("/", "_")
-            result = process_file(actual_path, extractor, debug_name=safe_name)
-            cleanup_if_ephemeral(local_path)
-            return result
+    logger.info(f"Indexing {len(pending)} files with {max_workers} workers.")
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(task, s3_key) for s3_key in keys_to_index]
-        for s3_key, future in zip(keys_to_index, futures):
-            chunks, embeddings = future.result()
-            all_chunks.extend(chunks)
-            all_embeddings.extend(embeddings)
-
-            if cache_mode != "none":
-                local_path = os.path.join(Config.CACHE_DIR, s3_key)
-                actual_path = local_path.replace("::ephemeral", "")
-                update_manifest_entry(
-                    s3_key=s3_key,
-                    hash_value=hash_file(actual_path),
-                    chunk_count=len(chunks),
-                    embedding_count=len(embeddings),
-                    size=os.path.getsize(actual_path),
-                    source="s3"
-                )
+        futures = {
+            executor.submit(shard_file, s3_key, extractor, cache_mode, chunk_settings, reuse or s3_key in resumable): s3_key
+            for s3_key in pending
+        }
+        for future in as_completed(futures):
+            s3_key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Failed to index {s3_key}, leaving it out: {e}")
+                continue
+            results[s3_key] = result
+            update_manifest_entry(
+                s3_key=s3_key,
+                hash_value=result["hash"],
+                chunk_count=result["chunks"],
+                embedding_count=result["chunks"],
+                size=result["size"],
+                source="s3",
+                path=manifest_path,
+                shard=result["shard"]
+            )
+            if journal is not None:
+                journal.record(s3_key, result)
+
+    return results
 
+
+def load_shards(keys, entries: dict[str, dict]):
+    """Chunks and embeddings of keys, in order, from the shards named by their manifest or shard_file() entries (keys without one are skipped)."""
+    all_chunks = []
+    all_embeddings = []
+    with profiling.stage("shard_load"):
+        for key in keys:
+            shard = entries.get(key, {}).get("shard")
+            if shard:
+                chunks, embeddings = read_shard(shard)
+                all_chunks.extend(chunks)
+                all_embeddings.extend(embeddings)
     return all_chunks, all_embeddings
 
 
+def fit_index_projection(all_embeddings) -> Projection | None:
+    """Fit the configured projection and keep it only if recall against the full vectors holds up."""
+    method = Config.EMBEDDING_PROJECTION
+    if method == "none":
+        return None
+
+    vectors = np.array(all_embeddings, dtype="float32")
+    if method == "pca" and len(vectors) <= Config.PROJECTION_DIM:
+        logger.warning("Only %d chunks; too few to fit a %d-dim PCA. Using full vectors.", len(vectors), Config.PROJECTION_DIM)
+        return None
+
+    projection = fit_projection(vectors, Config.PROJECTION_DIM, method)
+    recall = measure_recall(vectors, projection, k=10)
+    projection.info["recall_at_10"] = round(recall, 4)
+    logger.info(
+        "Projection %s %d -> %d dims: recall@10 %.3f, vectors %.1f MB -> %.1f MB",
+        method, projection.source_dim, projection.dim, recall,
+        vectors.nbytes / 1e6, len(vectors) * projection.dim * 4 / 1e6
+    )
+
+    if recall < Config.PROJECTION_MIN_RECALL:
+        logger.warning("Projection recall %.3f below %.3f. Using full vectors.", recall, Config.PROJECTION_MIN_RECALL)
+        return None
+    return projection
+
+
 def finalize_index(all_chunks, all_embeddings, index_path):
     if not all_chunks or not all_embeddings:
         logger.warning("No data to build FAISS index.")
         return None
 
     logger.info("Indexed %d chunks, %d embeddings", len(all_chunks), len(all_embeddings))
-    index = faiss_indexer.build_faiss_index(all_embeddings, all_chunks)
-    faiss_indexer.save_faiss_index(index, index_path)
+    with profiling.stage("projection"):
+        projection = fit_index_projection(all_embeddings)
+    with profiling.stage("index_add"):
+        index = faiss_indexer.build_faiss_index(
+            all_embeddings, all_chunks, projection,
+            index_factory=Config.FAISS_INDEX_FACTORY, search_params=Config.FAISS_SEARCH_PARAMS
+        )
+    with profiling.stage("index_save"):
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        faiss_indexer.save_faiss_index(index, index_path)
     logger.debug("Global FAISS index saved to: %s", index_path)
     return index
 
 
-@log_duration("Build Global FAISS Index")
-def build_global_index(force: bool = False, cache_mode: str = None, index_path: str = FAISS_INDEX_PATH):
+@log_duration("Build Global FAISS Index", stage="index_build")
+def build_global_index(force: bool = False, cache_mode: str = None, index_path: str = FAISS_INDEX_PATH, reload_if_unchanged: bool = True,
+                       prefix: str | None = None, manifest_path: str | None = None):
+    """
+    Build (or incrementally update) the global index, or a collection's index from the files under
+    prefix (default S3_PREFIX) with its own manifest_path (default INDEX_MANIFEST_PATH).
+    When nothing changed, the saved index is loaded, or None is returned if reload_if_unchanged is False.
+    """
     cache_mode = cache_mode or Config.CACHE_MODE
-    all_keys = list_pdf_files()
+    all_keys = list_pdf_files(prefix)
     if not all_keys:
         logger.warning("No PDF files found.")
         return None
 
-    original_manifest = load_index_manifest()
-    manifest, pruned_keys = prune_manifest(all_keys)
+    manifest, pruned_keys = prune_manifest(all_keys, manifest_path)
     was_pruned = len(pruned_keys) > 0
 
     cleanup_stale_cache(pruned_keys)
 
-    keys_to_index = get_keys_to_index(all_keys, manifest, force, cache_mode)
+    extractor = create_pdf_extractor()
+    chunk_settings = default_chunk_settings()
+    keys_to_index, hashes = get_keys_to_index(all_keys, manifest, force, cache_mode, extractor, chunk_settings)
 
     if not keys_to_index and not was_pruned:
+        if not reload_if_unchanged:
+            logger.info("All files up-to-date. Keeping current index.")
+            return None
         if os.path.exists(index_path):
             logger.info("All files up-to-date. Loading existing index.")
-            return faiss_indexer.load_faiss_index(index_path)
+            return faiss_indexer.load_faiss_index(index_path, search_params=Config.FAISS_SEARCH_PARAMS)
         else:
             logger.warning("No new files to index and no existing index found.")
             return None
@@ -139,15 +275,29 @@ def build_global_index(force: bool = False, cache_mode: str = None, index_path:
     if not keys_to_index and was_pruned:
         logger.info("No new files, but manifest was pruned. Rebuilding index to remove stale chunks.")
 
-    extractor = create_pdf_extractor()
-    chunks, embeddings = index_files(keys_to_index, extractor, cache_mode)
-    return finalize_index(chunks, embeddings, index_path)
-
-
-def rebuild_index(exclude_keys: list[str] = None, cache_mode: str = None, index_path: str = FAISS_INDEX_PATH):
+    # Every file is sharded as it finishes; a killed build restarted with the same settings resumes
+    # from the journal, and the index is assembled from the shards of all files, unchanged ones included
+    journal = BuildJournal(index_path, {
+        "prefix": prefix, "force": force, **chunk_settings,
+        "embedding_model": Config.EMBEDDING_MODEL, "embedding_backend": Config.EMBEDDING_BACKEND,
+    })
+    try:
+        results = index_files(keys_to_index, extractor, cache_mode, manifest_path, journal, chunk_settings, reuse=not force, hashes=hashes)
+        # Files that failed this time are left out rather than served from a shard of other contents or settings
+        unchanged = {k: v for k, v in manifest.items() if k not in keys_to_index}
+        chunks, embeddings = load_shards(all_keys, {**unchanged, **results})
+        index = finalize_index(chunks, embeddings, index_path)
+        journal.finish()
+        return index
+    finally:
+        journal.close()
+
+
+def rebuild_index(exclude_keys: list[str] = None, cache_mode: str = None, index_path: str = FAISS_INDEX_PATH,
+                  prefix: str | None = None, manifest_path: str | None = None):
     cache_mode = cache_mode or Config.CACHE_MODE
     exclude_keys = set(exclude_keys or [])
-    all_keys = list_pdf_files()
+    all_keys = list_pdf_files(prefix)
     keys_to_index = [k for k in all_keys if k not in exclude_keys]
 
     if not keys_to_index:
@@ -155,41 +305,12 @@ def rebuild_index(exclude_keys: list[str] = None, cache_mode: str = None, index_
         return None
 
     extractor = create_pdf_extractor()
-    all_chunks = []
-    all_embeddings = []
-
-    max_workers = getattr(Config, "MAX_WORKERS", os.cpu_count()) or 4
     logger.info(f"Rebuilding index with {len(keys_to_index)} files (excluding {len(exclude_keys)}).")
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
-        for s3_key in keys_to_index:
-            actual_path = download_pdf(s3_key, cache_mode=cache_mode).replace("::ephemeral", "")
-            safe_name = os.path.basename(actual_path).replace(" ", "_").replace("\\", "_").replace("/", "_")
-            futures.append(executor.submit(process_file, actual_path, extractor, safe_name))
-
-        for s3_key, future in zip(keys_to_index, futures):
-            chunks, embeddings = future.result()
-            all_chunks.extend(chunks)
-            all_embeddings.extend(embeddings)
-
-            local_path = os.path.join(Config.CACHE_DIR, s3_key)
-            actual_path = local_path.replace("::ephemeral", "")
-            update_manifest_entry(
-                s3_key=s3_key,
-                hash_value=hash_file(actual_path),
-                chunk_count=len(chunks),
-                embedding_count=len(embeddings),
-                size=os.path.getsize(actual_path),
-                source="s3"
-            )
-            cleanup_if_ephemeral(local_path)
+    results = index_files(keys_to_index, extractor, cache_mode, manifest_path)
+    all_chunks, all_embeddings = load_shards(keys_to_index, results)
 
     if not all_chunks or not all_embeddings:
         logger.warning("No data to rebuild FAISS index.")
         return None
 
-    index = faiss_indexer.build_faiss_index(all_embeddings, all_chunks)
-    faiss_indexer.save_faiss_index(index, index_path)
-
-    return index
+    return finalize_index(all_chunks, all_embeddings, index_path)
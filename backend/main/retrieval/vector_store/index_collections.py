@@ -0,0 +1,54 @@
+"""Named document collections: an S3 prefix (or SAMPLE_DIR subfolder) with its own manifest and FAISS index."""
+import os
+import re
+from main.config import Config
+from main.retrieval.vector_store.index_builder import FAISS_INDEX_PATH
+from main.utils.manifest_helper import INDEX_MANIFEST_PATH
+
+DEFAULT_COLLECTION = "default"
+COLLECTIONS_DIR = os.path.join(os.path.dirname(FAISS_INDEX_PATH), "collections")
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class IndexCollection:
+    def __init__(self, name: str, prefix: str, index_path: str, manifest_path: str):
+        self.name = name
+        self.prefix = prefix
+        self.index_path = index_path
+        self.manifest_path = manifest_path
+
+    @classmethod
+    def named(cls, name: str, prefix: str) -> "IndexCollection":
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid collection name: {name!r}")
+        return cls(
+            name, prefix,
+            index_path=os.path.join(COLLECTIONS_DIR, f"{name}.index"),
+            manifest_path=os.path.join(Config.CACHE_DIR, "manifests", f"{name}.json"),
+        )
+
+    def build_kwargs(self) -> dict:
+        """Keyword arguments selecting this collection in index_builder.build_global_index()."""
+        return {"index_path": self.index_path, "prefix": self.prefix, "manifest_path": self.manifest_path}
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "prefix": self.prefix, "index_path": self.index_path, "manifest_path": self.manifest_path}
+
+
+def default_collection() -> IndexCollection:
+    """The pre-collections layout: S3_PREFIX, the global index and the global manifest."""
+    return IndexCollection(DEFAULT_COLLECTION, Config.S3_PREFIX, FAISS_INDEX_PATH, INDEX_MANIFEST_PATH)
+
+
+def parse_collections(spec: str) -> dict[str, IndexCollection]:
+    """Collections from a "name=prefix,..." spec, plus the default collection."""
+    collections = {DEFAULT_COLLECTION: default_collection()}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, prefix = entry.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid collection spec {entry!r}, expected name=prefix")
+        name = name.strip()
+        if name == DEFAULT_COLLECTION:
+            raise ValueError(f"Collection name {DEFAULT_COLLECTION!r} is reserved for S3_PREFIX")
+        collections[name] = IndexCollection.named(name, prefix.strip())
+    return collections
@@ -0,0 +1,57 @@
+"""Runs index rebuilds in the background and publishes the result to a LiveIndex."""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+from main.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class IndexRefresher:
+    """
+    Single-worker background rebuild. build(force) returns a new store, or None when
+    nothing changed; a new store is swapped into live_index without blocking queries.
+    """
+
+    def __init__(self, live_index, build: Callable[[bool], object]):
+        self.live_index = live_index
+        self.build = build
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-refresh")
+        self._lock = threading.Lock()
+        self._future = None
+        self.status = {"state": "idle"}
+
+    def start(self, force: bool = False) -> bool:
+        """Start a rebuild unless one is already running. Returns True if a new one was started."""
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return False
+            self.status = {"state": "running", "force": force, "started_at": datetime.utcnow().isoformat()}
+            self._future = self._executor.submit(self._run, force)
+            return True
+
+    def wait(self, timeout: float | None = None):
+        future = self._future
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def _run(self, force: bool):
+        status = dict(self.status)
+        try:
+            store = self.build(force)
+            if store is None:
+                status["state"] = "no_update"
+                logger.info("Background index refresh: no changes detected.")
+            else:
+                status["version"] = self.live_index.swap(store)
+                metrics.set_index_gauges(store, status["version"])
+                status["ntotal"] = store.index.ntotal
+                status["state"] = "updated"
+        except Exception as e:
+            logger.exception("Background index refresh failed")
+            status["state"] = "failed"
+            status["error"] = str(e)
+        status["finished_at"] = datetime.utcnow().isoformat()
+        self.status = status
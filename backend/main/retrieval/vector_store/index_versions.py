@@ -0,0 +1,128 @@
+"""Named index versions built from cached extractions with other chunk settings, for A/B comparison."""
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from main.config import Config
+from main.extractor.pdf_extractor_factory import create_pdf_extractor
+from main.pipeline.file_processor import extractor_key, has_cached_extraction, process_file
+from main.retrieval.vector_store import faiss_indexer
+from main.retrieval.vector_store.index_builder import FAISS_INDEX_PATH, cleanup_if_ephemeral, finalize_index
+from main.utils.manifest_helper import load_index_manifest
+from main.utils.s3_helper import download_pdf, download_pdf_stream
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = os.path.join(os.path.dirname(FAISS_INDEX_PATH), "versions")
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def version_name(chunker: str, chunk_size: int, chunk_overlap: int) -> str:
+    return f"{chunker}-cs{chunk_size}-ov{chunk_overlap}"
+
+
+def version_path(name: str) -> str:
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid index version name: {name!r}")
+    return os.path.join(VERSIONS_DIR, f"{name}.index")
+
+
+def _summary_path(name: str) -> str:
+    return os.path.splitext(version_path(name))[0] + ".json"
+
+
+def list_versions() -> list[dict]:
+    """Build summaries of all saved versions, newest first."""
+    versions = []
+    if os.path.isdir(VERSIONS_DIR):
+        for filename in os.listdir(VERSIONS_DIR):
+            if filename.endswith(".json"):
+                try:
+                    with open(os.path.join(VERSIONS_DIR, filename), "r") as f:
+                        versions.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning("Skipping unreadable index version summary %s: %s", filename, e)
+    return sorted(versions, key=lambda v: v.get("created_at", ""), reverse=True)
+
+
+def load_version(name: str):
+    path = version_path(name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Index version not found: {name}")
+    return faiss_indexer.load_faiss_index(path, search_params=Config.FAISS_SEARCH_PARAMS)
+
+
+def rechunk_index(chunk_size: int | None = None, chunk_overlap: int | None = None, chunker: str | None = None,
+                  name: str | None = None, cache_mode: str | None = None) -> dict:
+    """
+    Re-chunk and re-embed every document in the index manifest into a new index version, leaving the
+    live index and manifest untouched. Documents whose extractor output is cached (EXTRACTION_CACHE) are
+    not downloaded or extracted again; the others are, which also fills the cache for the next run.
+    Returns the version summary, also saved next to the index as <name>.json.
+    """
+    chunker = chunker or Config.CHUNKER
+    chunk_size = chunk_size or Config.CHUNK_SIZE
+    chunk_overlap = Config.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+    cache_mode = cache_mode or Config.CACHE_MODE
+    if chunker not in Config.OPTIONS["chunker"]:
+        raise ValueError(f"Invalid chunker: {chunker}")
+    if chunk_size <= 0 or not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_size must be positive and chunk_overlap in [0, chunk_size)")
+    name = name or version_name(chunker, chunk_size, chunk_overlap)
+    index_path = version_path(name)
+
+    manifest = load_index_manifest()
+    if not manifest:
+        raise ValueError("The index manifest is empty; build the index first.")
+
+    extractor = create_pdf_extractor()
+    settings = {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap, "chunker": chunker}
+    start = time.perf_counter()
+
+    def task(s3_key: str, file_hash: str | None) -> tuple[list[str], list[list[float]], bool]:
+        if file_hash and has_cached_extraction(file_hash, extractor, chunker):
+            return (*process_file(None, extractor, file_hash=file_hash, **settings), True)
+        if cache_mode == "none":
+            return (*process_file(download_pdf_stream(s3_key), extractor, **settings), False)
+        local_path = download_pdf(s3_key, cache_mode=cache_mode)
+        chunks, embeddings = process_file(local_path.replace("::ephemeral", ""), extractor, **settings)
+        cleanup_if_ephemeral(local_path)
+        return chunks, embeddings, False
+
+    keys = sorted(manifest)
+    all_chunks, all_embeddings, reused = [], [], 0
+    max_workers = getattr(Config, "MAX_WORKERS", os.cpu_count()) or 4
+    logger.info("Re-chunking %d files into index version %s (%s)", len(keys), name, settings)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(task, key, manifest[key].get("hash")) for key in keys]
+        for future in futures:
+            chunks, embeddings, from_cache = future.result()
+            all_chunks.extend(chunks)
+            all_embeddings.extend(embeddings)
+            reused += from_cache
+
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    if finalize_index(all_chunks, all_embeddings, index_path) is None:
+        raise ValueError("Re-chunking produced no chunks.")
+
+    provider, version = extractor_key(extractor)
+    summary = {
+        "name": name,
+        "path": index_path,
+        **settings,
+        "extractor": f"{provider}-{version}",
+        "embedding_model": Config.EMBEDDING_MODEL,
+        "documents": len(keys),
+        "cached_extractions": reused,
+        "chunks": len(all_chunks),
+        "seconds": round(time.perf_counter() - start, 2),
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    with open(_summary_path(name), "w") as f:
+        json.dump(summary, f, indent=2)
+    logger.info("Index version %s: %d chunks from %d files (%d from cached extractions) in %.1f sec",
+                name, summary["chunks"], summary["documents"], reused, summary["seconds"])
+    return summary
@@ -0,0 +1,75 @@
+"""Live FAISS index reference that can be swapped atomically while queries are running."""
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class _Generation:
+    __slots__ = ("store", "version", "readers")
+
+    def __init__(self, store, version: int):
+        self.store = store
+        self.version = version
+        self.readers = 0
+
+
+class LiveIndex:
+    """
+    Holds the index served to readers. Readers pin the current generation for the
+    duration of a query via acquire(); swap() publishes a new store immediately, and the
+    old one is released as soon as its last reader finishes.
+    """
+
+    def __init__(self, store=None):
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._current = _Generation(store, 0)
+        self._retired: list[_Generation] = []
+
+    @property
+    def current(self):
+        return self._current.store
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    @contextmanager
+    def acquire(self):
+        """Pin the current store for one reader."""
+        with self._lock:
+            generation = self._current
+            generation.readers += 1
+        try:
+            yield generation.store
+        finally:
+            with self._lock:
+                generation.readers -= 1
+                if generation.readers == 0 and generation in self._retired:
+                    self._retired.remove(generation)
+                    logger.debug("Index generation %d drained and released.", generation.version)
+                    self._drained.notify_all()
+
+    def swap(self, store) -> int:
+        """Publish a new store to subsequent readers. Returns the new version."""
+        with self._lock:
+            old = self._current
+            self._current = _Generation(store, old.version + 1)
+            if old.readers:
+                self._retired.append(old)
+            logger.info(
+                "Swapped in index generation %d (%d readers still on generation %d).",
+                self._current.version, old.readers, old.version
+            )
+            return self._current.version
+
+    def wait_drained(self, timeout: float | None = None) -> bool:
+        """Block until no reader holds a retired generation."""
+        with self._lock:
+            return self._drained.wait_for(lambda: not self._retired, timeout)
+
+    def retired_readers(self) -> int:
+        with self._lock:
+            return sum(generation.readers for generation in self._retired)
@@ -0,0 +1,117 @@
+"""Optional dimensionality reduction of embeddings, fitted at build time and saved next to the index."""
+import logging
+import os
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Projection:
+    """
+    Linear map from model-dim to index-dim vectors: (x - mean) @ components.
+    "pca" learns the components from the corpus; "truncate" keeps the leading
+    dimensions (Matryoshka-style, only meaningful for models trained that way).
+    """
+
+    def __init__(self, method: str, mean: np.ndarray, components: np.ndarray, info: dict | None = None):
+        self.method = method
+        self.mean = mean.astype("float32")
+        self.components = components.astype("float32")
+        self.info = info or {}
+
+    @property
+    def source_dim(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[1]
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype="float32")
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape[1] != self.source_dim:
+            raise ValueError(f"Expected dim {self.source_dim}, got {vectors.shape[1]}")
+        return np.ascontiguousarray((vectors - self.mean) @ self.components)
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.array(vectors, dtype="float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def fit_projection(vectors: np.ndarray, dim: int, method: str = "pca") -> Projection:
+    """Fit a projection to dim dimensions on (normalized) corpus vectors."""
+    vectors = _normalized(vectors)
+    source_dim = vectors.shape[1]
+    if not 0 < dim < source_dim:
+        raise ValueError(f"Projection dim must be between 1 and {source_dim - 1}, got {dim}")
+
+    if method == "pca":
+        mean = vectors.mean(axis=0)
+        centered = vectors - mean
+        eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered)
+        order = np.argsort(eigenvalues)[::-1][:dim]
+        components = eigenvectors[:, order]
+        explained = float(eigenvalues[order].sum() / max(eigenvalues.sum(), 1e-12))
+        return Projection(method, mean, components, {"explained_variance": round(explained, 4)})
+    elif method == "truncate":
+        return Projection(method, np.zeros(source_dim), np.eye(source_dim, dim))
+    else:
+        raise ValueError(f"Unsupported projection method: {method}")
+
+
+def measure_recall(vectors: np.ndarray, projection: Projection, k: int = 10, sample: int = 200, seed: int = 0) -> float:
+    """
+    Recall@k of nearest-neighbour search in the projected space against exact search
+    in the full space, using a sample of the corpus vectors as queries (self excluded).
+    """
+    full = _normalized(vectors)
+    projected = _normalized(projection.apply(full))
+    k = min(k, len(full) - 1)
+    if k < 1:
+        return 1.0
+
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(len(full), size=min(sample, len(full)), replace=False)
+
+    def neighbours(matrix):
+        index = faiss.IndexFlatIP(matrix.shape[1])
+        index.add(matrix)
+        _, ids = index.search(matrix[queries], k + 1)
+        return [set(row[row != q][:k]) for row, q in zip(ids, queries)]
+
+    hits = sum(len(a & b) for a, b in zip(neighbours(full), neighbours(projected)))
+    return hits / (len(queries) * k)
+
+
+def projection_path(base_path: str) -> str:
+    return base_path + ".projection.npz"
+
+
+def save_projection(projection: Projection | None, base_path: str):
+    path = projection_path(base_path)
+    if projection is None:
+        if os.path.exists(path):
+            os.remove(path)  # stale projection from a previous build would corrupt queries
+        return
+    np.savez(
+        path,
+        method=projection.method,
+        mean=projection.mean,
+        components=projection.components,
+        info_keys=np.array(list(projection.info), dtype=object),
+        info_values=np.array(list(projection.info.values()), dtype=object),
+    )
+
+
+def load_projection(base_path: str) -> Projection | None:
+    path = projection_path(base_path)
+    if not os.path.exists(path):
+        return None
+    data = np.load(path, allow_pickle=True)
+    info = dict(zip(data["info_keys"].tolist(), data["info_values"].tolist()))
+    return Projection(str(data["method"]), data["mean"], data["components"], info)
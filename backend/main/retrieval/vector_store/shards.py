@@ -0,0 +1,49 @@
+"""Per-document vector shards: the chunks and embeddings of one file, merged into an index later."""
+import hashlib
+import os
+import tempfile
+import numpy as np
+from main.config import Config
+from main.chunker import layout_chunker
+from main.chunker.text_chunker import PREPARE
+from main.pipeline.file_processor import extractor_key
+from main.utils.text_preprocessor import PREPROCESS
+
+
+def shard_key(file_hash: str, extractor, chunker: str, chunk_size: int, chunk_overlap: int) -> str:
+    """Name of the shard for a file's contents under the given extraction, chunking and embedding settings."""
+    provider, version = extractor_key(extractor)
+    # The path process_file takes: layout chunking needs a layout-capable extractor, else it falls back to text
+    if chunker == "layout" and hasattr(extractor, "extract_layout"):
+        rules = f"layout-{layout_chunker.FINGERPRINT}"
+    else:
+        rules = f"{PREPROCESS.fingerprint}-{PREPARE.fingerprint}"
+    settings = f"{provider}-{version}|{rules}|{chunk_size}|{chunk_overlap}|{Config.EMBEDDING_MODEL}|{Config.EMBEDDING_BACKEND}"
+    return f"{file_hash}-{hashlib.sha256(settings.encode('utf-8')).hexdigest()[:12]}"
+
+
+def shard_path(directory: str, key: str) -> str:
+    return os.path.join(directory, f"{key}.npz")
+
+
+def write_shard(path: str, chunks: list[str], embeddings: list[list[float]]):
+    """Atomic write, so a reader or a retrying worker never sees a partial shard."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                chunks=np.array(chunks, dtype=object),
+                embeddings=np.asarray(embeddings, dtype="float32"),
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_shard(path: str) -> tuple[list[str], np.ndarray]:
+    with np.load(path, allow_pickle=True) as data:
+        return data["chunks"].tolist(), data["embeddings"]
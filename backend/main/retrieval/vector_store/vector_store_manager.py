@@ -3,15 +3,41 @@ from main.config import Config
 from main.logger_config import log_duration
 from main.retrieval.vector_store import faiss_indexer
 from main.retrieval.rerankers.merge_utils import merge_adjacent_chunks
+from main.utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
 
-@log_duration("FAISS Query + Rerank")
+@tracing.traced("retrieve_relevant_docs")
+@log_duration("FAISS Query + Rerank", stage="retrieval")
 def retrieve_relevant_docs(index, query_text, embedding_model, reranker=None, top_k=Config.TOP_K_FAISS, top_n=Config.TOP_N_RERANK, score_threshold=0.2):
     """Retrieve top chunks from FAISS index and optionally rerank, with neighbor merging."""
     logger.debug("Embedding model: %s | Query: %s", type(embedding_model), query_text)
     top_chunks = faiss_indexer.query_faiss_index(index, query_text, embedding_model, k=top_k)
+    return select_relevant_docs(query_text, top_chunks, reranker, top_n=top_n, score_threshold=score_threshold)
+
+
+@log_duration("FAISS Batch Query", stage="batch_search")
+def search_candidates_batch(index, query_texts, embedding_model, top_k=Config.TOP_K_FAISS):
+    """Embed and search many queries at once. Returns raw (chunk, score) candidates per query."""
+    logger.debug("Batch searching %d queries (top_k=%d)", len(query_texts), top_k)
+    return faiss_indexer.query_faiss_index_batch(index, query_texts, embedding_model, k=top_k)
+
+
+@tracing.traced("rerank")
+@log_duration("Rerank", stage="rerank")
+def rerank_docs(reranker, query_text, docs, top_n=Config.TOP_N_RERANK):
+    tracing.set_attribute("rerank.provider", getattr(reranker, "provider", "unknown"))
+    tracing.set_attribute("rerank.candidates", len(docs))
+    try:
+        return reranker.rerank(query_text, docs, top_n=top_n)
+    except Exception:
+        metrics.record_error("reranker", getattr(reranker, "provider", None))
+        raise
+
+
+def select_relevant_docs(query_text, top_chunks, reranker=None, top_n=Config.TOP_N_RERANK, score_threshold=0.2):
+    """Rerank (optionally) and merge FAISS candidates for one query into final context sections."""
     if not top_chunks:
         return []
 
@@ -19,7 +45,7 @@ def retrieve_relevant_docs(index, query_text, embedding_model, reranker=None, to
     docs = all_chunks.copy()
 
     if reranker:
-        reranked = reranker.rerank(query_text, docs, top_n=top_n)
+        reranked = rerank_docs(reranker, query_text, docs, top_n=top_n)
         merged_docs = merge_adjacent_chunks(reranked, docs, window_size=Config.MERGE_WINDOW_SIZE)
         logger.debug("Merged %d reranked sections for final context.", len(merged_docs))
         return merged_docs
@@ -0,0 +1,174 @@
+"""Server-side conversation sessions with bounded residency and compacted history."""
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+from main.config import Config
+from main.llm.token_counter import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_QUESTION = "(Summary of earlier conversation)"
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(\s|$)", re.S)
+
+
+def extractive_summary(summary: str, turns: list[tuple[str, str]], max_chars: int = 200) -> str:
+    """Fold turns into the running summary: each question with the first sentence of its answer."""
+    lines = [summary] if summary else []
+    for question, answer in turns:
+        match = _FIRST_SENTENCE.match(answer.strip())
+        gist = (match.group(1) if match else answer.strip())[:max_chars]
+        lines.append(f"- Asked: {question.strip()[:max_chars]} | Answer: {gist}")
+    return "\n".join(lines)
+
+
+def llm_summarizer(llm) -> Callable[[str, list[tuple[str, str]]], str]:
+    """Summarizer that asks the LLM to merge turns into the running summary."""
+    def summarize(summary: str, turns: list[tuple[str, str]]) -> str:
+        conversation = "\n".join(f"Q: {q}\nA: {a}" for q, a in turns)
+        prompt = (
+            "Update the summary of a customer conversation about HVAC products. "
+            "Keep product names, model numbers, units and open questions. Be concise.\n\n"
+            f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{conversation}\n\nUpdated summary:"
+        )
+        return llm.generate_answer(prompt).strip()
+    return summarize
+
+
+class Session:
+    def __init__(self, session_id: str, summary: str = "", turns: list | None = None, updated_at: str | None = None):
+        self.session_id = session_id
+        self.summary = summary
+        self.turns = [tuple(t) for t in (turns or [])]
+        self.updated_at = updated_at or datetime.utcnow().isoformat()
+        self.lock = threading.Lock()
+
+    def history(self) -> list[tuple[str, str]]:
+        """History as (question, answer) turns, with the summary as a leading pseudo-turn."""
+        prefix = [(SUMMARY_QUESTION, self.summary)] if self.summary else []
+        return prefix + list(self.turns)
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "summary": self.summary,
+            "turns": [list(t) for t in self.turns],
+            "updated_at": self.updated_at,
+        }
+
+
+class SessionStore:
+    """
+    In-memory LRU of sessions, optionally persisted as one JSON file per session.
+    Evicted sessions are reloaded from disk on next access when persistence is on.
+    """
+
+    def __init__(self, max_sessions: int = None, persist_dir: str | None = None,
+                 compact_threshold: int = None, keep_turns: int = None, count_tokens=None, summarize=None):
+        self.max_sessions = max_sessions or Config.SESSION_MAX_SESSIONS
+        self.persist_dir = Config.SESSION_PERSIST_DIR if persist_dir is None else persist_dir
+        self.compact_threshold = compact_threshold or Config.SESSION_COMPACT_TOKENS
+        self.keep_turns = Config.SESSION_KEEP_TURNS if keep_turns is None else keep_turns
+        self.count_tokens = count_tokens or get_token_counter()
+        self.summarize = summarize or extractive_summary
+
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.persist_dir, f"{session_id}.json")
+
+    def _load(self, session_id: str) -> Session | None:
+        if not self.persist_dir or not os.path.exists(self._path(session_id)):
+            return None
+        try:
+            with open(self._path(session_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return Session(session_id, data.get("summary", ""), data.get("turns", []), data.get("updated_at"))
+        except Exception as e:
+            logger.warning(f"Failed to load session {session_id}: {e}")
+            return None
+
+    def _save(self, session: Session):
+        if not self.persist_dir:
+            return
+        try:
+            with open(self._path(session.session_id), "w", encoding="utf-8") as f:
+                json.dump(session.to_dict(), f)
+        except Exception as e:
+            logger.warning(f"Failed to save session {session.session_id}: {e}")
+
+    def _insert(self, session: Session):
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            logger.debug("Evicted session %s from memory", evicted_id)
+
+    def create(self) -> Session:
+        session = Session(uuid.uuid4().hex)
+        with self._lock:
+            self._insert(session)
+        return session
+
+    def get(self, session_id: str, create: bool = False) -> Session | None:
+        """Return the session (loading it from disk if evicted), or a new one with this ID if create=True."""
+        if not _SESSION_ID.match(session_id or ""):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._load(session_id)
+                if session is None and create:
+                    session = Session(session_id)
+                if session is not None:
+                    self._insert(session)
+            else:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        if not _SESSION_ID.match(session_id or ""):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        with self._lock:
+            found = self._sessions.pop(session_id, None) is not None
+        if self.persist_dir and os.path.exists(self._path(session_id)):
+            os.remove(self._path(session_id))
+            found = True
+        return found
+
+    def append(self, session: Session, question: str, answer: str, summarize=None):
+        """Record a turn, compact older turns if over the token threshold, and persist."""
+        with session.lock:
+            session.turns.append((question, answer))
+            session.updated_at = datetime.utcnow().isoformat()
+            self._compact(session, summarize or self.summarize)
+            self._save(session)
+
+    def _compact(self, session: Session, summarize):
+        tokens = self.count_tokens(session.summary) + sum(self.count_tokens(f"{q}\n{a}") for q, a in session.turns)
+        if tokens <= self.compact_threshold or len(session.turns) <= self.keep_turns:
+            return
+
+        split = len(session.turns) - self.keep_turns
+        older, recent = session.turns[:split], session.turns[split:]
+        summary = summarize(session.summary, older)
+
+        # Keep the summary itself bounded so prompts stay flat over long chats
+        lines = summary.splitlines()
+        while len(lines) > 1 and self.count_tokens("\n".join(lines)) > self.compact_threshold // 2:
+            lines.pop(0)
+        session.summary = "\n".join(lines)
+        session.turns = recent
+        logger.debug("Compacted %d turns of session %s into summary (%d tokens before)", len(older), session.session_id, tokens)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -9,64 +9,75 @@ logger = logging.getLogger(__name__)
 INDEX_MANIFEST_PATH = os.path.join(Config.CACHE_DIR, "index_manifest.json")
 
 
-def load_index_manifest() -> dict[str, dict]:
-    """Load manifest as a dict of s3_key → metadata."""
-    if os.path.exists(INDEX_MANIFEST_PATH):
+def load_index_manifest(path: str | None = None) -> dict[str, dict]:
+    """Load manifest as a dict of s3_key → metadata (from path, default INDEX_MANIFEST_PATH)."""
+    path = path or INDEX_MANIFEST_PATH
+    if os.path.exists(path):
         try:
-            with open(INDEX_MANIFEST_PATH, "r") as f:
+            with open(path, "r") as f:
                 return json.load(f)
         except Exception as e:
             logger.warning(f"Failed to load index manifest: {e}")
     return {}
 
 
-def save_index_manifest(manifest: dict[str, dict]):
+def save_index_manifest(manifest: dict[str, dict], path: str | None = None):
     """Save manifest with structured metadata."""
+    path = path or INDEX_MANIFEST_PATH
     try:
-        with open(INDEX_MANIFEST_PATH, "w") as f:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
             json.dump(manifest, f, indent=2)
     except Exception as e:
         logger.warning(f"Failed to save index manifest: {e}")
 
 
+def manifest_entry(hash_value: str, chunk_count: int, embedding_count: int, size: int | None = None, source: str = "s3",
+                   shard: str | None = None) -> dict:
+    return {
+        "hash": hash_value,
+        "indexed_at": datetime.utcnow().isoformat(),
+        "chunk_count": chunk_count,
+        "embedding_count": embedding_count,
+        "size": size,
+        "source": source,
+        "shard": shard
+    }
+
+
 def update_manifest_entry(
     s3_key: str,
     hash_value: str,
     chunk_count: int,
     embedding_count: int,
     size: int | None = None,
-    source: str = "s3"
+    source: str = "s3",
+    path: str | None = None,
+    shard: str | None = None
 ):
-    manifest = load_index_manifest()
-    manifest[s3_key] = {
-        "hash": hash_value,
-        "indexed_at": datetime.utcnow().isoformat(),
-        "chunk_count": chunk_count,
-        "embedding_count": embedding_count,
-        "size": size,
-        "source": source
-    }
-    save_index_manifest(manifest)
+    manifest = load_index_manifest(path)
+    manifest[s3_key] = manifest_entry(hash_value, chunk_count, embedding_count, size, source, shard)
+    save_index_manifest(manifest, path)
 
 
-def remove_from_manifest(files_to_remove: list[str]):
+def remove_from_manifest(files_to_remove: list[str], path: str | None = None):
     """Remove entries by s3_key."""
-    manifest = load_index_manifest()
+    manifest = load_index_manifest(path)
     for key in files_to_remove:
         manifest.pop(key, None)
-    save_index_manifest(manifest)
+    save_index_manifest(manifest, path)
 
 
-def prune_manifest(current_keys: list[str]) -> dict[str, dict]:
+def prune_manifest(current_keys: list[str], path: str | None = None) -> dict[str, dict]:
     """
     Remove manifest entries for files no longer present in S3.
     Returns the updated manifest.
     """
-    manifest = load_index_manifest()
+    manifest = load_index_manifest(path)
     stale_keys = [k for k in manifest if k not in current_keys]
     if stale_keys:
         logger.info(f"Pruning {len(stale_keys)} stale manifest entries.")
         for k in stale_keys:
             manifest.pop(k, None)
-        save_index_manifest(manifest)
+        save_index_manifest(manifest, path)
     return manifest, stale_keys
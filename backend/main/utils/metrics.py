@@ -0,0 +1,45 @@
+"""Prometheus metrics: per-stage latency histograms, cache/error counters and index gauges."""
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Spans fast local stages (intent, embedding, search) up to LLM generation and index builds
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+STAGE_DURATION = Histogram(
+    "rag_stage_duration_seconds", "Duration of RAG pipeline stages.", ["stage"], buckets=_BUCKETS
+)
+CACHE_EVENTS = Counter(
+    "rag_cache_events_total", "Cache lookups by cache and result (hit/miss).", ["cache", "result"]
+)
+PROVIDER_ERRORS = Counter(
+    "rag_provider_errors_total", "Errors raised by providers, by kind (llm, reranker, retriever...) and provider.",
+    ["kind", "provider"]
+)
+INDEX_VECTORS = Gauge("rag_index_vectors", "Vectors in the live index.")
+INDEX_DIMENSION = Gauge("rag_index_dimension", "Dimension of vectors in the live index.")
+INDEX_VERSION = Gauge("rag_index_version", "Generation of the live index (increments on hot swap).")
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_DURATION.labels(stage=stage).observe(seconds)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_EVENTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_error(kind: str, provider: str | None):
+    PROVIDER_ERRORS.labels(kind=kind, provider=provider or "unknown").inc()
+
+
+def set_index_gauges(store, version: int):
+    INDEX_VERSION.set(version)
+    if store is None:
+        INDEX_VECTORS.set(0)
+        return
+    INDEX_VECTORS.set(store.index.ntotal)
+    INDEX_DIMENSION.set(store.index.d)
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition payload and content type for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
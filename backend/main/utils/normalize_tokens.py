@@ -1,4 +1,16 @@
-import re
+from main.utils.text_preprocessor import Rule, TextPipeline, sub_rule
+
+# Replace patterns like E7.2 or E7.2B with a spaced + underscored version
+NORMALIZE = TextPipeline("normalize_text", [
+    Rule(
+        "section_codes", r"\b([A-Za-z])(\d+)\.(\d+)([A-Za-z]?)\b",
+        lambda m: f"{m.group(1)} {m.group(2)}_{m.group(3)} {m.group(4)}".strip(),
+        spec="section_codes:X1.2Y->X 1_2 Y",
+    ),
+    # Normalize multiple spaces and make consistent casing (same as r"\s+" -> " ", leaving single spaces alone)
+    sub_rule("whitespace", r" \s+|[^\S ]\s*", " "),
+])
+
 
 def normalize_text(text: str) -> str:
     """
@@ -7,11 +19,4 @@ def normalize_text(text: str) -> str:
         'E7.2B' -> 'E 7_2 B'
         'E22.2/E22.2B' -> 'E 22_2 / E 22_2 B'
     """
-    # Replace patterns like E7.2 or E7.2B with a spaced + underscored version
-    pattern = re.compile(r"\b([A-Za-z])(\d+)\.(\d+)([A-Za-z]?)\b")
-    text = pattern.sub(lambda m: f"{m.group(1)} {m.group(2)}_{m.group(3)} {m.group(4)}".strip(), text)
-    
-    # Normalize multiple spaces and make consistent casing
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
+    return NORMALIZE.run(text)
@@ -6,13 +6,18 @@ from main.utils import s3_helper
 logger = logging.getLogger(__name__)
 
 
-def list_pdf_files() -> list[str]:
-    """Return a list of PDF files from local folder or S3 based on config."""
+def list_pdf_files(prefix: str | None = None) -> list[str]:
+    """
+    Return a list of PDF files from local folder or S3 based on config.
+    prefix (default S3_PREFIX) is a key prefix in S3, or a subfolder of SAMPLE_DIR locally.
+    """
+    prefix = Config.S3_PREFIX if prefix is None else prefix
     if Config.USE_S3:
-        return s3_helper.list_pdfs_in_bucket()
+        return s3_helper.list_pdfs_in_bucket(prefix=prefix)
     else:
+        folder = os.path.join(Config.SAMPLE_DIR, prefix) if prefix else Config.SAMPLE_DIR
         return [
-            f for f in os.listdir(Config.SAMPLE_DIR)
+            os.path.join(prefix, f) if prefix else f for f in os.listdir(folder)
             if f.lower().endswith(".pdf")
         ]
     
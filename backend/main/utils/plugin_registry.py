@@ -0,0 +1,69 @@
+"""Name → class registry that imports provider modules only on first use."""
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# "<kind>:<name>" → seconds spent importing that provider's module
+_import_times: dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+class PluginRegistry:
+    """
+    Resolve provider classes by name from "package.module:ClassName" paths.
+    Nothing is imported until resolve()/create() is called for that name, so unused
+    providers (and their SDKs: boto3, cohere, langchain_ollama, pytesseract...) cost nothing.
+    """
+
+    def __init__(self, kind: str, error_message: str = "Unsupported {kind} provider: {name}"):
+        self.kind = kind
+        self.error_message = error_message
+        self._paths: dict[str, str] = {}
+        self._classes: dict[str, type] = {}
+
+    def register(self, name: str, path: str):
+        self._paths[name] = path
+        self._classes.pop(name, None)
+
+    def names(self) -> list[str]:
+        return list(self._paths)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+    def resolve(self, name: str) -> type:
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+
+        path = self._paths.get(name)
+        if path is None:
+            raise ValueError(self.error_message.format(kind=self.kind, name=name))
+
+        module_name, class_name = path.split(":")
+        with _import_lock:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            elapsed = time.perf_counter() - start
+            _import_times.setdefault(f"{self.kind}:{name}", elapsed)
+        logger.debug("Loaded %s provider '%s' from %s in %.3f sec", self.kind, name, module_name, elapsed)
+
+        cls = getattr(module, class_name)
+        self._classes[name] = cls
+        return cls
+
+    def create(self, name: str, *args, **kwargs):
+        return self.resolve(name)(*args, **kwargs)
+
+
+def import_report() -> dict:
+    """Providers imported so far and how long each import took (first import only)."""
+    with _import_lock:
+        times = dict(_import_times)
+    return {
+        "providers": {key: round(seconds, 4) for key, seconds in sorted(times.items())},
+        "total_sec": round(sum(times.values()), 4),
+    }
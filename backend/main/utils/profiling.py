@@ -0,0 +1,120 @@
+"""Opt-in cProfile hooks for single queries and index builds (no-ops unless a profile is active)."""
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileCollector:
+    """Merges cProfile runs from several threads into one pstats report."""
+
+    def __init__(self):
+        self._stats: pstats.Stats | None = None
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile):
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+
+    def dump(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            if self._stats is not None:
+                self._stats.dump_stats(path)
+
+    def summary(self, limit: int = 30, sort: str = "cumulative") -> str:
+        with self._lock:
+            if self._stats is None:
+                return ""
+            out = io.StringIO()
+            self._stats.stream = out
+            self._stats.sort_stats(sort).print_stats(limit)
+            return out.getvalue()
+
+
+# Request profile, visible to worker threads that run in the request's context
+_request_profile: ContextVar[ProfileCollector | None] = ContextVar("request_profile", default=None)
+
+# Build profile: one collector per stage, shared by all ingest worker threads
+_build_stages: dict[str, ProfileCollector] | None = None
+_build_lock = threading.Lock()
+
+
+def _run_profiled(collector: ProfileCollector, func, *args, **kwargs):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        collector.add(profiler)
+
+
+@contextmanager
+def profile_request():
+    """Profile the calling thread, plus any work wrapped with in_request_profile() on its behalf."""
+    collector = ProfileCollector()
+    token = _request_profile.set(collector)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield collector
+    finally:
+        profiler.disable()
+        collector.add(profiler)
+        _request_profile.reset(token)
+
+
+def in_request_profile(func):
+    """Wrap work handed to another thread so it is included in the active request profile, if any."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _request_profile.get()
+        if collector is None:
+            return func(*args, **kwargs)
+        return _run_profiled(collector, func, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def stage(name: str):
+    """Profile one ingest stage into the active build profile; does nothing otherwise."""
+    if _build_stages is None:
+        yield
+        return
+    with _build_lock:
+        collector = _build_stages.setdefault(name, ProfileCollector())
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        collector.add(profiler)
+
+
+@contextmanager
+def build_profile(out_dir: str, limit: int = 40):
+    """Collect per-stage profiles for everything built inside the block, then write <stage>.prof/.txt to out_dir."""
+    global _build_stages
+    _build_stages = {}
+    try:
+        yield
+    finally:
+        stages, _build_stages = _build_stages, None
+        os.makedirs(out_dir, exist_ok=True)
+        for name, collector in stages.items():
+            collector.dump(os.path.join(out_dir, f"{name}.prof"))
+            with open(os.path.join(out_dir, f"{name}.txt"), "w", encoding="utf-8") as f:
+                f.write(collector.summary(limit))
+        logger.info("Wrote build profiles for stages %s to %s", ", ".join(sorted(stages)) or "(none)", out_dir)
@@ -0,0 +1,149 @@
+"""Resource statistics for the loaded index, manifest, embedding model and caches."""
+import os
+import sys
+import faiss
+from main.config import Config
+from main.embedder import embedder
+from main.retrieval.vector_store.projection import projection_path
+from main.utils.manifest_helper import load_index_manifest
+
+
+def dir_size(path: str, suffix: str | None = None) -> dict:
+    """Total size of the files under path (only names ending in suffix, if given)."""
+    total, files = 0, 0
+    if os.path.isdir(path):
+        for root, _, names in os.walk(path):
+            for name in names:
+                if suffix and not name.lower().endswith(suffix):
+                    continue
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                    files += 1
+                except OSError:
+                    pass
+    return {"path": path, "files": files, "bytes": total}
+
+
+def _vector_bytes(index) -> int | None:
+    """Estimated bytes held by the stored vectors (codes), without serializing the index."""
+    code_size = getattr(index, "code_size", None)
+    if code_size is None and hasattr(index, "storage"):  # HNSW keeps vectors in a separate storage index
+        code_size = getattr(faiss.downcast_index(index.storage), "code_size", None)
+    return index.ntotal * code_size if code_size is not None else None
+
+
+def index_memory_bytes(store) -> int:
+    """Approximate resident bytes of a FaissStore: vector codes, chunk texts and projection (graph links not counted)."""
+    if store is None:
+        return 0
+    total = _vector_bytes(store.index) or 0
+    total += sys.getsizeof(store.metadata) + sum(sys.getsizeof(text) for text in store.metadata)
+    if store.projection is not None:
+        total += store.projection.components.nbytes + store.projection.mean.nbytes
+    return total
+
+
+def index_stats(store, index_path: str | None = None) -> dict:
+    """Type, size and memory of a FaissStore; on-disk sizes of its files when index_path is given."""
+    if store is None:
+        return {"loaded": False}
+
+    metadata = store.metadata
+    stats = {
+        "loaded": True,
+        "index_type": type(store.index).__name__,
+        "ntotal": store.index.ntotal,
+        "dimension": store.index.d,
+        "vector_bytes": _vector_bytes(store.index),
+        "metadata_chunks": len(metadata),
+        "metadata_text_bytes": sum(len(text.encode("utf-8")) for text in metadata),
+        "metadata_memory_bytes": sys.getsizeof(metadata) + sum(sys.getsizeof(text) for text in metadata),
+        "projection": None,
+    }
+    if store.projection is not None:
+        stats["projection"] = {
+            "method": store.projection.method,
+            "source_dim": store.projection.source_dim,
+            "dim": store.projection.dim,
+            "bytes": store.projection.components.nbytes + store.projection.mean.nbytes,
+            **store.projection.info,
+        }
+
+    if index_path:
+        base_path = os.path.splitext(index_path)[0]
+        files = [base_path + ".index", base_path + ".metadata.npy", projection_path(base_path)]
+        stats["disk_bytes"] = {
+            os.path.basename(path): os.path.getsize(path) for path in files if os.path.exists(path)
+        }
+    return stats
+
+
+def manifest_stats(manifest_path: str | None = None) -> dict:
+    """Per-document chunk counts from the index manifest."""
+    manifest = load_index_manifest(manifest_path)
+    documents = {
+        key: {
+            "chunks": entry.get("chunk_count"),
+            "embeddings": entry.get("embedding_count"),
+            "size": entry.get("size"),
+            "indexed_at": entry.get("indexed_at"),
+        }
+        for key, entry in sorted(manifest.items())
+    }
+    return {
+        "documents": len(documents),
+        "total_chunks": sum(d["chunks"] or 0 for d in documents.values()),
+        "per_document": documents,
+    }
+
+
+def model_stats() -> dict:
+    """Embedding model settings, load time and parameter memory (only if already loaded)."""
+    stats = {
+        "name": Config.EMBEDDING_MODEL,
+        "backend": Config.EMBEDDING_BACKEND,
+        "loaded": embedder.is_loaded(),
+        "load_seconds": embedder.get_load_seconds(),
+        "parameter_bytes": None,
+    }
+    if stats["loaded"]:
+        model = embedder.get_model()
+        stats["dimension"] = model.get_sentence_embedding_dimension()
+        try:
+            stats["parameter_bytes"] = sum(p.numel() * p.element_size() for p in model.parameters())
+        except Exception:
+            pass  # ONNX backends keep weights outside torch
+    return stats
+
+
+def process_stats() -> dict:
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return {"peak_rss_bytes": None}
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return {"peak_rss_bytes": peak if sys.platform == "darwin" else peak * 1024}
+
+
+def cache_stats(sessions=None) -> dict:
+    stats = {
+        # Only the PDFs: the text caches, ONNX models and ingest queue live under CACHE_DIR by default
+        "pdf_cache": dir_size(Config.CACHE_DIR, suffix=".pdf"),
+        "preprocessed_text": dir_size(Config.PREPROCESS_CACHE_DIR),
+        "extracted_text": dir_size(Config.EXTRACTION_CACHE_DIR),
+        "onnx_models": dir_size(Config.EMBEDDING_ONNX_DIR),
+    }
+    if sessions is not None:
+        stats["sessions_in_memory"] = len(sessions)
+    return stats
+
+
+def collect_stats(store, index_path: str | None = None, sessions=None, manifest_path: str | None = None) -> dict:
+    return {
+        "index": index_stats(store, index_path),
+        "manifest": manifest_stats(manifest_path),
+        "embedding_model": model_stats(),
+        "caches": cache_stats(sessions),
+        "process": process_stats(),
+    }
@@ -0,0 +1,74 @@
+"""On-disk cache of per-document text, keyed by content hash, producer (extractor) and version."""
+import glob
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(source: Union[str, bytes]) -> str:
+    """SHA-256 of a file path's contents or of raw bytes (same digest as s3_helper.hash_file)."""
+    hasher = hashlib.sha256()
+    if isinstance(source, bytes):
+        hasher.update(source)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class TextCache:
+    """
+    One UTF-8 file per (file_hash, variant, version), gzip-compressed with compress=True.
+    Writing a new version removes older versions of the same file and variant, so the cache
+    does not grow when rules change.
+    """
+
+    def __init__(self, directory: str, compress: bool = False):
+        self.directory = directory
+        self.compress = compress
+        self.suffix = ".txt.gz" if compress else ".txt"
+
+    @staticmethod
+    def _safe(part: str) -> str:
+        return "".join(c if c.isalnum() or c in "-_" else "_" for c in part)
+
+    def path(self, file_hash: str, variant: str, version: str) -> str:
+        return os.path.join(self.directory, f"{file_hash}.{self._safe(variant)}.{self._safe(version)}{self.suffix}")
+
+    def get(self, file_hash: str, variant: str, version: str) -> str | None:
+        try:
+            with open(self.path(file_hash, variant, version), "rb") as f:
+                data = f.read()
+            return (gzip.decompress(data) if self.compress else data).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logger.warning("Failed to read text cache entry for %s: %s", file_hash, e)
+            return None
+
+    def put(self, file_hash: str, variant: str, version: str, text: str):
+        path = self.path(file_hash, variant, version)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write-then-rename so concurrent ingest workers never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            data = text.encode("utf-8")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=6) if self.compress else data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write text cache entry for %s: %s", file_hash, e)
+            return
+
+        for stale in glob.glob(os.path.join(self.directory, f"{file_hash}.{self._safe(variant)}.*{self.suffix}")):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
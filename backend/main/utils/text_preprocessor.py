@@ -1,4 +1,6 @@
+import hashlib
 import re
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,34 +18,116 @@ FRACTION_MAP = {
     "⅞": "7/8",
 }
 
-def fix_pdf_symbols(text: str) -> str:
+# Dash and minus variants (U+2010..U+2014)
+DASH_MAP = dict.fromkeys("‐‑‒–—", "-")
+
+
+class Rule:
     """
-    Normalize special fraction glyphs and other non-ASCII characters
-    that Textract often misses or mis-recognizes.
-    This works for all PDFs, not just specific ones.
+    One named rewrite over the whole text, compiled once. Rules with a guard are skipped
+    unless one of the guard substrings occurs in the text (a C-speed scan, much cheaper
+    than running a regex that cannot match).
+
+    Patterns should start with a literal or a small character class: re only skips ahead
+    quickly to candidate positions then, whereas a leading \b, lookbehind or broad class
+    is tried at every character. E.g. r"E(?<=\bE)" rather than r"\bE".
     """
-    if not text:
-        return text
 
-    # original = text
-    replaced = []
+    def __init__(self, name: str, pattern: str, repl, guard: tuple[str, ...] = (), spec: str = ""):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.repl = repl
+        self.guard = guard
+        # Identifies what the rule does, for the pipeline fingerprint (callables have no stable repr)
+        self.spec = spec or f"{pattern}->{repl}"
 
-    # Replace fraction glyphs
-    for glyph, ascii_equiv in FRACTION_MAP.items():
-        if glyph in text:
-            text = text.replace(glyph, ascii_equiv)
-            replaced.append(glyph)
+    def apply(self, text: str) -> str:
+        if self.guard and not any(g in text for g in self.guard):
+            return text
+        return self.pattern.sub(self.repl, text)
 
-    # Normalize dashes and minus variants
-    text = re.sub(r"[‐-–—]", "-", text)
 
-    # Normalize whitespace
-    text = re.sub(r"[ \t]+", " ", text)
+def sub_rule(name: str, pattern: str, repl: str, guard: tuple[str, ...] = ()) -> Rule:
+    return Rule(name, pattern, repl, guard)
 
-    if replaced:
-        logger.debug(f"[fix_pdf_symbols] Fraction fixes applied: {replaced}")
 
-    return text
+def char_rule(name: str, mapping: dict[str, str]) -> Rule:
+    """
+    Replace single characters per mapping in one pass. A character-class regex is used rather
+    than str.translate: with non-ASCII, multi-character replacements translate() does a dict
+    lookup for every character of the text, while the regex only calls back on matches.
+    """
+    pattern = "[" + "".join(re.escape(c) for c in mapping) + "]"
+    return Rule(name, pattern, lambda m: mapping[m.group()], spec=f"{name}:{sorted(mapping.items())}")
+
+
+class TextPipeline:
+    """Ordered rules applied to a text, with an optional strip() at the end."""
+
+    def __init__(self, name: str, rules: list[Rule], strip: bool = True, version: int = 1):
+        self.name = name
+        self.rules = rules
+        self.strip = strip
+        spec = "\n".join([f"{name}:{version}:{strip}"] + [rule.spec for rule in rules])
+        # Changes whenever a rule is added, removed, reordered or edited; keys cached output
+        self.fingerprint = hashlib.sha256(spec.encode("utf-8")).hexdigest()[:12]
+
+    def run(self, text: str, timings: dict[str, float] | None = None) -> str:
+        """Apply all rules. With a timings dict, add each rule's seconds to timings[rule name]."""
+        if timings is None:
+            for rule in self.rules:
+                text = rule.apply(text)
+        else:
+            for rule in self.rules:
+                start = time.perf_counter()
+                text = rule.apply(text)
+                timings[rule.name] = timings.get(rule.name, 0.0) + time.perf_counter() - start
+        return text.strip() if self.strip else text
+
+    __call__ = run
+
+
+# Merge patterns like '1 1/4"' → '1¼"'
+_SPLIT_FRACTIONS = {1: '1¼"', 2: '1½"', 3: '¾"'}
+SPLIT_FRACTIONS_RULE = Rule(
+    "split_fractions", r'(?:1(?<!\w1)\s+1/(4)|1(?<!\w1)\s+1/(2)|3(?<!\w3)\s+(4))"', lambda m: _SPLIT_FRACTIONS[m.lastindex],
+    guard=('"',), spec=f"split_fractions:{sorted(_SPLIT_FRACTIONS.items())}",
+)
+# Same result as r"[ \t]+" -> " ", without rewriting every single space
+SPACES_RULE = sub_rule("spaces", r" [ \t]+|\t[ \t]*", " ")
+
+PDF_SYMBOLS = TextPipeline("pdf_symbols", [char_rule("symbols", {**FRACTION_MAP, **DASH_MAP}), SPACES_RULE], strip=False)
+SPLIT_TOKENS = TextPipeline("split_tokens", [SPLIT_FRACTIONS_RULE], strip=False)
+
+# fix_pdf_symbols + merge_split_tokens + list/paragraph cleanup, in the order preprocess_text() has always applied them
+PREPROCESS = TextPipeline("preprocess", [
+    # Symbol fixes and bullet normalization share one pass; "·" is treated as a bullet
+    char_rule("symbols", {**FRACTION_MAP, **DASH_MAP, "•": "\n• ", "·": "\n• "}),
+    SPLIT_FRACTIONS_RULE,
+    # Remove weird hyphenations split across lines (e.g., "Flange-\nkits" → "Flangekits")
+    sub_rule("hyphenation", r"(\w)-\n(\w)", r"\1\2", guard=("-\n",)),
+    # Add line breaks between bullets if they're stuck together
+    sub_rule("bullet_spacing", r"•\s*(?=[^•])", "• ", guard=("•",)),
+    sub_rule("bullet_break", r"•(?<=\S•)", "\n•", guard=("•",)),
+    # Collapse excessive newlines but keep list separation
+    sub_rule("blank_lines", r"\n{3,}", "\n\n", guard=("\n\n\n",)),
+    # Join continuation lines that don't start with a bullet, number, or capital (for paragraph flow)
+    sub_rule("join_lines", r"\n(?![\s•\dA-Z-])", " ", guard=("\n",)),
+    # Preserve list formatting (ensure bullets start on new lines)
+    sub_rule("bullet_lines", r"([^\n])(\s*•)", r"\1\n\2", guard=("•",)),
+    SPACES_RULE,
+])
+
+
+def fix_pdf_symbols(text: str) -> str:
+    """
+    Normalize special fraction glyphs and other non-ASCII characters
+    that Textract often misses or mis-recognizes.
+    This works for all PDFs, not just specific ones.
+    """
+    if not text:
+        return text
+    return PDF_SYMBOLS.run(text)
 
 
 def merge_split_tokens(text: str) -> str:
@@ -51,52 +135,16 @@ def merge_split_tokens(text: str) -> str:
     Merge split tokens like '1' + '¼"' into '1¼"' when Textract separates them.
     This is heuristic-based and works best after symbol normalization.
     """
-    # Merge patterns like '1 1/4"' → '1¼"'
-    text = re.sub(r"\b1\s+1/4\"", "1¼\"", text)
-    text = re.sub(r"\b1\s+1/2\"", "1½\"", text)
-    text = re.sub(r"\b3\s+4\"", "¾\"", text)
+    return SPLIT_TOKENS.run(text)
 
-    return text
 
-
-def preprocess_text(text: str) -> str:
+def preprocess_text(text: str, timings: dict[str, float] | None = None) -> str:
     """
     Clean and normalize text before chunking to preserve lists, bullets, and structure.
     Works generically for any document with bullet-like structures.
+    Pass a dict as timings to collect seconds per rule.
     """
-    # Repair malformed PDF text first
-    text = fix_pdf_symbols(text)
-    text = merge_split_tokens(text)
-    # text = recover_fraction_lines(text)
-
-    # Normalize bullets and dashes
-    text = (
-        text.replace("•", "\n• ")
-        .replace("·", "\n• ")
-        .replace("–", "-")
-        .replace("—", "-")
-    )
-
-    # Remove weird hyphenations split across lines (e.g., "Flange-\nkits" → "Flange kits")
-    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
-
-    # Add line breaks between bullets if they’re stuck together
-    text = re.sub(r"•\s*(?=[^•])", r"• ", text)
-    text = re.sub(r"(?<=\S)•", r"\n•", text)
-
-    # Collapse excessive newlines but keep list separation
-    text = re.sub(r"\n{3,}", "\n\n", text)
-
-    # Join continuation lines that don't start with a bullet, number, or capital (for paragraph flow)
-    text = re.sub(r"\n(?![\s•\dA-Z-])", " ", text)
-
-    # Preserve list formatting (ensure bullets start on new lines)
-    text = re.sub(r"([^\n])(\s*•)", r"\1\n\2", text)
-
-    # Normalize whitespace
-    text = re.sub(r"[ \t]+", " ", text).strip()
-
-    return text
+    return PREPROCESS.run(text, timings)
 
 
 def recover_fraction_lines(text: str) -> str:
@@ -104,8 +152,4 @@ def recover_fraction_lines(text: str) -> str:
     Heuristically recover fraction patterns that Textract may miss or split.
     """
     # Recover common patterns missed by Textract
-    text = re.sub(r"\b1\s+1/4\"", "1¼\"", text)
-    text = re.sub(r"\b1\s+1/2\"", "1½\"", text)
-    text = re.sub(r"\b3\s+4\"", "¾\"", text)
-    return text
-
+    return SPLIT_TOKENS.run(text)
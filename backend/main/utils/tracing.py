@@ -0,0 +1,117 @@
+"""Request-scoped tracing with OpenTelemetry, exported to a JSON-lines file or a bounded in-memory sink."""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor, SpanExporter, SpanExportResult
+)
+from main.config import Config
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = "X-Trace-Id"
+
+
+class MemorySpanExporter(SpanExporter):
+    """Keeps the most recent finished spans (as OTel JSON dicts) for lookup by trace ID."""
+
+    def __init__(self, max_spans: int):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        with self._lock:
+            self._spans.extend(json.loads(span.to_json(indent=None)) for span in spans)
+        return SpanExportResult.SUCCESS
+
+    def spans(self, trace_id: str | None = None) -> list[dict]:
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is None:
+            return spans
+        return [s for s in spans if s["context"]["trace_id"] == f"0x{trace_id}"]
+
+    def shutdown(self):
+        pass
+
+
+_tracer = None
+_memory_exporter = None
+_init_lock = threading.Lock()
+
+
+def _create_tracer():
+    global _memory_exporter
+    provider = TracerProvider(resource=Resource.create({"service.name": "rag-ai-agent"}))
+    exporter = Config.TRACING_EXPORTER
+
+    if exporter == "memory":
+        _memory_exporter = MemorySpanExporter(Config.TRACE_MEMORY_SPANS)
+        provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+    elif exporter == "file":
+        os.makedirs(os.path.dirname(Config.TRACE_FILE) or ".", exist_ok=True)
+        out = open(Config.TRACE_FILE, "a", encoding="utf-8")
+        provider.add_span_processor(BatchSpanProcessor(
+            ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+        ))
+    elif exporter != "none":
+        raise ValueError(f"Unsupported tracing exporter: {exporter}")
+
+    logger.debug("Tracing initialized with '%s' exporter", exporter)
+    # Trace IDs are generated even with the "none" exporter so they can still be returned to clients
+    return provider.get_tracer("rag-ai-agent")
+
+
+def get_tracer():
+    global _tracer
+    if _tracer is None:
+        with _init_lock:
+            if _tracer is None:
+                _tracer = _create_tracer()
+    return _tracer
+
+
+@contextmanager
+def span(name: str, **attributes):
+    with get_tracer().start_as_current_span(name, attributes=attributes or None) as current:
+        yield current
+
+
+def traced(name: str):
+    """Decorator that runs the function inside a span nested under the current one."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_attribute(key: str, value):
+    trace.get_current_span().set_attribute(key, value)
+
+
+def current_trace_id() -> str | None:
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+
+def in_current_context(func):
+    """Bind func to the caller's context so spans started in a worker thread nest under the caller's span."""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+def finished_spans(trace_id: str | None = None) -> list[dict] | None:
+    """Spans kept by the in-memory exporter, or None when another exporter is configured."""
+    get_tracer()
+    return _memory_exporter.spans(trace_id) if _memory_exporter is not None else None
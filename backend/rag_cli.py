@@ -2,9 +2,20 @@
 
 import logging
 import argparse
+import json
+import os
+import time
+_IMPORT_START = time.perf_counter()
 from main.config import Config
 from main.logger_config import setup_logging, log_duration
 from main.pipeline_core import RAGPipeline, generate_response, get_reranker, get_llm
+from main.retrieval.vector_store.index_collections import DEFAULT_COLLECTION, parse_collections
+from main.retrieval.vector_store.index_versions import rechunk_index
+from main.utils import profiling
+from main.utils.plugin_registry import import_report
+from main.utils.runtime_stats import collect_stats
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 
 MAX_HISTORY_LENGTH = 10
@@ -50,25 +61,69 @@ def chat_loop(rag_pipeline: RAGPipeline, llm, history, reranker):
         logger.info("\nExiting on user interrupt")
 
 
+def log_import_report():
+    report = import_report()
+    logger.info("Startup imports took %.3f sec (providers loaded on demand: %.3f sec)", _IMPORT_SECONDS, report["total_sec"])
+    for provider, seconds in report["providers"].items():
+        logger.info("  %-40s %.3f sec", provider, seconds)
+
+
 def main():
     """Main"""
 
+    parser = argparse.ArgumentParser(description="Run RAG pipeline on given PDF documents")
+    parser.add_argument("--force", action="store_true", help="Force reprocessing even if FAISS index exists")
+    parser.add_argument("--import-report", action="store_true", help="Log module import times at startup")
+    parser.add_argument(
+        "--profile", nargs="?", metavar="DIR",
+        const=os.path.join(Config.PROFILE_DIR, time.strftime("build-%Y%m%d-%H%M%S")),
+        help="Profile the index build and write per-stage cProfile reports to DIR"
+    )
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION, help="Collection to build and chat with (see COLLECTIONS)")
+    parser.add_argument("--stats", action="store_true", help="Load the index, print resource statistics as JSON and exit")
+    parser.add_argument(
+        "--rechunk", action="store_true",
+        help="Re-chunk and re-embed the indexed files from cached extractions into a new index version and exit"
+    )
+    parser.add_argument("--chunk-size", type=int, help=f"With --rechunk (default: {Config.CHUNK_SIZE})")
+    parser.add_argument("--chunk-overlap", type=int, help=f"With --rechunk (default: {Config.CHUNK_OVERLAP})")
+    parser.add_argument("--chunker", choices=Config.OPTIONS["chunker"], help=f"With --rechunk (default: {Config.CHUNKER})")
+    parser.add_argument("--version-name", help="With --rechunk (default: <chunker>-cs<size>-ov<overlap>)")
+    args = parser.parse_args()
+
+    collections = parse_collections(Config.COLLECTIONS)
+    if args.collection not in collections:
+        parser.error(f"Unknown collection {args.collection!r}; configured: {', '.join(collections)}")
+    collection = collections[args.collection]
+
+    if args.stats:
+        rag_pipeline = RAGPipeline(force_index=args.force, cache_mode=Config.CACHE_MODE, collection=collection)
+        print(json.dumps(collect_stats(rag_pipeline.index, collection.index_path, manifest_path=collection.manifest_path), indent=2))
+        return
+
+    if args.rechunk:
+        summary = rechunk_index(args.chunk_size, args.chunk_overlap, args.chunker, args.version_name)
+        print(json.dumps(summary, indent=2))
+        return
+
     llm = get_llm(Config.LLM_PROVIDER)
     if not llm.is_running():
         logger.error("%s is not running or accessible.", Config.LLM_PROVIDER.capitalize())
         return
-    
-    parser = argparse.ArgumentParser(description="Run RAG pipeline on given PDF documents")
-    parser.add_argument("--force", action="store_true", help="Force reprocessing even if FAISS index exists")
-    args = parser.parse_args()
-    
-    rag_pipeline = RAGPipeline(force_index=args.force, cache_mode=Config.CACHE_MODE)
+
+    if args.profile:
+        with profiling.build_profile(args.profile):
+            rag_pipeline = RAGPipeline(force_index=args.force, cache_mode=Config.CACHE_MODE, collection=collection)
+    else:
+        rag_pipeline = RAGPipeline(force_index=args.force, cache_mode=Config.CACHE_MODE, collection=collection)
     if not rag_pipeline.refresh_index():
         logger.warning("No PDFs found to build the index.")
         return
         
     history = []
     reranker = get_reranker()
+    if args.import_report:
+        log_import_report()
     chat_loop(rag_pipeline, llm, history, reranker)
         
 
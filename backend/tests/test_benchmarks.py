@@ -0,0 +1,59 @@
+"""Test suite for the benchmark corpus generator and runner."""
+import json
+from main.extractor.pdf_extractor_pymupdf import PyMuPDFExtractor
+from benchmarks.compare import compare
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.run import run_benchmark
+
+
+def test_corpus_is_reproducible(tmp_path):
+    """Test that the same seed yields the same text and that different seeds differ."""
+    extractor = PyMuPDFExtractor()
+    first = generate_corpus(str(tmp_path / "a"), num_docs=2, pages_per_doc=2, seed=7)
+    second = generate_corpus(str(tmp_path / "b"), num_docs=2, pages_per_doc=2, seed=7)
+    other = generate_corpus(str(tmp_path / "c"), num_docs=2, pages_per_doc=2, seed=8)
+
+    texts = [extractor.extract_text(p) for p in first]
+    assert len(texts) == 2 and all("Specifications" in t for t in texts)
+    assert texts == [extractor.extract_text(p) for p in second]
+    assert texts != [extractor.extract_text(p) for p in other]
+    assert generate_queries(str(tmp_path / "a"), 5, seed=7) == generate_queries(str(tmp_path / "b"), 5, seed=7)
+
+
+def test_run_benchmark_reports_stages_and_percentiles(tmp_path):
+    results = run_benchmark(num_docs=2, pages_per_doc=1, num_queries=5, seed=0, workdir=str(tmp_path))
+
+    stages = results["ingest"]["stages"]
+    assert set(stages) == {"extract", "preprocess", "chunk", "embed", "index_add", "index_save"}
+    assert results["ingest"]["chunks"] > 0
+    assert results["query"]["latency"]["count"] == 5
+    assert results["query"]["latency"]["p50_ms"] <= results["query"]["latency"]["p99_ms"]
+    assert results["query"]["avg_prompt_chars"] > 0  # retrieval produced context for the stub LLM
+    json.dumps(results)
+
+    rows = {label: change for label, _, _, change in compare(results, results)}
+    assert rows["Query p50 (ms)"] == 0.0
+
+
+def test_evaluation_scores_exact_search_as_perfect(tmp_path):
+    """Test that the flat configuration matches ground truth and failed configs are reported, not raised."""
+    from benchmarks.evaluate import pick_fastest, run_evaluation
+    from benchmarks.ingest import chunk_files
+
+    files = generate_corpus(str(tmp_path), num_docs=2, pages_per_doc=2, seed=0)
+    chunks = chunk_files(files)
+    queries = generate_queries(str(tmp_path), 10, seed=0)
+    configs = [
+        {"name": "flat"},
+        {"name": "hnsw", "index_factory": "HNSW16", "search_params": "efSearch=32"},
+        {"name": "too-small-for-pq", "index_factory": "IVF1,PQ8"},
+    ]
+
+    results = run_evaluation(chunks, queries, configs, k=5)
+    flat, hnsw, failed = results
+
+    assert flat["recall@5"] == 1.0 and flat["mrr"] == 1.0
+    assert flat["search_latency"]["count"] == 10 and flat["memory_bytes"] > 0
+    assert "recall@5" in hnsw
+    assert "error" in failed
+    assert pick_fastest(results, min_recall=0.99, k=5)["name"] in ("flat", "hnsw")
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from main import collection_manager as cm
+from main.retrieval.retrievers import faiss_retriever
+from main.retrieval.vector_store.faiss_indexer import FaissStore, save_faiss_index
+from main.retrieval.vector_store.index_collections import DEFAULT_COLLECTION, IndexCollection, parse_collections
+from main.utils.pdf_helper import list_pdf_files
+
+
+class FakePipeline:
+    def __init__(self, lazy=True, collection=None, intent_detector=None):
+        self.collection = collection
+        self._intent_detector = intent_detector
+        self.initialized = False
+        self.index = object()
+
+    def initialize(self):
+        self.initialized = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(cm, "RAGPipeline", FakePipeline)
+    monkeypatch.setattr(cm, "create_intent_detector", lambda: "detector")
+    monkeypatch.setattr(cm, "index_memory_bytes", lambda store: 100)
+    collections = parse_collections("a=line-a/,b=line-b/,c=line-c/")
+    return cm.CollectionManager(collections, default_pipeline=FakePipeline(), memory_budget_bytes=250)
+
+
+def test_parse_collections():
+    collections = parse_collections(" pumps = pumps/ , valves=valves/")
+    assert list(collections) == [DEFAULT_COLLECTION, "pumps", "valves"]
+    assert collections["pumps"].prefix == "pumps/"
+    assert collections["pumps"].index_path != collections[DEFAULT_COLLECTION].index_path
+    assert collections["pumps"].manifest_path != collections["valves"].manifest_path
+
+    for spec in ("nope", "default=x/", "../x=x/"):
+        with pytest.raises(ValueError):
+            parse_collections(spec)
+
+
+def test_manager_evicts_least_recently_used(manager):
+    manager.get()
+    a = manager.get("a")
+    assert a.collection.name == "a" and a._intent_detector == "detector"
+    assert manager.get("a") is a
+
+    manager.get("b")  # default + a + b = 300 > 250: a is least recently used
+    status = {c["name"]: c for c in manager.status()["collections"]}
+    assert [name for name, c in status.items() if c["resident"]] == [DEFAULT_COLLECTION, "b"]
+    assert manager.evictions == 1
+
+    manager.get("a")  # reloaded; b is evicted, the default collection is never
+    assert manager.peek("b") is None
+    assert manager.peek(DEFAULT_COLLECTION).initialized
+
+    with pytest.raises(KeyError):
+        manager.get("missing")
+
+
+def test_list_pdf_files_with_local_prefix(monkeypatch, tmp_path):
+    (tmp_path / "line-a").mkdir()
+    (tmp_path / "line-a" / "one.pdf").write_bytes(b"%PDF")
+    (tmp_path / "top.pdf").write_bytes(b"%PDF")
+    monkeypatch.setattr("main.config.Config.USE_S3", False)
+    monkeypatch.setattr("main.config.Config.SAMPLE_DIR", str(tmp_path))
+    monkeypatch.setattr("main.config.Config.S3_PREFIX", "")
+
+    assert list_pdf_files() == ["top.pdf"]
+    assert list_pdf_files("line-a") == ["line-a/one.pdf"]
+
+
+def test_collection_retriever_loads_saved_index_without_building(monkeypatch, tmp_path):
+    store = FaissStore(8)
+    store.add(np.random.default_rng(0).random((5, 8)).astype("float32"), [f"chunk {i}" for i in range(5)])
+    collection = IndexCollection("a", "line-a/", str(tmp_path / "a.index"), str(tmp_path / "a.json"))
+    save_faiss_index(store, collection.index_path)
+
+    def build(**kwargs):
+        raise AssertionError("a saved collection index must not be rebuilt on load")
+
+    monkeypatch.setattr(faiss_retriever.index_builder, "build_global_index", build)
+    retriever = faiss_retriever.FAISSRetriever(collection=collection)
+    assert retriever.index.index.ntotal == 5
@@ -0,0 +1,55 @@
+"""Test suite for extractive context compression."""
+import numpy as np
+from main.llm.context_compressor import split_units, compress_sections
+
+
+class KeywordModel:
+    """Deterministic stand-in for the embedding model: one dimension per keyword."""
+    keywords = ["flow", "accessories", "warranty", "motor"]
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True):
+        vectors = np.array([[t.lower().count(k) for k in self.keywords] + [0.1] for t in texts], dtype="float32")
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_split_units_keeps_lists_with_heading():
+    section = (
+        "The E9.2 is a compact circulator. It is used in residential systems.\n"
+        "ACCESSORIES\n"
+        "• Flange kit\n"
+        "• Isolation valve\n"
+        "Warranty terms apply."
+    )
+    units = split_units(section)
+    assert units == [
+        "The E9.2 is a compact circulator.",
+        "It is used in residential systems.",
+        "ACCESSORIES\n• Flange kit\n• Isolation valve",
+        "Warranty terms apply.",
+    ]
+
+
+def test_split_units_treats_numeric_rows_as_table():
+    units = split_units("Max flow 10 gpm 38 l/min\nMax head 12 ft 3.7 m")
+    assert units == ["Max flow 10 gpm 38 l/min\nMax head 12 ft 3.7 m"]
+
+
+def test_compress_sections_keeps_most_relevant_units():
+    """Test that only the best-matching units survive, in original order, and empty sections drop."""
+    sections = [
+        "The motor is permanent magnet. Warranty is three years. The flow is 10 gpm.",
+        "Warranty covers parts. Warranty excludes labor.",
+    ]
+    compressed = compress_sections("What is the flow?", sections, model=KeywordModel(), max_units=1, min_score=0.5)
+    assert compressed == ["The flow is 10 gpm."]
+
+
+def test_compress_sections_keeps_list_block_intact():
+    sections = ["Intro sentence. Another sentence.\nAccessories list\n• Flow meter\n• Valve\n• Gasket"]
+    compressed = compress_sections("Which accessories?", sections, model=KeywordModel(), max_units=1, min_score=0.0)
+    assert compressed == ["Accessories list\n• Flow meter\n• Valve\n• Gasket"]
+
+
+def test_compress_sections_small_input_unchanged():
+    sections = ["Only one sentence."]
+    assert compress_sections("anything", sections, model=KeywordModel(), max_units=5) == sections
@@ -0,0 +1,74 @@
+"""Test suite for token-budgeted prompt packing."""
+from main.llm.context_packer import pack_context
+from main.llm.prompt_builder import build_packed_prompt
+from main.llm.token_counter import whitespace_token_count, approx_token_count, get_token_counter
+from main.retrieval.rerankers.merge_utils import merge_adjacent_chunks
+from main.session.session_store import SUMMARY_QUESTION
+
+
+def test_sections_filled_in_relevance_order_within_budget():
+    """Test that sections are kept in order until the budget is spent, skipping ones that do not fit."""
+    sections = ["a " * 40, "b " * 80, "c " * 30]
+    kept, _, report = pack_context(sections, [], overhead_tokens=10, budget=100, count_tokens=whitespace_token_count)
+
+    assert kept == [sections[0], sections[2]]
+    assert report["context_tokens"] == 70
+    assert report["dropped_sections"] == 1
+    assert report["used_tokens"] <= 100
+
+
+def test_history_trimmed_oldest_first():
+    history = [("old question " * 5, "old answer " * 5), ("new question", "new answer")]
+    _, kept_history, report = pack_context(
+        [], history, overhead_tokens=0, budget=100, history_budget=10, count_tokens=whitespace_token_count
+    )
+
+    assert kept_history == [history[1]]
+    assert report["dropped_history_turns"] == 1
+    assert report["dropped_tokens"] > 0
+
+
+def test_session_summary_kept_when_trimming_history():
+    """Test that a leading summary turn is kept (newest lines first) while older turns are dropped."""
+    summary = "\n".join(f"- Asked: q{i} | Answer: a{i}" for i in range(10))
+    history = [(SUMMARY_QUESTION, summary), ("old " * 20, "old " * 20), ("new question", "new answer")]
+    _, kept_history, report = pack_context(
+        [], history, overhead_tokens=0, budget=100, history_budget=40, count_tokens=whitespace_token_count
+    )
+
+    assert kept_history[0][0] == SUMMARY_QUESTION
+    assert "q9" in kept_history[0][1] and "q0" not in kept_history[0][1]
+    assert kept_history[1:] == [history[2]]
+    assert report["history_tokens"] <= 40
+
+
+def test_oversized_top_section_is_truncated():
+    """Test that a single section larger than the budget is truncated rather than dropped."""
+    kept, _, report = pack_context(["word " * 500], [], overhead_tokens=0, budget=50, count_tokens=whitespace_token_count)
+
+    assert len(kept) == 1
+    assert whitespace_token_count(kept[0]) <= 50
+    assert report["dropped_sections"] == 0
+
+
+def test_build_packed_prompt_respects_budget():
+    sections = [f"Section {i}: " + "detail " * 200 for i in range(10)]
+    prompt, report = build_packed_prompt(sections, "What is E9.2?", [], budget=600, count_tokens=approx_token_count)
+
+    assert approx_token_count(prompt) <= 600 + 5
+    assert "Section 0" in prompt
+    assert "Question: What is E9.2?" in prompt
+    assert report["dropped_sections"] > 0
+
+
+def test_get_token_counter_by_name():
+    assert get_token_counter("whitespace")("one two three") == 3
+    assert get_token_counter("approx")("") == 0
+
+
+def test_merge_adjacent_chunks_returns_most_relevant_first():
+    chunks = [f"chunk{i}" for i in range(10)]
+    top_results = [("chunk8", 0.9), ("chunk1", 0.5)]
+    merged = merge_adjacent_chunks(top_results, chunks, window_size=1, proximity_merge=False)
+
+    assert merged == ["chunk7\nchunk8\nchunk9", "chunk0\nchunk1\nchunk2"]
@@ -0,0 +1,103 @@
+import shutil
+import threading
+import time
+import pytest
+from main.pipeline import distributed_ingest
+from main.pipeline.work_queue import WorkQueue
+from main.retrieval.vector_store.faiss_indexer import load_faiss_index
+from main.retrieval.vector_store.index_collections import IndexCollection
+from main.utils.manifest_helper import load_index_manifest
+
+from tests.test_constants import SAMPLE_PDF_PATH
+
+
+def test_work_queue_leases_and_retries(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    queue.create_job("job", {})
+    assert queue.enqueue("job", ["a.pdf", "b.pdf"]) == 2
+    assert queue.enqueue("job", ["a.pdf"]) == 0
+    with pytest.raises(ValueError):
+        queue.create_job("job", {})
+
+    a = queue.lease("job", "w1", lease_seconds=60)
+    b = queue.lease("job", "w2", lease_seconds=60)
+    assert (a.s3_key, b.s3_key) == ("a.pdf", "b.pdf")
+    assert queue.lease("job", "w3", lease_seconds=60) is None
+
+    assert not queue.complete(a, "w2")  # only the lease owner can complete
+    assert queue.complete(a, "w1", '{"ok": true}')
+    assert queue.fail(b, "w2", "boom")
+    assert queue.counts("job") == {"pending": 1, "leased": 0, "done": 1, "failed": 0}
+
+    # Second and last attempt: an expired lease is taken over, then failure is final
+    b = queue.lease("job", "w2", lease_seconds=0)
+    time.sleep(0.01)
+    b_again = queue.lease("job", "w3", lease_seconds=60)
+    assert b_again is None  # expired on its last attempt -> failed, not leased again
+    assert queue.counts("job") == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    assert not queue.renew(b, "w2", 60)
+
+
+def test_workers_shard_and_merge(monkeypatch, tmp_path):
+    samples = tmp_path / "samples" / "line"
+    samples.mkdir(parents=True)
+    for name in ("one.pdf", "two.pdf", "three.pdf"):
+        shutil.copy(SAMPLE_PDF_PATH, samples / name)
+    monkeypatch.setattr("main.config.Config.USE_S3", False)
+    monkeypatch.setattr("main.config.Config.SAMPLE_DIR", str(tmp_path / "samples"))
+    monkeypatch.setattr("main.config.Config.SHARD_DIR", str(tmp_path / "shards"))
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", False)
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", False)
+
+    collection = IndexCollection("line", "line", str(tmp_path / "line.index"), str(tmp_path / "line.json"))
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    job = distributed_ingest.enqueue_build(queue, "job", collection)["job"]
+
+    results = []
+    workers = [
+        threading.Thread(target=lambda owner=owner: results.append(distributed_ingest.run_worker(queue, job, owner=owner, poll_seconds=0.05)))
+        for owner in ("w1", "w2")
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sum(r["done"] for r in results) == 3
+    summary = distributed_ingest.merge_job(queue, job)
+    assert summary["documents"] == 3
+
+    store = load_faiss_index(collection.index_path)
+    assert store.index.ntotal == summary["chunks"] > 0
+    manifest = load_index_manifest(collection.manifest_path)
+    assert sorted(manifest) == ["line/one.pdf", "line/three.pdf", "line/two.pdf"]
+
+    # A second job over unchanged files reuses the shards
+    distributed_ingest.enqueue_build(queue, "again", collection)
+    assert distributed_ingest.run_worker(queue, "again", owner="w3")["reused"] == 3
+
+
+def test_processing_failure_is_retried_not_recorded_empty(monkeypatch, tmp_path):
+    samples = tmp_path / "samples" / "line"
+    samples.mkdir(parents=True)
+    shutil.copy(SAMPLE_PDF_PATH, samples / "one.pdf")
+    monkeypatch.setattr("main.config.Config.USE_S3", False)
+    monkeypatch.setattr("main.config.Config.SAMPLE_DIR", str(tmp_path / "samples"))
+    monkeypatch.setattr("main.config.Config.SHARD_DIR", str(tmp_path / "shards"))
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", False)
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", False)
+
+    class BrokenExtractor:
+        def extract_text(self, source):
+            raise RuntimeError("Textract throttled")
+
+    monkeypatch.setattr(distributed_ingest, "create_pdf_extractor", BrokenExtractor)
+    collection = IndexCollection("line", "line", str(tmp_path / "line.index"), str(tmp_path / "line.json"))
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    job = distributed_ingest.enqueue_build(queue, "job", collection)["job"]
+
+    stats = distributed_ingest.run_worker(queue, job, owner="w1", poll_seconds=0.01)
+    assert stats["done"] == 0 and stats["failed"] == 2  # retried up to max_attempts
+    assert queue.counts(job)["failed"] == 1
+    with pytest.raises(RuntimeError):
+        distributed_ingest.merge_job(queue, job)
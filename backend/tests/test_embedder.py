@@ -40,3 +40,22 @@ def test_embed_text_chunks_varied_lengths(text):
     assert len(embeddings) == 1
     assert isinstance(embeddings[0], list)
     assert all(isinstance(dim, float) for dim in embeddings[0])
+
+
+def test_load_model_rejects_unknown_backend():
+    """Test that an unsupported backend name fails fast."""
+    with pytest.raises(ValueError, match="Unsupported embedding backend"):
+        embedder.load_model(backend="tensorrt")
+
+
+def test_embedding_parity_identical_models():
+    """Test that the parity report shows no drift when both sides are the same model."""
+    from main.embedder.parity import embedding_parity
+
+    model = embedder.get_model()
+    texts = ["Pump flow rate is 10 gpm.", "Maximum working pressure 175 psi.", "Install the valve upstream."]
+    report = embedding_parity(model, model, texts)
+
+    assert report["samples"] == 3
+    assert report["min_cosine"] == pytest.approx(1.0, abs=1e-5)
+    assert report["neighbour_agreement"] == 1.0
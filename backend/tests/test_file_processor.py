@@ -1,3 +1,4 @@
+import os
 import pytest
 from main.pipeline.file_processor import process_file
 from main.extractor.pdf_extractor_pymupdf import PyMuPDFExtractor
@@ -46,3 +47,74 @@ def test_process_file_exception(monkeypatch):
     chunks, embeddings = process_file("irrelevant.pdf", FailingExtractor())
     assert chunks == []
     assert embeddings == []
+
+
+def test_process_file_with_layout_chunker(monkeypatch):
+    monkeypatch.setattr("main.config.Config.CHUNKER", "layout")
+    chunks, embeddings = process_file(SAMPLE_PDF_PATH, PyMuPDFExtractor())
+
+    assert chunks and len(chunks) == len(embeddings)
+    assert any("accessories" in chunk.lower() for chunk in chunks)
+
+
+def test_process_file_reuses_preprocessed_text(monkeypatch, tmp_path):
+    from main.utils.text_cache import TextCache
+    from main.utils.text_preprocessor import PREPROCESS
+
+    class CountingExtractor(PyMuPDFExtractor):
+        calls = 0
+
+        def extract_text(self, source):
+            CountingExtractor.calls += 1
+            return super().extract_text(source)
+
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", True)
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", False)
+    monkeypatch.setattr("main.pipeline.file_processor._preprocessed", TextCache(str(tmp_path)))
+
+    first, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    second, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    assert first == second
+    assert CountingExtractor.calls == 1
+
+    # A changed rule set misses the cache
+    monkeypatch.setattr(PREPROCESS, "fingerprint", "changed")
+    process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    assert CountingExtractor.calls == 2
+
+
+def test_process_file_reuses_extracted_text(monkeypatch, tmp_path):
+    from main.utils.text_cache import TextCache
+
+    class CountingExtractor(PyMuPDFExtractor):
+        calls = 0
+
+        def extract_text(self, source):
+            CountingExtractor.calls += 1
+            return super().extract_text(source)
+
+        def extract_layout(self, source):
+            CountingExtractor.calls += 1
+            return super().extract_layout(source)
+
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", False)
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", True)
+    monkeypatch.setattr("main.pipeline.file_processor._extracted", TextCache(str(tmp_path), compress=True))
+
+    first, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    second, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    assert first == second
+    assert CountingExtractor.calls == 1
+    assert all(name.endswith(".txt.gz") for name in os.listdir(tmp_path))
+
+    # Layout pages are cached separately; the cached (compacted) pages chunk identically
+    monkeypatch.setattr("main.config.Config.CHUNKER", "layout")
+    layout_first, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    layout_second, _ = process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    assert layout_first == layout_second
+    assert CountingExtractor.calls == 2
+
+    # A new extractor version misses the cache
+    monkeypatch.setattr(CountingExtractor, "version", "2")
+    process_file(SAMPLE_PDF_PATH, CountingExtractor())
+    assert CountingExtractor.calls == 3
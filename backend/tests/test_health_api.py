@@ -0,0 +1,43 @@
+"""Test suite for the readiness endpoint and startup warmup."""
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from api import app as app_module
+from api.routes import health
+from main import pipeline_core
+
+
+def make_rag(monkeypatch, get_retriever):
+    monkeypatch.setattr(pipeline_core, "get_retriever", get_retriever)
+    monkeypatch.setattr(pipeline_core, "create_intent_detector", MagicMock())
+    monkeypatch.setattr(pipeline_core.faiss_indexer, "query_faiss_index", MagicMock())
+    monkeypatch.setattr(pipeline_core.embedder, "get_model", MagicMock())
+    return pipeline_core.RAGPipeline(lazy=True)
+
+
+def test_ready_only_after_warmup_completes(monkeypatch):
+    """Test that /ready stays 503 while the pipeline is merely initialized, and turns 200 once warm."""
+    rag = make_rag(monkeypatch, MagicMock(return_value=MagicMock(spec=["retrieve", "index"])))
+    monkeypatch.setattr(health, "rag", rag)
+    client = TestClient(app_module.app)
+
+    assert client.get("/ready").status_code == 503
+    rag.initialize()
+    assert client.get("/ready").status_code == 503
+
+    rag.warmup()
+    response = client.get("/ready")
+    assert response.status_code == 200 and response.json()["ready"]
+
+
+def test_startup_warmup_retries_after_failure(monkeypatch):
+    """Test that a failed startup warmup is retried with backoff until the pipeline is ready."""
+    retriever = MagicMock(spec=["retrieve", "index"])
+    rag = make_rag(monkeypatch, MagicMock(side_effect=[ConnectionError("s3 down"), ConnectionError("s3 down"), retriever]))
+    monkeypatch.setattr(app_module.query, "rag", rag)
+    delays = []
+    monkeypatch.setattr(app_module.time, "sleep", delays.append)
+
+    app_module._warmup()
+
+    assert rag.ready
+    assert delays == [1.0, 2.0]
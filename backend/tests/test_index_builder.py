@@ -1,29 +1,39 @@
+import shutil
 import pytest
 from unittest.mock import patch, MagicMock
+from main.chunker import layout_chunker
+from main.pipeline.file_processor import process_file
+from main.retrieval.vector_store import index_builder
+from main.retrieval.vector_store.build_journal import journal_path
 from main.retrieval.vector_store.index_builder import build_global_index
+from main.retrieval.vector_store.shards import shard_key
+from main.utils.manifest_helper import load_index_manifest
+from main.utils.text_preprocessor import PREPROCESS
+
+from tests.test_constants import SAMPLE_PDF_PATH
 
 
 @pytest.mark.parametrize("cache_mode", ["none", "ephemeral", "full"])
-def test_build_global_index_runs(cache_mode):
+def test_build_global_index_runs(cache_mode, monkeypatch, tmp_path):
     """Test that build_global_index executes without error across cache modes."""
+    monkeypatch.setattr("main.config.Config.SHARD_DIR", str(tmp_path / "shards"))
     with patch("main.retrieval.vector_store.index_builder.list_pdf_files", return_value=["doc1.pdf", "doc2.pdf"]), \
         patch("main.retrieval.vector_store.index_builder.download_pdf", return_value="doc1.pdf::ephemeral"), \
         patch("main.retrieval.vector_store.index_builder.download_pdf_stream", return_value=b"%PDF-1.4 fake bytes"), \
         patch("main.retrieval.vector_store.index_builder.hash_file", return_value="abc123"), \
-        patch("main.retrieval.vector_store.index_builder.load_index_manifest", return_value={}), \
+        patch("main.retrieval.vector_store.index_builder.prune_manifest", return_value=({}, [])), \
         patch("main.retrieval.vector_store.index_builder.update_manifest_entry"), \
         patch("main.retrieval.vector_store.index_builder.cleanup_if_ephemeral"), \
         patch("main.retrieval.vector_store.index_builder.create_pdf_extractor") as mock_extractor_factory, \
         patch("main.retrieval.vector_store.index_builder.process_file", return_value=(["chunk1"], [[0.1]*384])), \
         patch("main.retrieval.vector_store.index_builder.faiss_indexer.build_faiss_index") as mock_build, \
         patch("main.retrieval.vector_store.index_builder.faiss_indexer.save_faiss_index"), \
-        patch("main.retrieval.vector_store.index_builder.os.path.getsize", return_value=12345), \
-        patch("main.retrieval.vector_store.index_builder.os.path.exists", return_value=True):
+        patch("main.retrieval.vector_store.index_builder.os.path.getsize", return_value=12345):
 
         mock_extractor_factory.return_value = MagicMock()
         mock_build.return_value = MagicMock()
 
-        index = build_global_index(force=True, cache_mode=cache_mode)
+        index = build_global_index(force=True, cache_mode=cache_mode, index_path=str(tmp_path / "global.index"))
         assert index is not None
 
 
@@ -36,13 +46,149 @@ def test_build_global_index_no_files():
 
 def test_build_global_index_skips_unchanged(monkeypatch):
     """Test that unchanged files are skipped when force=False and no index exists."""
-    manifest = {"doc1.pdf": {"hash": "abc123"}}
-    monkeypatch.setattr("main.retrieval.vector_store.index_builder.list_pdf_files", lambda: ["doc1.pdf"])
+    extractor = MagicMock(provider="pymupdf", version="1")
+    shard = index_builder.expected_shard("abc123", extractor)
+    manifest = {"doc1.pdf": {"hash": "abc123", "shard": shard}}
+    monkeypatch.setattr("main.retrieval.vector_store.index_builder.create_pdf_extractor", lambda: extractor)
+    monkeypatch.setattr("main.retrieval.vector_store.index_builder.list_pdf_files", lambda prefix=None: ["doc1.pdf"])
     monkeypatch.setattr("main.retrieval.vector_store.index_builder.download_pdf", lambda s3_key, cache_mode: "doc1.pdf::ephemeral")
     monkeypatch.setattr("main.retrieval.vector_store.index_builder.hash_file", lambda path: "abc123")
-    monkeypatch.setattr("main.retrieval.vector_store.index_builder.load_index_manifest", lambda: manifest)
+    monkeypatch.setattr("main.retrieval.vector_store.index_builder.prune_manifest", lambda keys, path=None: (manifest, []))
     monkeypatch.setattr("main.retrieval.vector_store.index_builder.cleanup_if_ephemeral", lambda path: None)
-    monkeypatch.setattr("main.retrieval.vector_store.index_builder.os.path.exists", lambda path: False)
+    monkeypatch.setattr("main.retrieval.vector_store.index_builder.os.path.exists", lambda path: path == shard)
 
     index = build_global_index(force=False)
     assert index is None
+
+
+def _local_corpus(monkeypatch, tmp_path, names):
+    samples = tmp_path / "samples" / "docs"
+    samples.mkdir(parents=True)
+    for name in names:
+        shutil.copy(SAMPLE_PDF_PATH, samples / name)
+    monkeypatch.setattr("main.config.Config.USE_S3", False)
+    monkeypatch.setattr("main.config.Config.SAMPLE_DIR", str(tmp_path / "samples"))
+    monkeypatch.setattr("main.config.Config.SHARD_DIR", str(tmp_path / "shards"))
+    monkeypatch.setattr("main.config.Config.MAX_WORKERS", 1, raising=False)
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", False)
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", False)
+    return samples
+
+
+class Killed(BaseException):
+    """Stands in for the process dying: not an Exception, so it is not handled as one failed file."""
+
+
+def _record_processed(monkeypatch, processed, crash_after=None):
+    """Wrap process_file to record each source it embeds, dying instead once crash_after files are done."""
+    def recording(source, *args, **kwargs):
+        if crash_after is not None and len(processed) == crash_after:
+            raise Killed()
+        processed.append(source)
+        return process_file(source, *args, **kwargs)
+
+    monkeypatch.setattr(index_builder, "process_file", recording)
+
+
+def test_build_resumes_from_journal(monkeypatch, tmp_path):
+    """A build killed mid-way resumes from its journal without re-embedding the finished files."""
+    _local_corpus(monkeypatch, tmp_path, ["a.pdf", "b.pdf", "c.pdf"])
+    index_path, manifest_path = str(tmp_path / "docs.index"), str(tmp_path / "docs.json")
+    done_before_crash = []
+    _record_processed(monkeypatch, done_before_crash, crash_after=2)
+    with pytest.raises(Killed):
+        build_global_index(force=True, cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+    with open(journal_path(index_path)) as f:
+        assert sum('"event": "done"' in line for line in f) == 2
+
+    # One finished file is replaced before the restart: its journaled shard is stale
+    replaced = done_before_crash[0]
+    with open(replaced, "ab") as f:
+        f.write(b"\n% replaced\n")
+    processed = []
+    _record_processed(monkeypatch, processed)
+    store = build_global_index(force=True, cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+
+    assert len(processed) == 2 and replaced in processed and done_before_crash[1] not in processed
+    assert store.index.ntotal == sum(e["chunk_count"] for e in load_index_manifest(manifest_path).values())
+    assert not (tmp_path / "docs.journal.jsonl").exists()
+
+
+def test_incremental_build_keeps_unchanged_files(monkeypatch, tmp_path):
+    """An incremental build assembles unchanged files from their shards instead of dropping them."""
+    samples = _local_corpus(monkeypatch, tmp_path, ["a.pdf"])
+    index_path, manifest_path = str(tmp_path / "docs.index"), str(tmp_path / "docs.json")
+    first = build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+
+    with open(SAMPLE_PDF_PATH, "rb") as src, open(samples / "b.pdf", "wb") as dst:
+        dst.write(src.read() + b"\n% another\n")
+    processed = []
+    _record_processed(monkeypatch, processed)
+    second = build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+
+    assert [p.rsplit("/", 1)[-1] for p in processed] == ["b.pdf"]
+    assert second.index.ntotal == 2 * first.index.ntotal
+
+
+def test_failed_file_is_left_out_and_retried(monkeypatch, tmp_path):
+    """A file whose processing fails is not recorded as an empty file, so the next build retries it."""
+    samples = _local_corpus(monkeypatch, tmp_path, ["a.pdf", "b.pdf"])
+    with open(samples / "b.pdf", "ab") as f:
+        f.write(b"\n% distinct contents, so b does not reuse the shard of a\n")
+    index_path, manifest_path = str(tmp_path / "docs.index"), str(tmp_path / "docs.json")
+
+    def fail_b(source, *args, **kwargs):
+        if source.endswith("b.pdf"):
+            raise RuntimeError("Textract throttled")
+        return process_file(source, *args, **kwargs)
+
+    monkeypatch.setattr(index_builder, "process_file", fail_b)
+    store = build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+    assert store is not None and list(load_index_manifest(manifest_path)) == ["docs/a.pdf"]
+
+    processed = []
+    _record_processed(monkeypatch, processed)
+    build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+    assert [p.rsplit("/", 1)[-1] for p in processed] == ["b.pdf"]
+
+
+def test_changed_chunk_settings_rebuild_unchanged_files(monkeypatch, tmp_path):
+    """Shards built with other settings are not mixed into the index: every file is redone under the new ones."""
+    samples = _local_corpus(monkeypatch, tmp_path, ["a.pdf"])
+    index_path, manifest_path = str(tmp_path / "docs.index"), str(tmp_path / "docs.json")
+    monkeypatch.setattr("main.config.Config.CHUNK_SIZE", 600)
+    build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+
+    monkeypatch.setattr("main.config.Config.CHUNK_SIZE", 300)
+    with open(SAMPLE_PDF_PATH, "rb") as src, open(samples / "b.pdf", "wb") as dst:
+        dst.write(src.read() + b"\n% another\n")
+    processed = []
+    _record_processed(monkeypatch, processed)
+    store = build_global_index(cache_mode="full", index_path=index_path, prefix="docs", manifest_path=manifest_path)
+
+    assert sorted(p.rsplit("/", 1)[-1] for p in processed) == ["a.pdf", "b.pdf"]
+    manifest = load_index_manifest(manifest_path)
+    extractor = index_builder.create_pdf_extractor()
+    assert all(e["shard"] == index_builder.expected_shard(e["hash"], extractor) for e in manifest.values())
+    assert store.index.ntotal == sum(e["chunk_count"] for e in manifest.values())
+
+
+def test_shard_key_follows_the_chunking_path(monkeypatch):
+    """Shard keys change with the rules of the path process_file actually takes."""
+    class TextOnly:
+        provider, version = "textract", "1"
+
+    class WithLayout(TextOnly):
+        def extract_layout(self, source):
+            return []
+
+    settings = {"chunker": "layout", "chunk_size": 600, "chunk_overlap": 100}
+    before = shard_key("abc", WithLayout(), **settings), shard_key("abc", TextOnly(), **settings)
+
+    monkeypatch.setattr(layout_chunker, "FINGERPRINT", "changed")
+    assert shard_key("abc", WithLayout(), **settings) != before[0]
+    assert shard_key("abc", TextOnly(), **settings) == before[1]
+
+    # Without extract_layout, layout chunking falls back to the text path and its preprocessing rules
+    monkeypatch.setattr(PREPROCESS, "fingerprint", "changed")
+    assert shard_key("abc", TextOnly(), **settings) != before[1]
@@ -0,0 +1,50 @@
+import pytest
+from main.extractor.pdf_extractor_pymupdf import PyMuPDFExtractor
+from main.retrieval.vector_store import index_versions
+from main.utils.text_cache import TextCache, content_hash
+
+from tests.test_constants import SAMPLE_PDF_PATH
+
+
+class CountingExtractor(PyMuPDFExtractor):
+    calls = 0
+
+    def extract_text(self, source):
+        CountingExtractor.calls += 1
+        return super().extract_text(source)
+
+
+@pytest.fixture
+def versions_env(monkeypatch, tmp_path):
+    CountingExtractor.calls = 0
+    monkeypatch.setattr("main.config.Config.EXTRACTION_CACHE", True)
+    monkeypatch.setattr("main.config.Config.PREPROCESS_CACHE", False)
+    monkeypatch.setattr("main.pipeline.file_processor._extracted", TextCache(str(tmp_path / "extracted"), compress=True))
+    monkeypatch.setattr(index_versions, "VERSIONS_DIR", str(tmp_path / "versions"))
+    monkeypatch.setattr(index_versions, "create_pdf_extractor", CountingExtractor)
+    monkeypatch.setattr(index_versions, "load_index_manifest", lambda: {"sample.pdf": {"hash": content_hash(SAMPLE_PDF_PATH)}})
+    monkeypatch.setattr(index_versions, "download_pdf", lambda key, cache_mode=None: SAMPLE_PDF_PATH)
+
+
+def test_rechunk_index_reuses_cached_extraction(versions_env):
+    first = index_versions.rechunk_index(chunk_size=600, chunk_overlap=100, chunker="text", cache_mode="full")
+    assert first["name"] == "text-cs600-ov100"
+    assert first["cached_extractions"] == 0
+    assert CountingExtractor.calls == 1
+
+    second = index_versions.rechunk_index(chunk_size=300, chunk_overlap=50, chunker="text", cache_mode="full")
+    assert second["cached_extractions"] == 1
+    assert CountingExtractor.calls == 1
+    assert second["chunks"] > first["chunks"]
+
+    assert [v["name"] for v in index_versions.list_versions()] == ["text-cs300-ov50", "text-cs600-ov100"]
+    assert index_versions.load_version("text-cs300-ov50").index.ntotal == second["chunks"]
+
+
+def test_rechunk_index_rejects_bad_settings(versions_env):
+    with pytest.raises(ValueError):
+        index_versions.rechunk_index(chunk_size=100, chunk_overlap=100)
+    with pytest.raises(ValueError):
+        index_versions.rechunk_index(name="../live")
+    with pytest.raises(FileNotFoundError):
+        index_versions.load_version("missing")
@@ -0,0 +1,50 @@
+"""Test suite for the local embedding-based intent detector."""
+import pytest
+from unittest.mock import MagicMock
+from main.intent_detector.embedding_intent_detector import EmbeddingIntentDetector
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return EmbeddingIntentDetector()
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("", "empty"),
+    ("   ", "empty"),
+    ("Hi!", "greeting"),
+    ("thanks", "thanks"),
+    ("bye", "goodbye"),
+    ("ok", "unclear"),
+    ("...", "unclear"),
+])
+def test_rules_resolve_short_input(detector, text, expected):
+    """Test that empty and very short inputs are classified by rules."""
+    assert detector.detect(text) == expected
+
+
+def test_technical_question_classified_locally(detector):
+    """Test that a product question maps to the 'question' centroid."""
+    intent, confidence = detector.classify("What accessories are available for the E9.2 circulator pump?")
+    assert intent == "question"
+    assert 0.0 < confidence <= 1.0
+
+
+def test_low_confidence_escalates_to_fallback(detector):
+    """Test that scores below the threshold are delegated to the LLM detector, created lazily once."""
+    fallback = MagicMock()
+    fallback.detect.return_value = "chitchat"
+    factory = MagicMock(return_value=fallback)
+
+    local = EmbeddingIntentDetector(model=detector.model, fallback_factory=factory, threshold=1.01)
+    assert local.detect("How tall is the Eiffel tower?") == "chitchat"
+    assert local.detect("Who won the game last night?") == "chitchat"
+    factory.assert_called_once()
+
+
+def test_rules_never_escalate(detector):
+    """Test that rule matches skip the fallback regardless of threshold."""
+    factory = MagicMock()
+    local = EmbeddingIntentDetector(model=detector.model, fallback_factory=factory, threshold=1.01)
+    assert local.detect("hello") == "greeting"
+    factory.assert_not_called()
@@ -0,0 +1,87 @@
+"""Test suite for the layout-aware chunker."""
+import fitz
+import pytest
+from main.chunker.layout_chunker import body_font_size, chunk_layout
+from main.extractor.pdf_extractor_pymupdf import PyMuPDFExtractor
+
+
+@pytest.fixture
+def catalog_pdf(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), "PUMP CATALOG", fontsize=18)
+    page.insert_text((50, 100), "Accessories", fontsize=13)
+    for i, item in enumerate(["• Flange kit ¾\"", "• Timer", "• Aquastat"]):
+        page.insert_text((60, 125 + i * 14), item, fontsize=10)
+    page.insert_text((50, 190), "The circulator is lead free and rated for", fontsize=10)
+    page.insert_text((50, 203), "potable water in residential systems.", fontsize=10)
+
+    page = doc.new_page()
+    page.insert_text((50, 60), "Specifications", fontsize=13)
+    page.insert_text((50, 90), "Voltage", fontsize=10)
+    page.insert_text((200, 90), "120v", fontsize=10)
+    page.insert_text((300, 90), "240v", fontsize=10)
+    page.insert_text((50, 120), "Maximum working pressure is 150 psi.", fontsize=10)
+    path = tmp_path / "catalog.pdf"
+    doc.save(str(path))
+    return str(path)
+
+
+def test_extract_layout_returns_numbered_text_blocks(catalog_pdf):
+    pages = PyMuPDFExtractor().extract_layout(catalog_pdf)
+
+    assert [page["number"] for page in pages] == [1, 2]
+    assert all(block["type"] == 0 for page in pages for block in page["blocks"])
+    assert body_font_size(pages) == 10
+
+
+def test_chunk_layout_keeps_headings_lists_and_pages(catalog_pdf):
+    chunks = chunk_layout(PyMuPDFExtractor().extract_layout(catalog_pdf))
+
+    accessories = next(c for c in chunks if "Timer" in c.text)
+    assert accessories.heading == "PUMP CATALOG > Accessories"
+    assert accessories.pages == [1]
+    assert accessories.text.splitlines()[:4] == [
+        "PUMP CATALOG > Accessories", '• Flange kit 3/4"', "• Timer", "• Aquastat"
+    ]
+    # Consecutive body lines form one paragraph
+    assert "rated for potable water in residential systems." in accessories.text
+
+    specs = next(c for c in chunks if "pressure" in c.text)
+    assert specs.heading == "PUMP CATALOG > Specifications"
+    assert specs.pages == [2]
+
+
+def test_chunk_layout_respects_chunk_size_and_repeats_heading():
+    line = {"bbox": (50, 0, 500, 12), "spans": [{"size": 10.0, "flags": 0, "text": "word " * 30}]}
+    heading = {"bbox": (50, 0, 500, 20), "spans": [{"size": 16.0, "flags": 0, "text": "Long Section"}]}
+    blocks = [{"type": 0, "lines": [heading]}] + [
+        {"type": 0, "lines": [dict(line, bbox=(50, 20 * i, 500, 20 * i + 12))]} for i in range(1, 20)
+    ]
+
+    chunks = chunk_layout([{"number": 1, "blocks": blocks}], chunk_size=400, chunk_overlap=50)
+
+    assert len(chunks) > 1
+    assert all(len(c.text) <= 400 for c in chunks)
+    assert all(c.text.startswith("Long Section\n") for c in chunks)
+
+
+def test_chunk_layout_empty_document():
+    assert chunk_layout([{"number": 1, "blocks": []}]) == []
+
+
+def test_chunk_layout_caps_long_heading_path():
+    """Test that a heading path longer than the chunk size is shortened instead of starving the text."""
+    headings = [
+        {"type": 0, "lines": [{"bbox": (50, 20 * i, 500, 20 * i + 16), "spans": [{"size": size, "flags": 0, "text": text}]}]}
+        for i, (size, text) in enumerate([(20.0, "Residential Hydronic Circulator Pumps"), (16.0, "Installation And Wiring Instructions Overview")])
+    ]
+    body = {"type": 0, "lines": [{"bbox": (50, 100, 500, 112), "spans": [{"size": 10.0, "flags": 0, "text": "Mount the pump with the motor shaft horizontal. " * 8}]}]}
+    pages = [{"number": 1, "blocks": headings + [body] * 3}]
+
+    chunks = chunk_layout(pages, chunk_size=60, chunk_overlap=10)
+
+    assert chunks
+    assert all(len(c.heading) <= 30 and c.heading.endswith("Overview") for c in chunks)
+    assert all(len(c.text) <= 60 for c in chunks)
+    assert "motor shaft" in " ".join(c.text for c in chunks)
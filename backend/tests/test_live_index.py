@@ -0,0 +1,95 @@
+"""Test suite for live index hot swapping and background refresh."""
+import threading
+import numpy as np
+from main.retrieval.vector_store.faiss_indexer import FaissStore
+from main.retrieval.vector_store.live_index import LiveIndex
+from main.retrieval.vector_store.index_refresher import IndexRefresher
+
+
+def make_store(n: int) -> FaissStore:
+    store = FaissStore(dim=8)
+    store.add(np.random.rand(n, 8).astype("float32"), [f"doc{i}" for i in range(n)])
+    return store
+
+
+def test_swap_publishes_new_store_to_new_readers():
+    old, new = make_store(1), make_store(2)
+    live = LiveIndex(old)
+
+    assert live.swap(new) == 1
+    with live.acquire() as store:
+        assert store is new
+
+
+def test_in_flight_reader_keeps_old_store_until_drained():
+    """Test that a reader pinned before the swap finishes on the old store and then releases it."""
+    old, new = make_store(1), make_store(2)
+    live = LiveIndex(old)
+    pinned = threading.Event()
+    release = threading.Event()
+    seen = []
+
+    def reader():
+        with live.acquire() as store:
+            pinned.set()
+            release.wait()
+            seen.append(store)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    pinned.wait()
+
+    live.swap(new)
+    assert live.current is new
+    assert live.retired_readers() == 1
+    assert not live.wait_drained(timeout=0.05)
+
+    release.set()
+    thread.join()
+    assert seen == [old]
+    assert live.wait_drained(timeout=1)
+    assert live.retired_readers() == 0
+
+
+def test_refresher_swaps_in_background():
+    live = LiveIndex(make_store(1))
+    new = make_store(3)
+    refresher = IndexRefresher(live, lambda force: new)
+
+    assert refresher.start()
+    refresher.wait(timeout=5)
+    assert live.current is new
+    assert refresher.status["state"] == "updated"
+    assert refresher.status["ntotal"] == 3
+
+
+def test_refresher_no_update_and_single_run():
+    live = LiveIndex(make_store(1))
+    original = live.current
+    gate = threading.Event()
+
+    def build(force):
+        gate.wait()
+        return None
+
+    refresher = IndexRefresher(live, build)
+    assert refresher.start()
+    assert not refresher.start()  # already running
+    gate.set()
+    refresher.wait(timeout=5)
+
+    assert refresher.status["state"] == "no_update"
+    assert live.current is original
+
+
+def test_refresher_records_failure():
+    live = LiveIndex(make_store(1))
+
+    def build(force):
+        raise RuntimeError("extraction failed")
+
+    refresher = IndexRefresher(live, build)
+    refresher.start()
+    refresher.wait(timeout=5)
+    assert refresher.status["state"] == "failed"
+    assert "extraction failed" in refresher.status["error"]
@@ -0,0 +1,57 @@
+"""Test suite for Prometheus metrics recorded at log_duration sites."""
+import pytest
+from unittest.mock import MagicMock
+from prometheus_client import REGISTRY
+from main.logger_config import log_duration
+from main.pipeline_core import generate_response
+from main.retrieval.vector_store.vector_store_manager import select_relevant_docs
+from main.utils import metrics
+
+
+def stage_count(stage: str) -> float:
+    return REGISTRY.get_sample_value("rag_stage_duration_seconds_count", {"stage": stage}) or 0.0
+
+
+def test_log_duration_records_stage_histogram_even_on_error():
+    @log_duration("Failing step", stage="test_failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert stage_count("test_failing") == 1
+
+
+def test_generate_response_records_intent_prompt_and_llm_stages():
+    before = {stage: stage_count(stage) for stage in ("intent", "prompt_build", "llm", "generate_response")}
+    pipeline = MagicMock()
+    pipeline.intent_detector.detect.return_value = "question"
+    pipeline.query_knowledge_base.return_value = ["chunk one"]
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    generate_response(pipeline, "What is the flow rate of metrics test pump?", llm, [])
+
+    for stage, count in before.items():
+        assert stage_count(stage) == count + 1, stage
+
+
+def test_reranker_errors_are_counted_per_provider():
+    reranker = MagicMock(provider="flaky")
+    reranker.rerank.side_effect = RuntimeError("rate limited")
+
+    with pytest.raises(RuntimeError):
+        select_relevant_docs("query", [("chunk", 0.9)], reranker)
+    assert REGISTRY.get_sample_value("rag_provider_errors_total", {"kind": "reranker", "provider": "flaky"}) == 1
+
+
+def test_render_exposes_index_gauges():
+    store = MagicMock()
+    store.index.ntotal, store.index.d = 42, 384
+    metrics.set_index_gauges(store, version=3)
+
+    payload, content_type = metrics.render()
+    text = payload.decode()
+    assert content_type.startswith("text/plain")
+    assert "rag_index_vectors 42.0" in text
+    assert "rag_index_version 3.0" in text
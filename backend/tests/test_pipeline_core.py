@@ -0,0 +1,189 @@
+"""Test suite for generate_response orchestration."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from main import pipeline_core
+from main.pipeline_core import generate_response, generate_batch_responses, QUICK_RESPONSES
+
+
+def make_pipeline(intent="question", docs=None, intent_delay=0.0, retrieval_delay=0.0):
+    pipeline = MagicMock()
+
+    def detect(text):
+        time.sleep(intent_delay)
+        return intent
+
+    def query_knowledge_base(text, reranker=None):
+        time.sleep(retrieval_delay)
+        return ["chunk one", "chunk two"] if docs is None else docs
+
+    pipeline.intent_detector.detect.side_effect = detect
+    pipeline.query_knowledge_base.side_effect = query_knowledge_base
+    return pipeline
+
+
+def test_generate_response_question_uses_retrieved_context():
+    """Test that a question is answered by the LLM from the retrieved chunks."""
+    pipeline = make_pipeline()
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    assert generate_response(pipeline, "What is E9.2?", llm, []) == "answer"
+    prompt = llm.generate_answer.call_args[0][0]
+    assert "chunk one" in prompt and "chunk two" in prompt
+
+
+def test_generate_response_quick_intent_skips_llm():
+    """Test that quick-response intents return canned text and never call the LLM."""
+    pipeline = make_pipeline(intent="greeting")
+    llm = MagicMock()
+
+    assert generate_response(pipeline, "hi", llm, []) == QUICK_RESPONSES["greeting"]
+    llm.generate_answer.assert_not_called()
+
+
+def test_generate_response_overlaps_intent_and_retrieval(monkeypatch):
+    """Test that retrieval runs concurrently with intent detection."""
+    monkeypatch.setattr(pipeline_core.Config, "SPECULATIVE_RETRIEVAL", True)
+    pipeline = make_pipeline(intent_delay=0.3, retrieval_delay=0.3)
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    start = time.perf_counter()
+    generate_response(pipeline, "What is E9.2?", llm, [])
+    assert time.perf_counter() - start < 0.55
+
+
+def test_generate_response_sequential_when_disabled(monkeypatch):
+    """Test that retrieval is skipped entirely for quick intents when speculation is off."""
+    monkeypatch.setattr(pipeline_core.Config, "SPECULATIVE_RETRIEVAL", False)
+    pipeline = make_pipeline(intent="thanks")
+
+    assert generate_response(pipeline, "thanks", MagicMock(), []) == QUICK_RESPONSES["thanks"]
+    pipeline.query_knowledge_base.assert_not_called()
+
+
+def test_generate_response_no_docs():
+    """Test the fallback message when retrieval finds nothing."""
+    pipeline = make_pipeline(docs=[])
+    llm = MagicMock()
+
+    result = generate_response(pipeline, "Unknown product?", llm, [])
+    assert result.startswith("Sorry")
+    llm.generate_answer.assert_not_called()
+
+
+def test_generate_batch_responses_answers_every_query():
+    """Test that the batch path searches once and yields one answer per query position."""
+    pipeline = make_pipeline()
+    pipeline.query_knowledge_base_batch.return_value = [[("chunk", 0.9)]] * 3
+    pipeline.retriever.select.side_effect = lambda text, candidates, reranker=None: [c for c, _ in candidates]
+    llm = MagicMock()
+    llm.generate_answer.side_effect = lambda prompt: prompt.rsplit("Question: ", 1)[1]
+
+    queries = ["q0", "q1", "q2"]
+    results = dict(generate_batch_responses(pipeline, queries, llm, max_concurrency=2))
+
+    assert results == {0: "q0", 1: "q1", 2: "q2"}
+    pipeline.query_knowledge_base_batch.assert_called_once_with(queries)
+    pipeline.query_knowledge_base.assert_not_called()
+
+
+def test_generate_batch_responses_falls_back_without_batch_retriever():
+    """Test that retrievers without a batch path are queried one by one."""
+    pipeline = make_pipeline()
+    pipeline.query_knowledge_base_batch.return_value = None
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    results = dict(generate_batch_responses(pipeline, ["q0", "q1"], llm))
+    assert results == {0: "answer", 1: "answer"}
+    assert pipeline.query_knowledge_base.call_count == 2
+
+
+def test_generate_batch_responses_caps_concurrency(monkeypatch):
+    """Test that a requested concurrency above BATCH_MAX_CONCURRENCY is capped."""
+    monkeypatch.setattr(pipeline_core.Config, "BATCH_MAX_CONCURRENCY", 2)
+    workers = []
+
+    def executor(max_workers, **kwargs):
+        workers.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(pipeline_core, "ThreadPoolExecutor", executor)
+    pipeline = make_pipeline()
+    pipeline.query_knowledge_base_batch.return_value = None
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    assert len(dict(generate_batch_responses(pipeline, ["q0", "q1", "q2"], llm, max_concurrency=100))) == 3
+    assert workers == [2]
+
+
+def test_generate_response_coalesces_identical_queries(monkeypatch):
+    """Test that concurrent identical queries trigger a single LLM call."""
+    monkeypatch.setattr(pipeline_core.Config, "COALESCE_QUERIES", True)
+    pipeline = make_pipeline()
+    llm = MagicMock()
+
+    def slow_answer(prompt):
+        time.sleep(0.2)
+        return "answer"
+
+    llm.generate_answer.side_effect = slow_answer
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        queries = ["What is E9.2?", "what is  E9.2?", "What is E9.2?", "What is E9.2?"]
+        results = list(executor.map(lambda q: generate_response(pipeline, q, llm, []), queries))
+
+    assert results == ["answer"] * 4
+    assert llm.generate_answer.call_count == 1
+
+
+def test_generate_response_does_not_coalesce_different_history(monkeypatch):
+    monkeypatch.setattr(pipeline_core.Config, "COALESCE_QUERIES", True)
+    pipeline = make_pipeline()
+    llm = MagicMock()
+    llm.generate_answer.side_effect = lambda prompt: (time.sleep(0.1), "answer")[1]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        histories = [[], [("previous", "reply")]]
+        list(executor.map(lambda h: generate_response(pipeline, "What is E9.2?", llm, h), histories))
+
+    assert llm.generate_answer.call_count == 2
+
+
+def test_lazy_pipeline_initializes_once_on_first_use(monkeypatch):
+    """Test that lazy=True defers retriever/intent setup to first use and runs it only once."""
+    retriever = MagicMock(spec=["retrieve", "index"])
+    get_retriever = MagicMock(return_value=retriever)
+    create_detector = MagicMock()
+    monkeypatch.setattr(pipeline_core, "get_retriever", get_retriever)
+    monkeypatch.setattr(pipeline_core, "create_intent_detector", create_detector)
+
+    rag = pipeline_core.RAGPipeline(lazy=True)
+    get_retriever.assert_not_called()
+    assert not rag.ready
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: rag.retriever, range(4)))
+
+    assert all(r is retriever for r in results)
+    get_retriever.assert_called_once()
+    create_detector.assert_called_once()
+
+
+def test_warmup_runs_dummy_search_and_marks_ready(monkeypatch):
+    retriever = MagicMock(spec=["retrieve", "index"])
+    monkeypatch.setattr(pipeline_core, "get_retriever", MagicMock(return_value=retriever))
+    monkeypatch.setattr(pipeline_core, "create_intent_detector", MagicMock())
+    query_index = MagicMock()
+    monkeypatch.setattr(pipeline_core.faiss_indexer, "query_faiss_index", query_index)
+    monkeypatch.setattr(pipeline_core.embedder, "get_model", MagicMock())
+
+    rag = pipeline_core.RAGPipeline(lazy=True)
+    rag.warmup()
+
+    assert rag.ready
+    query_index.assert_called_once()
+    assert query_index.call_args[0][0] is retriever.index
@@ -0,0 +1,40 @@
+"""Test suite for the lazy provider registry."""
+import subprocess
+import sys
+import pytest
+from main.utils.plugin_registry import PluginRegistry, import_report
+
+
+def test_resolve_imports_on_first_use_and_caches():
+    registry = PluginRegistry("test")
+    registry.register("ordered", "collections:OrderedDict")
+
+    cls = registry.resolve("ordered")
+    from collections import OrderedDict
+    assert cls is OrderedDict
+    assert registry.resolve("ordered") is cls
+    assert "test:ordered" in import_report()["providers"]
+
+
+def test_create_passes_arguments():
+    registry = PluginRegistry("test")
+    registry.register("fraction", "fractions:Fraction")
+    assert registry.create("fraction", 1, 2) == 0.5
+
+
+def test_unknown_provider_raises_value_error():
+    registry = PluginRegistry("widget", error_message="Unsupported widget provider: {name}")
+    registry.register("known", "collections:OrderedDict")
+    with pytest.raises(ValueError, match="Unsupported widget provider: missing"):
+        registry.resolve("missing")
+
+
+def test_factories_do_not_import_unused_providers():
+    """Test that importing the pipeline does not pull in provider SDKs until a provider is created."""
+    code = (
+        "import sys, main.pipeline_core\n"
+        "print(','.join(m for m in ('cohere', 'langchain_ollama', 'pytesseract', "
+        "'main.llm.bedrock_client', 'main.retrieval.retrievers.bedrock_retriever') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
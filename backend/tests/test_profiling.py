@@ -0,0 +1,46 @@
+"""Test suite for on-demand profiling hooks."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from main.utils import profiling, tracing
+
+
+def busy_worker_function():
+    return sum(i * i for i in range(20000))
+
+
+def test_request_profile_includes_work_in_worker_threads(tmp_path):
+    """Test that work handed to an executor on behalf of the request shows up in its profile."""
+    with ThreadPoolExecutor(max_workers=1) as executor, profiling.profile_request() as profile:
+        future = executor.submit(tracing.in_current_context(profiling.in_request_profile(busy_worker_function)))
+        future.result()
+
+    assert "busy_worker_function" in profile.summary()
+    path = tmp_path / "query.prof"
+    profile.dump(str(path))
+    assert path.exists()
+
+
+def test_in_request_profile_is_passthrough_without_active_profile():
+    assert profiling.in_request_profile(busy_worker_function)() == busy_worker_function()
+
+
+def test_build_profile_writes_one_report_per_stage(tmp_path):
+    out_dir = str(tmp_path / "build")
+
+    def ingest():
+        with profiling.stage("extract"):
+            busy_worker_function()
+        with profiling.stage("embed"):
+            busy_worker_function()
+
+    with profiling.build_profile(out_dir):
+        threads = [threading.Thread(target=ingest) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert sorted(os.listdir(out_dir)) == ["embed.prof", "embed.txt", "extract.prof", "extract.txt"]
+    with profiling.stage("extract"):  # no active build profile: nothing recorded
+        pass
@@ -0,0 +1,55 @@
+"""Test suite for reduced-dimension index projections."""
+import numpy as np
+import pytest
+from main.retrieval.vector_store import faiss_indexer
+from main.retrieval.vector_store.projection import fit_projection, measure_recall, load_projection
+
+
+def low_rank_vectors(n=300, dim=64, rank=8, seed=0):
+    """Vectors that live (up to small noise) in a rank-dimensional subspace."""
+    rng = np.random.default_rng(seed)
+    basis = rng.normal(size=(rank, dim))
+    return (rng.normal(size=(n, rank)) @ basis + 0.01 * rng.normal(size=(n, dim))).astype("float32")
+
+
+def test_pca_preserves_neighbours_of_low_rank_data():
+    vectors = low_rank_vectors()
+    projection = fit_projection(vectors, dim=8, method="pca")
+
+    assert projection.dim == 8
+    assert projection.apply(vectors).shape == (300, 8)
+    assert projection.info["explained_variance"] > 0.99
+    assert measure_recall(vectors, projection, k=10) > 0.9
+
+
+def test_truncate_keeps_leading_dimensions():
+    vectors = low_rank_vectors()
+    projection = fit_projection(vectors, dim=16, method="truncate")
+    assert np.allclose(projection.apply(vectors), vectors[:, :16])
+
+
+def test_invalid_projection_dim_raises():
+    with pytest.raises(ValueError):
+        fit_projection(low_rank_vectors(dim=16), dim=16)
+
+
+def test_projected_store_searches_with_model_dim_queries_and_round_trips(tmp_path):
+    """Test that queries are projected like the stored vectors and the projection is saved next to the index."""
+    vectors = low_rank_vectors()
+    documents = [f"doc {i}" for i in range(len(vectors))]
+    projection = fit_projection(vectors, dim=8)
+
+    store = faiss_indexer.build_faiss_index(vectors.tolist(), documents, projection)
+    assert store.index.d == 8
+    assert store.search(vectors[42].copy(), k=1)[0][0] == "doc 42"
+
+    index_path = str(tmp_path / "global.index")
+    faiss_indexer.save_faiss_index(store, index_path)
+    assert load_projection(str(tmp_path / "global")) is not None
+
+    loaded = faiss_indexer.load_faiss_index(index_path)
+    assert loaded.search(vectors[7].copy(), k=1)[0][0] == "doc 7"
+
+    # Saving an unprojected index removes the stale projection file
+    faiss_indexer.save_faiss_index(faiss_indexer.build_faiss_index(vectors.tolist(), documents), index_path)
+    assert faiss_indexer.load_faiss_index(index_path).projection is None
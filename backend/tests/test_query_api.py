@@ -0,0 +1,45 @@
+"""Test suite for the /query endpoint."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+import httpx
+from api.app import app
+from api.routes import query
+from main import pipeline_core
+
+
+def test_concurrent_identical_queries_compute_once(monkeypatch):
+    """Test that two concurrent identical POSTs to /query share one pipeline computation."""
+    monkeypatch.setattr(pipeline_core.Config, "COALESCE_QUERIES", True)
+    monkeypatch.setattr(pipeline_core.Config, "SPECULATIVE_RETRIEVAL", False)
+    pipeline = MagicMock()
+    pipeline.intent_detector.detect.return_value = "question"
+    pipeline.query_knowledge_base.return_value = ["chunk one"]
+    llm = MagicMock()
+    calls = []
+    lock = threading.Lock()
+
+    def slow_answer(prompt):
+        with lock:
+            calls.append(prompt)
+        time.sleep(0.3)
+        return "answer"
+
+    llm.generate_answer.side_effect = slow_answer
+    monkeypatch.setattr(query, "_pipeline", lambda collection: pipeline)
+    monkeypatch.setattr(query, "get_llm", lambda provider: llm)
+    monkeypatch.setattr(query, "get_reranker", lambda provider: None)
+
+    async def post_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            payload = {"query": "What is E9.2?"}
+            return await asyncio.gather(client.post("/query", json=payload), client.post("/query", json=payload))
+
+    responses = asyncio.run(post_twice())
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert [r.json()["results"] for r in responses] == [["answer"], ["answer"]]
+    assert len(calls) == 1
+    pipeline.query_knowledge_base.assert_called_once()
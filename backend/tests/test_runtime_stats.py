@@ -0,0 +1,69 @@
+"""Test suite for runtime resource statistics."""
+import json
+import numpy as np
+from main.retrieval.vector_store.faiss_indexer import FaissStore, save_faiss_index
+from main.retrieval.vector_store.projection import fit_projection
+from main.utils import runtime_stats
+
+
+def make_store(dim=16, n=40, index_factory="Flat", projection=None):
+    vectors = np.random.default_rng(0).random((n, dim)).astype("float32")
+    store = FaissStore(projection.dim if projection else dim, projection=projection, index_factory=index_factory)
+    store.add(vectors, [f"chunk {i}" for i in range(n)])
+    return store, vectors
+
+
+def test_index_stats_reports_size_memory_and_disk(tmp_path):
+    store, _ = make_store()
+    index_path = str(tmp_path / "global.index")
+    save_faiss_index(store, index_path)
+
+    stats = runtime_stats.index_stats(store, index_path)
+
+    assert stats["index_type"] == "IndexFlatIP"
+    assert stats["ntotal"] == 40 and stats["dimension"] == 16
+    assert stats["vector_bytes"] == 40 * 16 * 4
+    assert stats["metadata_chunks"] == 40
+    assert stats["metadata_text_bytes"] == sum(len(f"chunk {i}") for i in range(40))
+    assert set(stats["disk_bytes"]) == {"global.index", "global.metadata.npy"}
+    assert stats["projection"] is None
+
+
+def test_index_stats_handles_hnsw_and_projection():
+    _, vectors = make_store()
+    projection = fit_projection(vectors, 8)
+    store, _ = make_store(index_factory="HNSW8", projection=projection)
+
+    stats = runtime_stats.index_stats(store)
+
+    assert stats["dimension"] == 8
+    assert stats["vector_bytes"] == 40 * 8 * 4
+    assert stats["projection"]["source_dim"] == 16 and stats["projection"]["dim"] == 8
+    assert "disk_bytes" not in stats
+
+
+def test_collect_stats_without_loaded_index(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps({
+        "a.pdf": {"hash": "x", "chunk_count": 3, "embedding_count": 3, "size": 100},
+        "b.pdf": {"hash": "y", "chunk_count": 5, "embedding_count": 5, "size": 200},
+    }))
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "a.pdf").write_bytes(b"%PDF cached")
+    (cache_dir / "extracted").mkdir()
+    (cache_dir / "extracted" / "x.txt.gz").write_bytes(b"gzipped text")
+    monkeypatch.setattr("main.utils.manifest_helper.INDEX_MANIFEST_PATH", str(manifest_path))
+    monkeypatch.setattr("main.config.Config.CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr("main.embedder.embedder.is_loaded", lambda: False)
+
+    stats = runtime_stats.collect_stats(None, sessions=[object(), object()])
+
+    assert stats["index"] == {"loaded": False}
+    assert stats["manifest"]["documents"] == 2 and stats["manifest"]["total_chunks"] == 8
+    assert stats["manifest"]["per_document"]["b.pdf"]["chunks"] == 5
+    assert stats["embedding_model"]["loaded"] is False
+    # Text caches under CACHE_DIR are reported on their own, not again in pdf_cache
+    assert stats["caches"]["pdf_cache"] == {"path": str(cache_dir), "files": 1, "bytes": len(b"%PDF cached")}
+    assert stats["caches"]["sessions_in_memory"] == 2
+    assert stats["process"]["peak_rss_bytes"] > 0
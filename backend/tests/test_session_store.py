@@ -0,0 +1,90 @@
+"""Test suite for server-side chat sessions."""
+import pytest
+from main.config import Config
+from main.llm.prompt_builder import build_packed_prompt
+from main.llm.token_counter import whitespace_token_count
+from main.session.session_store import SessionStore, SUMMARY_QUESTION
+
+
+def make_store(**kwargs):
+    defaults = dict(max_sessions=10, persist_dir="", compact_threshold=1000, keep_turns=2, count_tokens=whitespace_token_count)
+    defaults.update(kwargs)
+    return SessionStore(**defaults)
+
+
+def test_append_records_history():
+    store = make_store()
+    session = store.create()
+    store.append(session, "What is E9.2?", "A circulator pump.")
+    assert store.get(session.session_id).history() == [("What is E9.2?", "A circulator pump.")]
+
+
+def test_lru_evicts_least_recently_used():
+    store = make_store(max_sessions=2)
+    first, second = store.create(), store.create()
+    store.get(first.session_id)  # touch first so second becomes the eviction candidate
+    store.create()
+
+    assert store.get(first.session_id) is not None
+    assert store.get(second.session_id) is None
+    assert len(store) == 2
+
+
+def test_compaction_summarizes_older_turns():
+    """Test that crossing the token threshold folds all but the newest turns into a summary."""
+    store = make_store(compact_threshold=30, keep_turns=2)
+    session = store.create()
+    for i in range(5):
+        store.append(session, f"Question {i} about pumps?", f"Answer {i} is here. More detail follows.")
+
+    history = session.history()
+    assert history[0][0] == SUMMARY_QUESTION
+    assert "Question 2" in history[0][1] and "More detail" not in history[0][1]
+    assert whitespace_token_count(history[0][1]) <= 15  # summary itself is bounded
+    assert history[1:] == [
+        ("Question 3 about pumps?", "Answer 3 is here. More detail follows."),
+        ("Question 4 about pumps?", "Answer 4 is here. More detail follows."),
+    ]
+
+
+def test_persistence_reloads_evicted_session(tmp_path):
+    store = make_store(max_sessions=1, persist_dir=str(tmp_path))
+    session = store.create()
+    store.append(session, "q", "a")
+    store.create()  # evicts the first session from memory
+
+    reloaded = store.get(session.session_id)
+    assert reloaded is not None
+    assert reloaded.history() == [("q", "a")]
+
+    assert store.delete(session.session_id)
+    assert store.get(session.session_id) is None
+
+
+def test_invalid_session_id_rejected():
+    store = make_store()
+    with pytest.raises(ValueError):
+        store.get("../etc/passwd")
+
+
+def test_get_with_create_uses_given_id():
+    store = make_store()
+    session = store.get("client-chosen-id", create=True)
+    assert session.session_id == "client-chosen-id"
+    assert session.history() == []
+
+
+def test_compacted_summary_reaches_prompt():
+    """Test that a long session's summary is kept in the prompt although it is the oldest history turn."""
+    store = make_store(compact_threshold=800, keep_turns=4)
+    session = store.create()
+    for i in range(12):
+        store.append(session, f"Question {i} about pump E{i}?", f"Pump E{i} moves water. " + "detail " * 100)
+    assert session.summary
+
+    prompt, report = build_packed_prompt(["Pump data sheet."], "And the next one?", session.history(), count_tokens=whitespace_token_count)
+
+    assert SUMMARY_QUESTION in prompt
+    assert session.summary.splitlines()[-1] in prompt  # newest summary line survives any trimming
+    assert "Question 11 about pump E11?" in prompt
+    assert report["history_tokens"] <= Config.HISTORY_TOKEN_BUDGET
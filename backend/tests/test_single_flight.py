@@ -0,0 +1,53 @@
+"""Test suite for single-flight request coalescing."""
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from main.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test that callers with the same key while in flight get the leader's result."""
+    flight = SingleFlight()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: flight.do("key", slow, 21), range(5)))
+
+    assert calls == [21]
+    assert [r for r, _ in results] == [42] * 5
+    assert sum(shared for _, shared in results) == 4
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+
+
+def test_exception_propagates_to_followers():
+    """Test that a failing leader raises in every waiting caller and the key is released."""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait()
+        follower = executor.submit(flight.do, "key", failing)
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            follower.result()
+
+    assert flight.in_flight() == 0
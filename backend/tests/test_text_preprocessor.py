@@ -0,0 +1,53 @@
+"""Test suite for the compiled text preprocessing rules and the preprocessed-text cache."""
+from main.chunker.text_chunker import prepare_for_chunking
+from main.utils.normalize_tokens import normalize_text
+from main.utils.text_cache import TextCache, content_hash
+from main.utils.text_preprocessor import PREPROCESS, TextPipeline, fix_pdf_symbols, preprocess_text, sub_rule
+
+RAW = 'Accessories•Flange-\nkits ¾" and 1 1/4" flanges\nsupport  2–3 pumps·Timer\n\n\n\nE9.2 data'
+
+
+def test_preprocess_text_output():
+    assert preprocess_text(RAW) == (
+        'Accessories\n\n• Flangekits 3/4" and 1¼" flanges support 2-3 pumps\n\n• Timer\n\nE9.2 data'
+    )
+
+
+def test_fix_pdf_symbols_and_prepare_for_chunking_output():
+    assert fix_pdf_symbols(RAW) == 'Accessories•Flange-\nkits 3/4" and 1 1/4" flanges\nsupport 2-3 pumps·Timer\n\n\n\nE9.2 data'
+    assert prepare_for_chunking("E 7.2 pump\r\nfeatures - quiet\t\tmotor 1. fast 2. small") == (
+        "E7.2 pump\nfeatures \n- quiet motor \n1. fast \n2. small"
+    )
+    assert normalize_text("E22.2/E22.2B  pumps\n") == "E 22_2/E 22_2 B pumps"
+
+
+def test_preprocess_text_reports_time_per_rule():
+    timings = {}
+    preprocess_text(RAW, timings)
+    preprocess_text(RAW, timings)
+
+    assert set(timings) == {rule.name for rule in PREPROCESS.rules}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_fingerprint_tracks_rule_changes():
+    base = TextPipeline("p", [sub_rule("a", r"x+", "x")])
+
+    assert TextPipeline("p", [sub_rule("a", r"x+", "x")]).fingerprint == base.fingerprint
+    assert TextPipeline("p", [sub_rule("a", r"x+", "y")]).fingerprint != base.fingerprint
+    assert TextPipeline("p", [sub_rule("a", r"x+", "x")], version=2).fingerprint != base.fingerprint
+
+
+def test_text_cache_replaces_older_versions(tmp_path):
+    cache = TextCache(str(tmp_path))
+    file_hash = content_hash(b"%PDF-1.4 test")
+
+    assert cache.get(file_hash, "PyMuPDFExtractor", "v1") is None
+    cache.put(file_hash, "PyMuPDFExtractor", "v1", "old text")
+    cache.put(file_hash, "TextractExtractor", "v1", "other extractor")
+    cache.put(file_hash, "PyMuPDFExtractor", "v2", "new text")
+
+    assert cache.get(file_hash, "PyMuPDFExtractor", "v1") is None
+    assert cache.get(file_hash, "PyMuPDFExtractor", "v2") == "new text"
+    assert cache.get(file_hash, "TextractExtractor", "v1") == "other extractor"
+    assert len(list(tmp_path.iterdir())) == 2
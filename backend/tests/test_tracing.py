@@ -0,0 +1,42 @@
+"""Test suite for per-request trace spans."""
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from main.pipeline_core import generate_response
+from main.utils import tracing
+
+
+def test_generate_response_spans_nest_under_request_span_across_threads():
+    """Test that stage spans, including speculative retrieval in a worker thread, share the request's trace."""
+    pipeline = MagicMock()
+    pipeline.intent_detector.detect.return_value = "question"
+
+    def query_knowledge_base(text, reranker=None):
+        with tracing.span("retrieval_stub"):
+            return ["chunk one"]
+
+    pipeline.query_knowledge_base.side_effect = query_knowledge_base
+    llm = MagicMock()
+    llm.generate_answer.return_value = "answer"
+
+    with tracing.span("request") as root:
+        generate_response(pipeline, "What is the tracing test pump head?", llm, [])
+        trace_id = tracing.current_trace_id()
+
+    spans = {s["name"]: s for s in tracing.finished_spans(trace_id)}
+    assert {"request", "generate_response", "intent_detection", "retrieval_stub", "build_prompt", "llm.generate"} <= set(spans)
+    assert spans["generate_response"]["parent_id"] == spans["request"]["context"]["span_id"]
+    assert spans["intent_detection"]["attributes"]["rag.intent"] == "question"
+    assert root.get_span_context().trace_id == int(trace_id, 16)
+
+
+def test_responses_carry_trace_id_header_and_trace_is_retrievable():
+    from api.app import app
+
+    client = TestClient(app)
+    response = client.get("/health")
+    trace_id = response.headers[tracing.TRACE_HEADER]
+    assert len(trace_id) == 32
+
+    trace = client.get(f"/traces/{trace_id}").json()
+    assert [s["name"] for s in trace["spans"]] == ["GET /health"]
+    assert client.get(f"/traces/{'0' * 32}").status_code == 404
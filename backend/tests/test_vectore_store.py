@@ -65,3 +65,24 @@ def test_faiss_store_duplicate_adds():
 
     assert store.index.ntotal == 2
     assert store.metadata == ["doc1", "doc1-again"]
+
+
+def test_faiss_store_search_batch_returns_row_per_query():
+    store = FaissStore(dim=384)
+    embeddings = np.random.rand(3, 384).astype("float32")
+    store.add(embeddings.copy(), ["doc1", "doc2", "doc3"])
+
+    rows = store.search_batch(embeddings.copy(), k=1)
+    assert len(rows) == 3
+    assert [row[0][0] for row in rows] == ["doc1", "doc2", "doc3"]
+
+
+def test_faiss_store_index_factory_trains_and_applies_search_params():
+    """Test that a non-flat index is trained on add and accepts search-time parameters."""
+    store = FaissStore(dim=32, index_factory="IVF4,Flat")
+    embeddings = np.random.rand(200, 32).astype("float32")
+    store.add(embeddings.copy(), [f"doc{i}" for i in range(200)])
+    store.set_search_params("nprobe=4")  # all lists probed: exact
+
+    assert store.index.is_trained and store.index.ntotal == 200
+    assert store.search(embeddings[5].copy(), k=1)[0][0] == "doc5"
@@ -4,19 +4,27 @@ import requests
 
 MAX_HISTORY_LENGTH = 10
 
+BACKEND_URL = "http://localhost:8000"
+
 # === Initialize Chat History ===
+# History is kept here for display only; the backend session holds the conversation.
 st.session_state.history = st.session_state.get("history", [])
+st.session_state.session_id = st.session_state.get("session_id")
 
 
-def query_backend(query_text: str, history: list[tuple[str, str]]) -> str:
+def query_backend(query_text: str) -> str:
     try:
-        payload = {
-            "query": query_text,
-            "history": history
-        }
-        response = requests.post("http://localhost:8000/query", json=payload)
+        payload = {"query": query_text}
+        if st.session_state.session_id:
+            payload["session_id"] = st.session_state.session_id
+        else:
+            payload["session_id"] = requests.post(f"{BACKEND_URL}/sessions").json()["session_id"]
+
+        response = requests.post(f"{BACKEND_URL}/query", json=payload)
         if response.status_code == 200:
-            return response.json().get("results", ["No response"])[0]
+            data = response.json()
+            st.session_state.session_id = data.get("session_id", payload["session_id"])
+            return data.get("results", ["No response"])[0]
         else:
             return f"Error {response.status_code}: {response.text}"
     except Exception as e:
@@ -33,6 +41,12 @@ def handle_sidebar():
     with st.sidebar:
         st.header("Options")
         if st.button("Reset Conversation"):
+            if st.session_state.session_id:
+                try:
+                    requests.delete(f"{BACKEND_URL}/sessions/{st.session_state.session_id}")
+                except requests.RequestException:
+                    pass
+            st.session_state.session_id = None
             st.session_state.history.clear()
             st.rerun()
 
@@ -53,7 +67,7 @@ def handle_user_input():
 
         with st.spinner("Thinking..."):
             start = time.time()
-            response = query_backend(query, st.session_state.history[-MAX_HISTORY_LENGTH:])
+            response = query_backend(query)
             duration = time.time() - start
 
         st.session_state.history.append((query, response))